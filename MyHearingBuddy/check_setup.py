@@ -52,8 +52,9 @@ def main():
     # Check generated/downloaded files
     print("\n📦 Generated/Downloaded Files:")
     all_good &= check_file("sign-language-detector/hand_landmarker.task", "MediaPipe model")
-    check_file("sign-language-detector/data.pickle", "Training dataset (run create_dataset.py)")
+    check_file("sign-language-detector/dataset/meta.json", "Training dataset (run create_dataset.py)")
     check_file("sign-language-detector/model.p", "ML model (run train_classifier.py)")
+    check_file("sign-language-detector/model/manifest.json", "Memory-mapped model artifact (run train_classifier.py)")
     
     # Check environment variables
     print("\n🔐 Environment Variables:")
@@ -3,11 +3,10 @@ Flask API Server for Sign Language Detection
 Provides REST endpoints for React Native integration
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import cv2
 import numpy as np
-import pickle
 import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
@@ -17,16 +16,43 @@ from PIL import Image
 import os
 import threading
 import time
+import json
 from openai_integration import OpenAIIntegrator
+from ngram_model import load_ngram_model
+from spell_index import COMMON_WORDS
+from beam_decoder import BeamDecoder, LexiconTrie, labels_to_symbols
+from streaming_session import StreamingSession
+from frame_scheduler import AdaptiveScheduler
+from motion_features import MotionTracker, load_motion_head, DEFAULT_MOTION_HEAD_PATH
+from forest_artifact import load_model, DEFAULT_ARTIFACT_DIR
+from landmark_features import landmarks_array, normalize_landmarks, hand_labels
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React Native
 
 # Global variables
 model = None
+model_class_ids = None
+model_class_count = 0
 detector = None
+max_hands = int(os.getenv('MAX_HANDS', '2'))   # Hands detected and classified per frame
 openai_integrator = None
 
+# Streaming sessions (beam decoding over per-frame probabilities)
+lexicon = None
+ngram_model = None
+motion_head = None   # Sliding-window head for the motion signs, shared by all sessions
+sessions = {}
+sessions_lock = threading.Lock()
+
+# Model artifact directory; the model is reloaded when its manifest changes
+model_dir = os.getenv('MODEL_DIR', DEFAULT_ARTIFACT_DIR)
+model_version = None
+model_checked_at = 0.0
+model_lock = threading.Lock()       # One reload at a time
+model_swap_lock = threading.Lock()  # Keeps model, model_class_ids and model_class_count consistent
+MODEL_CHECK_INTERVAL = 2.0  # Seconds between manifest checks
+
 # Labels for all 28 classes (A-Z + SPACE + SEND)
 labels_dict = {
     0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H', 8: 'I', 9: 'J',
@@ -34,16 +60,67 @@ labels_dict = {
     20: 'U', 21: 'V', 22: 'W', 23: 'X', 24: 'Y', 25: 'Z', 26: 'SPACE', 27: 'SEND'
 }
 
+def manifest_version():
+    """Modification time of the model manifest (None without an artifact)"""
+    try:
+        return os.stat(os.path.join(model_dir, 'manifest.json')).st_mtime_ns
+    except OSError:
+        return None
+
+def set_model(new_model):
+    """Install a loaded model and map its predict_proba columns to label indices"""
+    global model, model_class_ids, model_class_count
+    class_ids = np.array([int(c) for c in new_model.classes_])
+    # Classes added by an incremental update get their name from the manifest. Ids in
+    # between are labelled too, so label indices stay contiguous (the beam decoder's
+    # symbols are ordered by index) even if an update skips some
+    label_names = getattr(new_model, 'manifest', {}).get('label_names', [])
+    class_count = max(len(labels_dict), int(class_ids.max()) + 1)
+    for class_id in range(class_count):
+        if class_id not in labels_dict:
+            labels_dict[class_id] = label_names[class_id] if class_id < len(label_names) else f'CLASS_{class_id}'
+    with model_swap_lock:
+        model, model_class_ids, model_class_count = new_model, class_ids, class_count
+
+def refresh_model(force=False):
+    """
+    Reload the model if its artifact changed on disk (e.g. after update_model.py)
+    Returns:
+        True if a new model was loaded
+    """
+    global model_version, model_checked_at
+    now = time.time()
+    if not force and now - model_checked_at < MODEL_CHECK_INTERVAL:
+        return False
+    with model_lock:
+        model_checked_at = now
+        version = manifest_version()
+        if version is None or (version == model_version and not force):
+            return False
+        try:
+            set_model(load_model(model_dir))
+            model_version = version
+            print(f"🔄 Model reloaded from {model_dir}/")
+            return True
+        except Exception as e:
+            # e.g. an update still being written; retried on the next check
+            print(f"⚠️ Model reload failed: {e}")
+            return False
+
 def initialize_models():
     """Initialize ML models and OpenAI integration"""
-    global model, detector, openai_integrator
+    global model, model_class_ids, model_class_count, model_version, detector, openai_integrator, lexicon, ngram_model, motion_head
     
     try:
         # Load the trained model
         print("Loading trained model...")
-        model_dict = pickle.load(open('./model.p', 'rb'))
-        model = model_dict['model']
+        # Memory-mapped artifact (shared between workers), falling back to model.p
+        model_version = manifest_version()
+        # predict_proba columns follow model.classes_, map them to label indices
+        set_model(load_model(model_dir))
         print("✅ Model loaded successfully")
+        # Optional: without it J and Z are recognised from single frames only
+        motion_head = load_motion_head(os.getenv('MOTION_HEAD_PATH', DEFAULT_MOTION_HEAD_PATH))
         
         # Initialize MediaPipe hand detector
         print("Initializing MediaPipe hand detector...")
@@ -55,7 +132,7 @@ def initialize_models():
         base_options = python.BaseOptions(model_asset_path=model_path)
         options = vision.HandLandmarkerOptions(
             base_options=base_options,
-            num_hands=1,
+            num_hands=max_hands,
             min_hand_detection_confidence=0.3,
             min_hand_presence_confidence=0.3,
             min_tracking_confidence=0.3
@@ -72,6 +149,18 @@ def initialize_models():
             print(f"⚠️ OpenAI integration failed: {e}")
             openai_integrator = None
         
+        # Lexicon and n-gram prior for the streaming beam decoder
+        if openai_integrator is not None:
+            ngram_model = openai_integrator.ngram_model
+            lexicon_words = list(openai_integrator.spell_index.frequencies)
+        else:
+            ngram_model = load_ngram_model(os.getenv('NGRAM_MODEL_PATH', 'ngram_model'))
+            lexicon_words = list(COMMON_WORDS)
+            if ngram_model is not None:
+                lexicon_words += list(ngram_model.word_frequencies())
+        lexicon = LexiconTrie(lexicon_words)
+        print(f"✅ Beam decoder lexicon: {len(lexicon)} words")
+        
         return True
         
     except Exception as e:
@@ -100,11 +189,20 @@ def decode_base64_image(base64_string):
         return None
 
 def detect_sign_language(image):
-    """Detect sign language from image"""
+    """
+    Detect sign language from image
+    Every detected hand is classified in one batched predict_proba call.
+    Returns:
+        (result, error): result holds the fields of the most confidently classified
+        hand plus 'hands', a list with 'prediction', 'confidence', 'handedness',
+        'bounding_box', 'landmarks' and 'probabilities' of every hand
+    """
     global model, detector
     
     if model is None or detector is None:
         return None, "Models not initialized"
+
+    refresh_model()
     
     try:
         # Convert image to RGB for MediaPipe
@@ -119,53 +217,47 @@ def detect_sign_language(image):
         if not results.hand_landmarks:
             return None, "No hand detected"
         
-        # Process first detected hand
-        hand_landmarks = results.hand_landmarks[0]
-        
-        # Extract coordinates
-        data_aux = []
-        x_ = []
-        y_ = []
-        
-        for landmark in hand_landmarks:
-            x_.append(landmark.x)
-            y_.append(landmark.y)
-        
-        # Normalize coordinates
-        for landmark in hand_landmarks:
-            data_aux.append(landmark.x - min(x_))
-            data_aux.append(landmark.y - min(y_))
-        
-        # Make prediction
-        if len(data_aux) == 42:  # 21 landmarks * 2 coordinates
-            prediction = model.predict([np.asarray(data_aux)])
-            predicted_character = labels_dict[int(prediction[0])]
-            
-            # Get prediction confidence (probability)
-            prediction_proba = model.predict_proba([np.asarray(data_aux)])
-            confidence = float(np.max(prediction_proba))
-            
+        # (n_hands, 21, 2) coordinates and the normalized 42 features of each hand
+        landmarks = landmarks_array(results.hand_landmarks)
+        features = normalize_landmarks(landmarks)
+        
+        # One predict_proba call gives the prediction and confidence of every hand
+        # Snapshot model and class ids together: a hot reload may swap them between frames
+        with model_swap_lock:
+            current_model, class_ids, class_count = model, model_class_ids, model_class_count
+        probabilities = np.zeros((len(features), class_count))
+        probabilities[:, class_ids] = current_model.predict_proba(features)
+        
+        h, w = image.shape[:2]
+        hands = []
+        for hand_points, hand_probabilities, (handedness, handedness_score) in zip(
+                landmarks, probabilities, hand_labels(results)):
+            best = int(np.argmax(hand_probabilities))
             # Calculate bounding box
-            h, w = image.shape[:2]
-            x1 = int(min(x_) * w)
-            y1 = int(min(y_) * h)
-            x2 = int(max(x_) * w)
-            y2 = int(max(y_) * h)
-            
-            return {
-                'prediction': predicted_character,
-                'confidence': confidence,
+            x1, y1 = (hand_points.min(axis=0) * (w, h)).astype(int)
+            x2, y2 = (hand_points.max(axis=0) * (w, h)).astype(int)
+            hands.append({
+                'prediction': labels_dict[best],
+                'confidence': float(hand_probabilities[best]),
+                'handedness': handedness,
+                'handedness_score': handedness_score,
                 'bounding_box': {
-                    'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2
+                    'x1': int(x1), 'y1': int(y1), 'x2': int(x2), 'y2': int(y2)
                 },
-                'landmarks': [{'x': lm.x, 'y': lm.y} for lm in hand_landmarks]
-            }, None
-        else:
-            return None, "Invalid landmark data"
+                'landmarks': [{'x': float(x), 'y': float(y)} for x, y in hand_points],
+                'probabilities': hand_probabilities
+            })
+        
+        primary = max(hands, key=lambda hand: hand['confidence'])
+        return dict(primary, hands=hands), None
             
     except Exception as e:
         return None, f"Detection error: {str(e)}"
 
+def hand_summaries(result):
+    """JSON-serializable per-hand results (without the probability vectors)"""
+    return [{key: value for key, value in hand.items() if key != 'probabilities'} for hand in result['hands']]
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -173,7 +265,8 @@ def health_check():
         'status': 'healthy',
         'model_loaded': model is not None,
         'detector_loaded': detector is not None,
-        'openai_available': openai_integrator is not None
+        'openai_available': openai_integrator is not None,
+        'ngram_model_loaded': openai_integrator is not None and openai_integrator.ngram_model is not None
     })
 
 @app.route('/detect', methods=['POST'])
@@ -203,13 +296,97 @@ def detect_endpoint():
             'success': True,
             'prediction': result['prediction'],
             'confidence': result['confidence'],
+            'handedness': result['handedness'],
             'bounding_box': result['bounding_box'],
-            'landmarks': result['landmarks']
+            'landmarks': result['landmarks'],
+            'hands': hand_summaries(result)
         })
         
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+def get_session(session_id):
+    """Look up a streaming session, dropping sessions that have been idle too long"""
+    with sessions_lock:
+        now = time.time()
+        for expired_id in [sid for sid, session in sessions.items() if session.is_expired(now)]:
+            del sessions[expired_id]
+        return sessions.get(session_id)
+
+@app.route('/session/start', methods=['POST'])
+def session_start_endpoint():
+    """Start a streaming detection session with its own beam decoder"""
+    if model is None or lexicon is None:
+        return jsonify({'error': 'Models not initialized'}), 503
+    
+    decoder = BeamDecoder(labels_to_symbols(labels_dict), lexicon, ngram_model)
+    motion = MotionTracker(motion_head) if motion_head is not None else None
+    session = StreamingSession(decoder, AdaptiveScheduler(), motion, labels_dict)
+    with sessions_lock:
+        sessions[session.session_id] = session
+    
+    return jsonify({'success': True, 'session_id': session.session_id})
+
+@app.route('/session/<session_id>/frame', methods=['POST'])
+def session_frame_endpoint(session_id):
+    """Detect one frame and update the session's decoded words"""
+    try:
+        session = get_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Unknown or expired session'}), 404
+        
+        data = request.get_json()
+        if not data or 'image' not in data:
+            return jsonify({'error': 'No image data provided'}), 400
+        
+        image = decode_base64_image(data['image'])
+        if image is None:
+            return jsonify({'error': 'Invalid image data'}), 400
+        
+        # One frame at a time per session: detection state and decoding must advance together
+        with session.lock:
+            result, error, detected = session.detect(image, detect_sign_language)
+            if error and error != "No hand detected":
+                return jsonify({'error': error}), 400
+            
+            decoded = session.process(result)
+        
+        response = {'success': True, 'hand_detected': result is not None, 'detected': detected, 'decoded': decoded}
+        if result is not None:
+            response.update({
+                'prediction': result['prediction'],
+                'confidence': result['confidence'],
+                'handedness': result['handedness'],
+                'bounding_box': result['bounding_box'],
+                'landmarks': result['landmarks'],
+                'hands': hand_summaries(result)
+            })
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/session/<session_id>/end', methods=['POST'])
+def session_end_endpoint(session_id):
+    """Finish a streaming session and return the final decoded text"""
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown or expired session'}), 404
+    
+    with sessions_lock:
+        sessions.pop(session_id, None)
+    
+    with session.lock:
+        decoded = session.finish()
+        frames, detected_frames = session.frames, session.scheduler.detections
+    return jsonify({
+        'success': True,
+        'decoded': decoded,
+        'text': decoded['text'],
+        'frames': frames,
+        'detected_frames': detected_frames
+    })
+
 @app.route('/complete_text', methods=['POST'])
 def complete_text_endpoint():
     """Text completion endpoint using OpenAI"""
@@ -239,6 +416,44 @@ def complete_text_endpoint():
     except Exception as e:
         return jsonify({'error': f'Text completion error: {str(e)}'}), 500
 
+@app.route('/complete_text_stream', methods=['POST'])
+def complete_text_stream_endpoint():
+    """Streaming text completion endpoint (Server-Sent Events)"""
+    # Validate before the stream starts: afterwards errors can only be sent as events
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+        return jsonify({'error': 'No text provided'}), 400
+    
+    text = data['text'].strip()
+    
+    if not text:
+        return jsonify({'error': 'Empty text provided'}), 400
+    
+    if openai_integrator is None:
+        return jsonify({'error': 'OpenAI integration not available'}), 503
+    
+    def generate():
+        completed_text = ""
+        try:
+            for delta in openai_integrator.stream_sentence(text):
+                completed_text += delta
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'original_text': text, 'completed_text': completed_text})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': f'Text completion error: {str(e)}'})}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/completion_stats', methods=['GET'])
+def completion_stats_endpoint():
+    """Text completion metrics (hedged mode win rates and latency)"""
+    if openai_integrator is None:
+        return jsonify({'error': 'OpenAI integration not available'}), 503
+    
+    return jsonify(openai_integrator.get_completion_stats())
+
 @app.route('/speak', methods=['POST'])
 def speak_endpoint():
     """Text-to-speech endpoint"""
@@ -280,11 +495,15 @@ def get_model_info():
     """Get model information and statistics"""
     try:
         # Try to load model info if available
+        manifest = getattr(model, 'manifest', {})
         model_info = {
             'total_classes': len(labels_dict),
             'labels': list(labels_dict.values()),
-            'model_type': 'Random Forest Classifier',
+            'model_type': 'k-NN Classifier' if manifest.get('type') == 'knn' else 'Random Forest Classifier',
+            'model_hash': manifest.get('model_hash'),
+            'model_dir': model_dir,
             'features': 42,  # 21 landmarks * 2 coordinates
+            'motion_signs': motion_head.motion_labels if motion_head is not None else [],
             'status': 'loaded' if model is not None else 'not_loaded'
         }
         
@@ -293,6 +512,18 @@ def get_model_info():
     except Exception as e:
         return jsonify({'error': f'Model info error: {str(e)}'}), 500
 
+@app.route('/reload_model', methods=['POST'])
+def reload_model():
+    """Reload the model artifact now instead of waiting for the periodic check"""
+    if manifest_version() is None:
+        return jsonify({'error': f'No model artifact in {model_dir}/'}), 404
+    reloaded = refresh_model(force=True)
+    return jsonify({
+        'success': reloaded,
+        'model_hash': getattr(model, 'manifest', {}).get('model_hash'),
+        'total_classes': len(labels_dict)
+    }), 200 if reloaded else 500
+
 if __name__ == '__main__':
     print("🚀 Starting Sign Language Detection API Server...")
     
@@ -306,10 +537,16 @@ if __name__ == '__main__':
     print("\nAvailable endpoints:")
     print("  GET  /health - Health check")
     print("  POST /detect - Sign language detection")
+    print("  POST /session/start - Start a streaming detection session")
+    print("  POST /session/<id>/frame - Detect a frame and decode words")
+    print("  POST /session/<id>/end - Finish a session")
     print("  POST /complete_text - Text completion with OpenAI")
+    print("  POST /complete_text_stream - Streaming text completion (SSE)")
+    print("  GET  /completion_stats - Text completion metrics")
     print("  POST /speak - Text-to-speech")
     print("  GET  /labels - Get all available labels")
     print("  GET  /model_info - Get model information")
+    print("  POST /reload_model - Reload the model artifact")
     
     # Run the Flask app
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Landmark-Space Data Augmentation
+Runs between create_dataset.py and train_classifier.py. Instead of augmenting
+images and re-running the hand landmarker, it perturbs the raw landmarks of the
+columnar dataset directly - random in-plane rotation, scaling, per-point jitter
+and optional mirroring - as batched NumPy operations over all samples at once,
+then re-derives the 42 classifier features.
+
+The augmented copies are written to their own dataset directory. Each copy keeps
+its source image path with an '#aug<k>' suffix, so train_classifier.py can add
+only the copies of its training split and keep the test split clean.
+
+Usage:
+    python augment_dataset.py --copies 5
+    python train_classifier.py --augmented dataset_augmented
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from dataset_store import Dataset, DatasetWriter, DEFAULT_DATASET_DIR
+from landmark_features import normalize_landmarks
+
+DEFAULT_AUGMENTED_DIR = 'dataset_augmented'
+AUGMENT_SUFFIX = '#aug'
+
+DEFAULT_COPIES = 5
+MAX_ROTATION_DEGREES = 15.0
+SCALE_RANGE = (0.9, 1.1)
+JITTER_STD = 0.004       # In normalized image coordinates
+DEFAULT_ASPECT = 4 / 3   # Width / height of the capture frames (640x480)
+BATCH_SIZE = 8192        # Source samples augmented per NumPy batch
+
+
+def augment_landmarks(landmarks, handedness, rng, rotation=MAX_ROTATION_DEGREES, scale_range=SCALE_RANGE,
+                      jitter=JITTER_STD, mirror_probability=0.0, aspect=DEFAULT_ASPECT):
+    """
+    Randomly perturb a batch of hands
+    Args:
+        landmarks: (n, 21, 3) raw landmarks in normalized image coordinates
+        handedness: (n,) handedness codes (0 = left, 1 = right, -1 = unknown)
+        rng: numpy Generator
+        rotation: Maximum in-plane rotation in degrees (either direction)
+        scale_range: (min, max) uniform scale factor around the hand's centroid
+        jitter: Standard deviation of the Gaussian noise added to each x, y
+        mirror_probability: Probability of mirroring a sample left-right
+        aspect: Frame width / height; rotation happens in pixel-proportional space
+    Returns:
+        (landmarks, handedness) of the perturbed batch
+    """
+    n = len(landmarks)
+    points = np.array(landmarks, dtype=np.float32)
+    hands = np.array(handedness, dtype=np.int8)
+
+    # Work in pixel-proportional coordinates so rotation doesn't shear the hand
+    xy = points[:, :, :2] * np.array([aspect, 1.0], dtype=np.float32)
+    centroid = xy.mean(axis=1, keepdims=True)
+    xy -= centroid
+
+    mirrored = rng.random(n) < mirror_probability
+    xy[mirrored, :, 0] *= -1
+    known = mirrored & (hands >= 0)
+    hands[known] = 1 - hands[known]
+
+    angles = np.radians(rng.uniform(-rotation, rotation, n)).astype(np.float32)
+    cos, sin = np.cos(angles), np.sin(angles)
+    # (n, 2, 2) rotation matrices applied to row vectors: xy @ R^T
+    rotations = np.stack([np.stack([cos, -sin], axis=1), np.stack([sin, cos], axis=1)], axis=1)
+    scales = rng.uniform(scale_range[0], scale_range[1], n).astype(np.float32)
+    xy = np.einsum('npj,nij->npi', xy, rotations) * scales[:, None, None]
+
+    xy += centroid
+    xy /= np.array([aspect, 1.0], dtype=np.float32)
+    xy += rng.normal(0.0, jitter, xy.shape).astype(np.float32)
+
+    points[:, :, :2] = xy
+    points[:, :, 2] *= scales[:, None]
+    return points, hands
+
+
+def augment_dataset(dataset_dir=DEFAULT_DATASET_DIR, output_dir=DEFAULT_AUGMENTED_DIR, copies=DEFAULT_COPIES,
+                    mirror_probability=0.0, seed=None, **augment_options):
+    """
+    Write `copies` augmented versions of every sample in a dataset
+    Args:
+        dataset_dir: Source columnar dataset
+        output_dir: Directory for the augmented dataset
+        copies: Augmented copies per source sample
+        mirror_probability: Probability of mirroring each copy
+        seed: Random seed for reproducible augmentation
+        augment_options: Extra keyword arguments for augment_landmarks
+    Returns:
+        Number of samples written
+    """
+    source = Dataset(dataset_dir)
+    total = len(source) * copies
+    rng = np.random.default_rng(seed)
+    writer = DatasetWriter(output_dir, total, source.label_names)
+
+    start_time = time.time()
+    for copy in range(copies):
+        for begin in range(0, len(source), BATCH_SIZE):
+            block = slice(begin, begin + BATCH_SIZE)
+            landmarks, handedness = augment_landmarks(source.landmarks[block], source.handedness[block], rng,
+                                                      mirror_probability=mirror_probability, **augment_options)
+            paths = [f"{p}{AUGMENT_SUFFIX}{copy}" for p in source.paths[block]]
+            writer.append_batch(normalize_landmarks(landmarks), source.labels[block], landmarks, handedness, paths)
+    writer.close()
+
+    elapsed = time.time() - start_time
+    print(f"Augmented {len(source)} samples x {copies} copies = {total} samples in {elapsed:.2f}s "
+          f"({total / max(elapsed, 1e-9):.0f} samples/s)")
+    return total
+
+
+def source_path(path):
+    """Source image path of an augmented sample"""
+    return path.split(AUGMENT_SUFFIX, 1)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Augment the landmark dataset in landmark space')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_DIR, help='Source dataset directory')
+    parser.add_argument('--output', default=DEFAULT_AUGMENTED_DIR, help='Augmented dataset directory')
+    parser.add_argument('--copies', type=int, default=DEFAULT_COPIES, help='Augmented copies per sample')
+    parser.add_argument('--rotation', type=float, default=MAX_ROTATION_DEGREES, help='Max rotation in degrees')
+    parser.add_argument('--scale', type=float, nargs=2, default=SCALE_RANGE, metavar=('MIN', 'MAX'),
+                        help='Scale factor range')
+    parser.add_argument('--jitter', type=float, default=JITTER_STD, help='Landmark jitter standard deviation')
+    parser.add_argument('--mirror', type=float, default=0.0,
+                        help='Probability of mirroring a copy (signs are handed; off by default)')
+    parser.add_argument('--aspect', type=float, default=DEFAULT_ASPECT, help='Frame width / height')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    args = parser.parse_args()
+
+    augment_dataset(args.dataset, args.output, max(args.copies, 1), args.mirror, args.seed,
+                    rotation=args.rotation, scale_range=tuple(args.scale), jitter=args.jitter, aspect=args.aspect)
+    print(f"Augmented dataset saved to {args.output}/")
+
+
+if __name__ == '__main__':
+    main()
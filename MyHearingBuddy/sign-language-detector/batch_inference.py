@@ -0,0 +1,151 @@
+"""
+Headless Batch Inference
+Runs the live detector's pipeline - hand detection, classification and text
+accumulation - over a recorded video or a folder of images, without a camera or
+a window. Writes one JSON line per frame with the prediction, the accumulated
+text and per-stage timings, and prints aggregate throughput.
+
+Text accumulation runs on media time (frame timestamps), not wall-clock time,
+so a recording produces the same text however fast the machine is. That makes
+the output usable for regression tests.
+
+Usage:
+    python inference_classifier.py --input session.mp4 --output predictions.jsonl
+    python inference_classifier.py --input frames/ --fps 30
+"""
+
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+DEFAULT_IMAGE_FPS = 30.0
+
+
+def iter_frames(input_path, image_fps=DEFAULT_IMAGE_FPS):
+    """
+    Frames of a video file or an image directory
+    Yields:
+        (index, media timestamp in seconds, source name, BGR frame, decode ms)
+    """
+    if os.path.isdir(input_path):
+        names = sorted(n for n in os.listdir(input_path) if n.lower().endswith(IMAGE_EXTENSIONS))
+        for index, name in enumerate(names):
+            start = time.perf_counter()
+            frame = cv2.imread(os.path.join(input_path, name))
+            decode_ms = (time.perf_counter() - start) * 1000
+            if frame is not None:
+                yield index, index / image_fps, name, frame, decode_ms
+        return
+
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {input_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or image_fps
+    index = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            decode_ms = (time.perf_counter() - start) * 1000
+            if not ret:
+                break
+            yield index, index / fps, os.path.basename(input_path), frame, decode_ms
+            index += 1
+    finally:
+        cap.release()
+
+
+def run_headless(input_path, output_path=None, image_fps=DEFAULT_IMAGE_FPS, send=False, adaptive=True,
+                 num_hands=1):
+    """
+    Run detection and text accumulation over a recording
+    Args:
+        input_path: Video file or image directory
+        output_path: JSONL output file (None = stdout)
+        image_fps: Frame rate assumed for image directories
+        send: Send completed text to OpenAI (otherwise only recorded)
+        adaptive: Skip detection on frames where the hand is steady (see frame_scheduler.py)
+        num_hands: Hands to detect and classify per frame
+    Returns:
+        Summary dictionary
+    """
+    from inference_classifier import (load_model, create_detector, process_frame, send_to_openai, TextAccumulator,
+                                      model_class_ids)
+    from frame_scheduler import AdaptiveScheduler
+    from motion_features import MotionTracker, load_motion_head
+
+    model = load_model()
+    class_ids = model_class_ids(model)
+    detector = create_detector(num_hands)
+    text = TextAccumulator()
+    scheduler = AdaptiveScheduler() if adaptive else None
+    motion_head = load_motion_head()
+    motion = MotionTracker(motion_head) if motion_head is not None else None
+
+    out = open(output_path, 'w') if output_path else sys.stdout
+    stage_totals = {'decode': [], 'detect': [], 'classify': [], 'total': []}
+    frames = 0
+    hand_frames = 0
+    detected_frames = 0
+    sent = []
+    start_time = time.perf_counter()
+    try:
+        for index, timestamp, source, frame, decode_ms in iter_frames(input_path, image_fps):
+            result = process_frame(detector, model, frame, scheduler, motion, class_ids)
+            timings = dict(decode=decode_ms, **result['timings_ms'])
+            timings['total'] = timings['decode'] + timings['detect'] + timings['classify']
+
+            hand_frames += result['prediction'] is not None
+            to_send = text.update(result['probabilities'], timestamp)
+            if to_send:
+                sent.append(to_send)
+                if send:
+                    send_to_openai(to_send)
+
+            record = {
+                'frame': index,
+                'source': source,
+                'timestamp': round(timestamp, 4),
+                'hand': result['prediction'] is not None,
+                'detected': result['detected'],
+                'prediction': result['prediction'],
+                'hands': [{'prediction': hand['prediction'], 'handedness': hand['handedness'],
+                           'confidence': round(hand['confidence'], 4)} for hand in result['hand_results']],
+                'text': text.snapshot()['text'],
+                'timings_ms': {k: round(v, 3) for k, v in timings.items()},
+            }
+            if to_send:
+                record['sent'] = to_send
+            out.write(json.dumps(record) + '\n')
+
+            for stage, value in timings.items():
+                stage_totals[stage].append(value)
+            frames += 1
+            detected_frames += result['detected']
+    finally:
+        if output_path:
+            out.close()
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        'frames': frames,
+        'hand_frames': hand_frames,
+        'detected_frames': detected_frames,
+        'seconds': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'final_text': text.snapshot()['text'],
+        'sent': sent,
+    }
+    print(f"\nProcessed {frames} frames ({hand_frames} with a hand) in {elapsed:.2f}s "
+          f"- {summary['fps']:.1f} FPS, detection ran on {detected_frames} frames", file=sys.stderr)
+    for stage, values in stage_totals.items():
+        if values:
+            print(f"  {stage:>8}: mean {np.mean(values):7.2f}ms  p95 {np.percentile(values, 95):7.2f}ms",
+                  file=sys.stderr)
+    print(f"Final text: '{summary['final_text']}'" + (f", sent: {sent}" if sent else ''), file=sys.stderr)
+    return summary
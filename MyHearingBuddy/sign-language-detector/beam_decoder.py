@@ -0,0 +1,219 @@
+"""
+Lexicon-Constrained Beam Decoder for Streaming Letter Recognition
+Takes the per-frame class probability vectors from the classifier (instead of
+only the argmax) and runs a beam search over letter sequences. Hypotheses may
+only spell prefixes of lexicon words, a SPACE frame commits a word, and an
+optional n-gram model scores each committed word against its context.
+"""
+
+import math
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+SPACE_SYMBOL = 'SPACE'
+
+DEFAULT_BEAM_WIDTH = 16
+TOP_SYMBOLS_PER_FRAME = 6       # Only the most likely symbols start new letters
+SWITCH_PENALTY = math.log(0.2)  # Starting a new letter (discourages single-frame flicker)
+REPEAT_PENALTY = math.log(0.05) # Same letter twice in a row, e.g. the "LL" in "HELLO"
+MIN_REPEAT_FRAMES = 3           # Frames a letter must be held before it can repeat
+LM_WEIGHT = 0.5
+LM_FLOOR = 1e-7                 # N-gram score used for words the model has never seen
+PROBABILITY_FLOOR = 1e-6
+
+
+class TrieNode:
+    __slots__ = ('children', 'is_word')
+
+    def __init__(self):
+        self.children: Dict[str, 'TrieNode'] = {}
+        self.is_word = False
+
+
+class LexiconTrie:
+    def __init__(self, words: Iterable[str]):
+        """
+        Build a letter trie over lexicon words
+        Args:
+            words: Lexicon words (case-insensitive, letters only)
+        """
+        self.root = TrieNode()
+        self.size = 0
+        for word in words:
+            word = word.upper()
+            if not word.isalpha():
+                continue
+            node = self.root
+            for letter in word:
+                node = node.children.setdefault(letter, TrieNode())
+            if not node.is_word:
+                node.is_word = True
+                self.size += 1
+
+    def __len__(self):
+        return self.size
+
+
+class _Hypothesis:
+    __slots__ = ('score', 'words', 'node', 'prefix', 'last', 'run')
+
+    def __init__(self, score, words, node, prefix, last, run):
+        self.score = score
+        self.words = words      # Committed words (tuple of lowercase strings)
+        self.node = node        # Trie node of the word being spelled
+        self.prefix = prefix    # Letters of the word being spelled
+        self.last = last        # Symbol index of the current frame run (-1 at start)
+        self.run = run          # Frames spent in the current run
+
+    def key(self):
+        return self.words, self.prefix, self.last
+
+
+class BeamDecoder:
+    def __init__(self, symbols: Sequence[str], lexicon: LexiconTrie, ngram_model=None,
+                 beam_width: int = DEFAULT_BEAM_WIDTH, lm_weight: float = LM_WEIGHT):
+        """
+        Initialize a decoder for one stream of frames
+        Args:
+            symbols: Class label for each probability vector position (e.g. A-Z, SPACE, SEND).
+                Labels other than single letters and SPACE are ignored
+            lexicon: Trie of words that may be spelled
+            ngram_model: Optional NGramModel used as a word prior
+            beam_width: Number of hypotheses kept after each frame
+            lm_weight: Weight of the n-gram log score when a word is committed
+        """
+        self.symbols = list(symbols)
+        self.lexicon = lexicon
+        self.ngram_model = ngram_model
+        self.beam_width = beam_width
+        self.lm_weight = lm_weight
+
+        # Positions in the probability vector the decoder uses
+        self.active = np.array([i for i, s in enumerate(self.symbols)
+                                if s == SPACE_SYMBOL or (len(s) == 1 and s.isalpha())])
+        self.space_index = self.symbols.index(SPACE_SYMBOL) if SPACE_SYMBOL in self.symbols else -1
+        self.frames = 0
+        self.reset()
+
+    def reset(self):
+        """Forget all hypotheses and start a new utterance"""
+        self.beams = [_Hypothesis(0.0, (), self.lexicon.root, '', -1, 0)]
+        self.frames = 0
+
+    def _word_prior(self, words, word: str) -> float:
+        """Weighted n-gram log score of word given the committed words before it"""
+        if self.ngram_model is None:
+            return 0.0
+        word_id = self.ngram_model.word_id(word)
+        if word_id < 0:
+            return self.lm_weight * math.log(LM_FLOOR)
+        context = [self.ngram_model.start_id, self.ngram_model.start_id]
+        context += [self.ngram_model.word_id(w) for w in words[-2:]]
+        score = float(self.ngram_model.score(context[-2], context[-1], np.array([word_id]))[0])
+        return self.lm_weight * math.log(max(score, LM_FLOOR))
+
+    def update(self, probabilities: Sequence[float]) -> dict:
+        """
+        Advance the beam by one frame
+        Args:
+            probabilities: Class probability vector aligned with symbols
+        Returns:
+            Current decoding (see output)
+        """
+        probs = np.asarray(probabilities, dtype=np.float64)
+        log_probs = np.full(len(self.symbols), -np.inf)
+        active_probs = np.maximum(probs[self.active], PROBABILITY_FLOOR)
+        log_probs[self.active] = np.log(active_probs / active_probs.sum())
+
+        top = self.active[np.argsort(-log_probs[self.active])[:TOP_SYMBOLS_PER_FRAME]]
+
+        candidates: Dict[tuple, _Hypothesis] = {}
+
+        def add(hyp):
+            key = hyp.key()
+            existing = candidates.get(key)
+            if existing is None or hyp.score > existing.score:
+                candidates[key] = hyp
+
+        for hyp in self.beams:
+            # The current letter (or space) continues for another frame
+            if hyp.last >= 0:
+                add(_Hypothesis(hyp.score + log_probs[hyp.last], hyp.words, hyp.node,
+                                hyp.prefix, hyp.last, hyp.run + 1))
+
+            for symbol in top:
+                symbol = int(symbol)
+                score = hyp.score + log_probs[symbol] + SWITCH_PENALTY
+                if symbol == self.space_index:
+                    if hyp.last == symbol:
+                        continue
+                    if not hyp.prefix:
+                        # Leading space: nothing to commit
+                        add(_Hypothesis(score, hyp.words, hyp.node, '', symbol, 1))
+                    elif hyp.node.is_word:
+                        word = hyp.prefix.lower()
+                        score += self._word_prior(hyp.words, word)
+                        add(_Hypothesis(score, hyp.words + (word,), self.lexicon.root, '', symbol, 1))
+                    continue
+
+                letter = self.symbols[symbol]
+                if symbol == hyp.last:
+                    if hyp.run < MIN_REPEAT_FRAMES:
+                        continue
+                    score += REPEAT_PENALTY
+                child = hyp.node.children.get(letter)
+                if child is not None:
+                    add(_Hypothesis(score, hyp.words, child, hyp.prefix + letter, symbol, 1))
+
+        if candidates:
+            self.beams = sorted(candidates.values(), key=lambda h: -h.score)[:self.beam_width]
+        self.frames += 1
+        return self.output()
+
+    def output(self) -> dict:
+        """
+        Current best decoding
+        Returns:
+            Dictionary with committed words, the partial word being spelled, the
+            combined text and the words every hypothesis in the beam agrees on
+        """
+        best = self.beams[0]
+        stable = []
+        for i, word in enumerate(best.words):
+            if all(len(h.words) > i and h.words[i] == word for h in self.beams):
+                stable.append(word)
+            else:
+                break
+        partial = best.prefix.lower()
+        return {
+            'words': list(best.words),
+            'partial': partial,
+            'text': ' '.join(list(best.words) + ([partial] if partial else [])),
+            'stable_words': stable,
+            'frames': self.frames,
+        }
+
+    def finalize(self) -> dict:
+        """
+        End the utterance: commit the word being spelled where it is a complete word
+        Returns:
+            Final decoding; the beam is reset afterwards
+        """
+        finished = []
+        for hyp in self.beams:
+            if hyp.prefix and hyp.node.is_word:
+                word = hyp.prefix.lower()
+                score = hyp.score + self._word_prior(hyp.words, word)
+                finished.append(_Hypothesis(score, hyp.words + (word,), self.lexicon.root, '', hyp.last, 0))
+            else:
+                finished.append(hyp)
+        self.beams = sorted(finished, key=lambda h: -h.score)
+        result = self.output()
+        self.reset()
+        return result
+
+
+def labels_to_symbols(labels_dict: Dict[int, str]) -> List[str]:
+    """Symbol list ordered by class index, as expected by BeamDecoder"""
+    return [labels_dict[i] for i in sorted(labels_dict)]
@@ -0,0 +1,86 @@
+"""
+Threaded Camera Reader
+Grabs frames from a cv2.VideoCapture on a background thread so slow consumers
+(display, disk writes, inference) never stall the camera. Only the newest frame
+is kept; each frame gets a sequence number so consumers can tell new frames from
+ones they have already seen and count the frames they skipped. Frames are
+shared between consumers, so copy one before drawing on it.
+"""
+
+import threading
+import time
+
+import cv2
+
+from fps_counter import FPSCounter
+
+
+class CameraReader:
+    def __init__(self, source=0, width=None, height=None):
+        """
+        Open the camera
+        Args:
+            source: Camera index or video path for cv2.VideoCapture
+            width, height: Optional capture resolution
+        """
+        self.cap = cv2.VideoCapture(source)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        self.frame = None
+        self.seq = 0              # Sequence number of self.frame (0 = no frame yet)
+        self.timestamp = 0.0
+        self.running = False
+        self.failed = False       # Set when the camera stops delivering frames
+        self.condition = threading.Condition()
+        self.thread = None
+        self.fps = FPSCounter()
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def start(self):
+        """Start the reader thread"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='camera-reader', daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            with self.condition:
+                if not ret:
+                    self.failed = True
+                    self.running = False
+                else:
+                    self.frame = frame
+                    self.seq += 1
+                    self.timestamp = time.time()
+                    self.fps.tick(self.timestamp)
+                self.condition.notify_all()
+
+    def read(self, last_seq=0, timeout=1.0):
+        """
+        Wait for a frame newer than last_seq
+        Args:
+            last_seq: Sequence number of the last frame the caller processed
+            timeout: Seconds to wait for a new frame
+        Returns:
+            (seq, frame), or (last_seq, None) on timeout or camera failure.
+            seq - last_seq - 1 frames were skipped by the caller
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > last_seq or not self.running, timeout)
+            if self.seq <= last_seq:
+                return last_seq, None
+            return self.seq, self.frame
+
+    def stop(self):
+        """Stop the reader thread and release the camera"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        self.cap.release()
@@ -1,77 +1,230 @@
 import os
+import argparse
+import queue
+import threading
+import time
 import cv2
+from camera_reader import CameraReader
 
 DATA_DIR = './data'
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
 
 # 28 classes for A-Z alphabets + SPACE + SEND
 number_of_classes = 28
 dataset_size = 100
 
 # Create alphabet mapping including SPACE and SEND
-alphabet_labels = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 
+alphabet_labels = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
                    'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z',
                    'SPACE', 'SEND']
 
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("Error: Could not open camera")
-    exit()
+CAPTURE_INTERVAL_MS = 25   # Time between saved frames
+WRITER_QUEUE_SIZE = 64     # Frames waiting for the disk writers (bounds memory use)
+DEFAULT_WRITERS = 2
 
-for j in range(number_of_classes):
-    if not os.path.exists(os.path.join(DATA_DIR, str(j))):
-        os.makedirs(os.path.join(DATA_DIR, str(j)))
 
-    print(f'Collecting data for class {j} - Letter "{alphabet_labels[j]}"')
-    print(f'Make the sign for letter "{alphabet_labels[j]}" with your hand')
+class FrameWriter:
+    def __init__(self, workers=DEFAULT_WRITERS, queue_size=WRITER_QUEUE_SIZE, landmarks=False):
+        """
+        Background JPEG writers fed from a bounded queue
+        Args:
+            workers: Number of writer threads
+            queue_size: Maximum frames waiting to be written; capture blocks when full
+            landmarks: Also run the hand landmarker on every frame
+        """
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.landmarks = landmarks
+        self.samples = []          # (image path, label, landmark sample) when landmarks is set
+        self.lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.stalls = 0            # Times capture had to wait for a full queue
 
-    done = False
+        self.threads = [threading.Thread(target=self._run, name=f'frame-writer-{i}', daemon=True)
+                        for i in range(max(workers, 1))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, img_path, label, frame):
+        """Queue a frame for writing (blocks while the queue is full)"""
+        if self.queue.full():
+            self.stalls += 1
+        self.queue.put((img_path, label, frame))
+
+    def pending(self):
+        return self.queue.qsize()
+
+    def _run(self):
+        detector = None
+        if self.landmarks:
+            # MediaPipe landmarkers aren't thread-safe: one per writer thread
+            from create_dataset import create_detector, landmark_frame
+            detector = create_detector()
+
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                break
+            img_path, label, frame = item
+            ok = cv2.imwrite(img_path, frame)
+            sample = landmark_frame(detector, frame) if detector is not None and ok else None
+            with self.lock:
+                if ok:
+                    self.written += 1
+                else:
+                    self.failed += 1
+                if sample is not None:
+                    self.samples.append((img_path, label, sample))
+            self.queue.task_done()
+
+    def close(self):
+        """Write everything still queued and stop the writer threads"""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+def draw_status(frame, lines):
+    """Draw the collection status on a copy of the frame (saved frames stay clean)"""
+    display = frame.copy()
+    for text, y, scale, color in lines:
+        cv2.putText(display, text, (50, y), cv2.FONT_HERSHEY_SIMPLEX, scale, color,
+                    3 if scale > 1 else 2, cv2.LINE_AA)
+    return display
+
+
+def wait_for_start(reader, j):
+    """Show the camera until the user presses Q; returns False if the camera fails"""
+    seq = 0
     while True:
-        ret, frame = cap.read()
-        if not ret:
-            print("Error: Could not read frame from camera")
-            break
-        
+        seq, frame = reader.read(seq)
+        if frame is None:
+            if reader.failed:
+                print("Error: Could not read frame from camera")
+                return False
+            continue
+
         # Display current letter being collected
-        cv2.putText(frame, f'Letter: {alphabet_labels[j]}', (50, 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 3, cv2.LINE_AA)
-        cv2.putText(frame, 'Ready? Press "Q" to start!', (50, 120), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 255, 0), 3, cv2.LINE_AA)
-        cv2.putText(frame, f'Class {j+1}/26', (50, 180), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2, cv2.LINE_AA)
-        
-        cv2.imshow('Data Collection', frame)
-        if cv2.waitKey(25) == ord('q'):
-            break
+        cv2.imshow('Data Collection', draw_status(frame, [
+            (f'Letter: {alphabet_labels[j]}', 50, 2, (0, 255, 0)),
+            ('Ready? Press "Q" to start!', 120, 1.3, (0, 255, 0)),
+            (f'Class {j+1}/{number_of_classes}', 180, 1, (255, 255, 0)),
+        ]))
+        if cv2.waitKey(1) == ord('q'):
+            return True
+
+
+def collect_class(reader, writer, j, data_dir, size, interval):
+    """
+    Capture `size` frames for class j, one every `interval` seconds
+    Returns:
+        Number of frames queued for writing
+    """
+    class_dir = os.path.join(data_dir, str(j))
+    os.makedirs(class_dir, exist_ok=True)
+    print(f'Collecting {size} images for letter "{alphabet_labels[j]}"...')
 
     counter = 0
-    print(f'Collecting {dataset_size} images for letter "{alphabet_labels[j]}"...')
-    
-    while counter < dataset_size:
-        ret, frame = cap.read()
-        if not ret:
-            print("Error: Could not read frame from camera")
-            break
-        
+    seq = 0
+    skipped = 0
+    next_capture = 0.0
+    start_time = time.time()
+    while counter < size:
+        last_seq = seq
+        seq, frame = reader.read(seq)
+        if frame is None:
+            if reader.failed:
+                print("Error: Could not read frame from camera")
+                break
+            continue
+        if last_seq:
+            skipped += seq - last_seq - 1
+
+        now = time.time()
+        if now >= next_capture:
+            writer.submit(os.path.join(class_dir, '{}.jpg'.format(counter)), str(j), frame)
+            counter += 1
+            next_capture = now + interval
+
         # Show progress
-        cv2.putText(frame, f'Letter: {alphabet_labels[j]}', (50, 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 3, cv2.LINE_AA)
-        cv2.putText(frame, f'Collecting: {counter+1}/{dataset_size}', (50, 120), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 255), 3, cv2.LINE_AA)
-        cv2.putText(frame, f'Class {j+1}/26', (50, 180), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2, cv2.LINE_AA)
-        
-        cv2.imshow('Data Collection', frame)
-        cv2.waitKey(25)
-        cv2.imwrite(os.path.join(DATA_DIR, str(j), '{}.jpg'.format(counter)), frame)
-
-        counter += 1
-    
-    print(f'Completed collecting data for letter "{alphabet_labels[j]}"')
-    print('Press any key to continue to next letter...')
-    cv2.waitKey(0)
-
-cap.release()
-cv2.destroyAllWindows()
-print("Data collection completed for all 26 letters!")
+        cv2.imshow('Data Collection', draw_status(frame, [
+            (f'Letter: {alphabet_labels[j]}', 50, 2, (0, 255, 0)),
+            (f'Collecting: {counter}/{size}', 120, 1.3, (0, 0, 255)),
+            (f'Class {j+1}/{number_of_classes}  Writing: {writer.pending()}', 180, 1, (255, 255, 0)),
+        ]))
+        cv2.waitKey(1)
+
+    elapsed = time.time() - start_time
+    print(f'Captured {counter} frames in {elapsed:.1f}s ({counter / max(elapsed, 1e-9):.1f} frames/s, '
+          f'{skipped} camera frames not shown, {writer.pending()} still being written)')
+    return counter
+
+
+def save_capture_landmarks(samples, dataset_dir):
+    """Append capture-time landmarks to the dataset and the landmark cache"""
+    from create_dataset import model_path
+    from dataset_store import append_to_dataset
+    from landmark_cache import LandmarkCache, DEFAULT_CACHE_PATH, detector_signature
+
+    samples = sorted(samples, key=lambda s: s[0])
+    total = append_to_dataset(dataset_dir, samples, alphabet_labels)
+    print(f"Appended {len(samples)} landmarked samples to {dataset_dir}/ ({total} samples total)")
+
+    # create_dataset.py will reuse these instead of landmarking the images again
+    cache = LandmarkCache(DEFAULT_CACHE_PATH, detector_signature(model_path))
+    for img_path, _, sample in samples:
+        cache.store(img_path, sample)
+    cache.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect training images from the camera')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Directory for collected images')
+    parser.add_argument('--size', type=int, default=dataset_size, help='Images per class')
+    parser.add_argument('--interval', type=int, default=CAPTURE_INTERVAL_MS, help='Milliseconds between images')
+    parser.add_argument('--writers', type=int, default=DEFAULT_WRITERS, help='Background writer threads')
+    parser.add_argument('--landmarks', action='store_true',
+                        help='Extract landmarks while capturing and append them to the dataset')
+    parser.add_argument('--dataset', default='dataset', help='Dataset directory used with --landmarks')
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    if args.landmarks:
+        from create_dataset import download_hand_landmarker
+        download_hand_landmarker()
+
+    reader = CameraReader(0)
+    if not reader.is_opened():
+        print("Error: Could not open camera")
+        exit()
+    reader.start()
+    writer = FrameWriter(args.writers, landmarks=args.landmarks)
+
+    try:
+        for j in range(number_of_classes):
+            print(f'Collecting data for class {j} - Letter "{alphabet_labels[j]}"')
+            print(f'Make the sign for letter "{alphabet_labels[j]}" with your hand')
+
+            if not wait_for_start(reader, j):
+                break
+            collect_class(reader, writer, j, args.data_dir, args.size, args.interval / 1000.0)
+
+            print(f'Completed collecting data for letter "{alphabet_labels[j]}"')
+            print('Press any key to continue to next letter...')
+            cv2.waitKey(0)
+    finally:
+        reader.stop()
+        cv2.destroyAllWindows()
+        print(f"Waiting for {writer.pending()} queued images to be written...")
+        writer.close()
+
+    print(f"Wrote {writer.written} images ({writer.failed} failed, capture waited on the writers "
+          f"{writer.stalls} times)")
+    if args.landmarks and writer.samples:
+        save_capture_landmarks(writer.samples, args.dataset)
+    print(f"Data collection completed for all {number_of_classes} classes!")
+
+
+if __name__ == '__main__':
+    main()
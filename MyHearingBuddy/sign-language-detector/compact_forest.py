@@ -0,0 +1,226 @@
+"""
+Forest Compaction to a Latency or Size Budget
+The default 100-tree, fully grown forest is far larger than a 42-feature,
+28-class problem needs. This step shrinks the trained model.p and writes the
+result as the memory-mapped model artifact:
+
+- fewer trees (random forest trees are interchangeable, so the first k are kept)
+- a depth limit (deeper nodes become leaves holding the class distribution of
+  their training samples)
+- merging sibling leaves whose class distributions are (nearly) identical
+- float32 split thresholds, rounded down so float32 features take exactly the
+  same branch as with the original float64 thresholds
+
+Candidates are tried from least to most aggressive; the first one that meets the
+latency and/or size target while staying within the allowed accuracy loss on the
+held-out split of train_classifier.py is written.
+
+Usage:
+    python compact_forest.py --latency-budget 0.5 --max-accuracy-loss 0.01
+    python compact_forest.py --size-budget 256
+"""
+
+import argparse
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from dataset_store import Dataset, load_training_data, DEFAULT_DATASET_DIR
+from forest_artifact import (ForestPredictor, tree_nodes, pack_trees, write_artifact,
+                             DEFAULT_ARTIFACT_DIR, DEFAULT_PICKLE_PATH)
+
+TREE_FRACTIONS = (1.0, 0.75, 0.5, 0.35, 0.25, 0.15, 0.1)
+DEPTH_LIMITS = (None, 24, 20, 16, 14, 12, 10, 8)
+MERGE_TOLERANCES = (0.0, 0.1)      # L1 distance between sibling leaf distributions
+DEFAULT_MAX_ACCURACY_LOSS = 0.01   # Absolute held-out accuracy
+LATENCY_SAMPLES = 200
+
+
+def prune_tree(tree, max_depth=None, merge_tol=None):
+    """
+    Depth-limit a tree and merge redundant sibling leaves
+    Args:
+        tree: tree_nodes dictionary
+        max_depth: Nodes at this depth become leaves (None = no limit)
+        merge_tol: Merge two leaf siblings into their parent when their class
+            distributions are within this L1 distance and agree on the top class
+            (None = no merging)
+    Returns:
+        New tree_nodes dictionary with nodes renumbered depth-first
+    """
+    feature, left, right, value = tree['feature'], tree['left'], tree['right'], tree['value']
+    keep = []          # Old node index for every new node
+    split = []         # Whether the new node is still a split
+    children = []      # (new left, new right) for splits
+
+    def visit(node, depth):
+        index = len(keep)
+        keep.append(node)
+        split.append(False)
+        children.append((-1, -1))
+        if feature[node] < 0 or (max_depth is not None and depth >= max_depth):
+            return index
+
+        new_left = visit(left[node], depth + 1)
+        new_right = visit(right[node], depth + 1)
+        if (merge_tol is not None and not split[new_left] and not split[new_right]
+                and np.argmax(value[keep[new_left]]) == np.argmax(value[keep[new_right]])
+                and np.abs(value[keep[new_left]] - value[keep[new_right]]).sum() <= merge_tol):
+            # Both children are leaves of the same class: this node becomes the leaf
+            del keep[index + 1:], split[index + 1:], children[index + 1:]
+            return index
+
+        split[index] = True
+        children[index] = (new_left, new_right)
+        return index
+
+    visit(0, 0)
+    keep = np.array(keep)
+    split = np.array(split)
+    children = np.array(children)
+    return {
+        'feature': np.where(split, feature[keep], -1),
+        'threshold': np.where(split, tree['threshold'][keep], -2.0),
+        'left': np.where(split, children[:, 0], -1),
+        'right': np.where(split, children[:, 1], -1),
+        'value': value[keep],
+    }
+
+
+def float32_thresholds(thresholds):
+    """
+    Round thresholds down to float32
+    For a float32 feature x, x <= t  <=>  x <= floor32(t), so predictions don't change
+    """
+    rounded = thresholds.astype(np.float32)
+    too_high = rounded.astype(np.float64) > thresholds
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def measure(arrays, classes, x_test, y_test, latency_rows):
+    """Held-out accuracy, median single-sample latency (ms) and size (bytes) of packed arrays"""
+    predictor = ForestPredictor.from_arrays(arrays, classes)
+    accuracy = float((predictor.predict(x_test) == y_test).mean())
+    timings = []
+    for row in latency_rows:
+        start = time.perf_counter()
+        predictor.predict_proba(row.reshape(1, -1))
+        timings.append((time.perf_counter() - start) * 1000)
+    size = int(sum(array.nbytes for array in arrays.values()))
+    return accuracy, float(np.median(timings)), size
+
+
+def candidate_settings(n_trees):
+    """Compaction settings ordered from least to most aggressive"""
+    counts = sorted({max(1, int(round(n_trees * f))) for f in TREE_FRACTIONS}, reverse=True)
+    settings = []
+    for merge_tol in MERGE_TOLERANCES:
+        for depth in DEPTH_LIMITS:
+            for count in counts:
+                settings.append({'n_trees': count, 'max_depth': depth, 'merge_tol': merge_tol})
+    # Fewer nodes visited per prediction first: trees x depth is a rough cost model
+    return sorted(settings, key=lambda s: (-s['n_trees'] * (s['max_depth'] or 64), s['merge_tol']))
+
+
+def compact(model, x_test, y_test, latency_budget_ms=None, size_budget_kb=None,
+            max_accuracy_loss=DEFAULT_MAX_ACCURACY_LOSS):
+    """
+    Shrink a forest until it meets the budget
+    Returns:
+        (packed arrays, report dictionary)
+    """
+    rng = np.random.default_rng(0)
+    latency_rows = x_test[rng.choice(len(x_test), min(LATENCY_SAMPLES, len(x_test)), replace=False)]
+    trees = [tree_nodes(estimator) for estimator in model.estimators_]
+    classes = model.classes_
+
+    original = pack_trees(trees)
+    base_accuracy, base_latency, base_size = measure(original, classes, x_test, y_test, latency_rows)
+    before = {'n_trees': len(trees), 'accuracy': base_accuracy, 'latency_ms': base_latency, 'size_bytes': base_size}
+    print(f"Original: {len(trees)} trees, {base_accuracy * 100:.2f}% accuracy, "
+          f"{base_latency:.3f}ms, {base_size / 1024:.0f} KB")
+
+    def meets_budget(latency, size):
+        return ((latency_budget_ms is None or latency <= latency_budget_ms)
+                and (size_budget_kb is None or size <= size_budget_kb * 1024))
+
+    pruned_cache = {}
+    best = None
+    for setting in candidate_settings(len(trees)):
+        key = (setting['max_depth'], setting['merge_tol'])
+        if key not in pruned_cache:
+            pruned_cache[key] = [prune_tree(t, setting['max_depth'], setting['merge_tol']) for t in trees]
+        arrays = pack_trees(pruned_cache[key][:setting['n_trees']], threshold_dtype=np.float64)
+        arrays['threshold'] = float32_thresholds(arrays['threshold'])
+        accuracy, latency, size = measure(arrays, classes, x_test, y_test, latency_rows)
+        if base_accuracy - accuracy > max_accuracy_loss:
+            continue
+        result = dict(setting, accuracy=accuracy, latency_ms=latency, size_bytes=size)
+        if best is None or (latency, size) < (best[1]['latency_ms'], best[1]['size_bytes']):
+            best = (arrays, result)
+        if meets_budget(latency, size):
+            return arrays, {'before': before, 'after': result, 'met_budget': True}
+
+    if best is None:
+        best = (original, dict(before, max_depth=None, merge_tol=None))
+    print("⚠️ No compaction meets the budget within the accuracy bound; keeping the fastest acceptable one")
+    return best[0], {'before': before, 'after': best[1], 'met_budget': False}
+
+
+def print_report(report):
+    before, after = report['before'], report['after']
+    print(f"\n{'':>10} {'trees':>6} {'depth':>6} {'size KB':>9} {'latency':>10} {'accuracy':>9}")
+    for name, row in (('before', before), ('after', after)):
+        print(f"{name:>10} {row['n_trees']:>6} {str(row.get('max_depth') or '-'):>6} "
+              f"{row['size_bytes'] / 1024:>9.0f} {row['latency_ms']:>8.3f}ms {row['accuracy'] * 100:>8.2f}%")
+    print(f"Size x{before['size_bytes'] / max(after['size_bytes'], 1):.1f} smaller, "
+          f"latency x{before['latency_ms'] / max(after['latency_ms'], 1e-9):.1f} faster, "
+          f"accuracy {(after['accuracy'] - before['accuracy']) * 100:+.2f} points")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact the trained forest to a latency or size budget')
+    parser.add_argument('--model', default=DEFAULT_PICKLE_PATH, help='Pickled model from train_classifier.py')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_DIR, help='Dataset the model was trained on')
+    parser.add_argument('--output', default=DEFAULT_ARTIFACT_DIR, help='Artifact directory to write')
+    parser.add_argument('--latency-budget', type=float, default=None, help='Target single-sample latency in ms')
+    parser.add_argument('--size-budget', type=float, default=None, help='Target model size in KB')
+    parser.add_argument('--max-accuracy-loss', type=float, default=DEFAULT_MAX_ACCURACY_LOSS,
+                        help='Largest allowed drop in held-out accuracy (0.01 = 1 point)')
+    args = parser.parse_args()
+    if args.latency_budget is None and args.size_budget is None:
+        parser.error('give --latency-budget and/or --size-budget')
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)['model']
+
+    # Rebuild the held-out split train_classifier.py used
+    training = {}
+    manifest_path = os.path.join(args.output, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            training = json.load(f).get('training', {})
+    data, labels = load_training_data(args.dataset)
+    if 'split_seed' not in training:
+        print("⚠️ Training split unknown (no manifest); held-out accuracy may include training samples")
+    _, test_idx = train_test_split(np.arange(len(labels)), test_size=training.get('test_size', 0.2), shuffle=True,
+                                   stratify=labels, random_state=training.get('split_seed', 42))
+    x_test = np.asarray(data[test_idx], dtype=np.float32)
+    y_test = np.asarray(labels[test_idx])
+
+    arrays, report = compact(model, x_test, y_test, args.latency_budget, args.size_budget, args.max_accuracy_loss)
+    print_report(report)
+
+    label_names = Dataset(args.dataset).label_names if os.path.exists(os.path.join(args.dataset, 'meta.json')) else []
+    training['compaction'] = report
+    manifest = write_artifact(arrays, args.output, model.classes_, label_names, training)
+    print(f"Compacted model artifact saved to {args.output}/ (hash {manifest['model_hash'][:12]})")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,91 +1,269 @@
 import os
-import pickle
+import argparse
+import time
+from multiprocessing import Pool
 import cv2
 import numpy as np
 import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
+from landmark_cache import LandmarkCache, DEFAULT_CACHE_PATH, detector_signature
+from dataset_store import DatasetWriter, DEFAULT_DATASET_DIR
+from dedup_dataset import deduplicate_indices, report_reduction
+from motion_dataset import build_windows, save_motion_dataset, DEFAULT_MOTION_DATASET_DIR
+from motion_features import DEFAULT_WINDOW
 
 DATA_DIR = './data'
 
 # Create alphabet mapping including SPACE and SEND
-alphabet_labels = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 
+alphabet_labels = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M',
                    'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z',
                    'SPACE', 'SEND']
 
-# Download the hand landmarker model if it doesn't exist
 model_path = 'hand_landmarker.task'
-if not os.path.exists(model_path):
-    import urllib.request
-    print("Downloading hand landmarker model...")
-    url = 'https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task'
-    urllib.request.urlretrieve(url, model_path)
-    print("Model downloaded successfully!")
-
-# Create hand landmarker
-base_options = python.BaseOptions(model_asset_path=model_path)
-options = vision.HandLandmarkerOptions(
-    base_options=base_options,
-    num_hands=1,
-    min_hand_detection_confidence=0.3,
-    min_hand_presence_confidence=0.3,
-    min_tracking_confidence=0.3
-)
-detector = vision.HandLandmarker.create_from_options(options)
-
-data = []
-labels = []
-
-for dir_ in os.listdir(DATA_DIR):
-    if not os.path.isdir(os.path.join(DATA_DIR, dir_)):
-        continue
-        
-    class_index = int(dir_)
-    letter = alphabet_labels[class_index]
-    print(f"Processing class {dir_} - Letter '{letter}'...")
-    
-    for img_path in os.listdir(os.path.join(DATA_DIR, dir_)):
-        if not img_path.lower().endswith(('.jpg', '.jpeg', '.png')):
-            continue
-            
-        data_aux = []
-        x_ = []
-        y_ = []
 
-        img = cv2.imread(os.path.join(DATA_DIR, dir_, img_path))
-        if img is None:
+# Images per work unit handed to a pool worker
+CHUNK_SIZE = 32
+
+
+def download_hand_landmarker():
+    """Download the hand landmarker model if it doesn't exist"""
+    if not os.path.exists(model_path):
+        import urllib.request
+        print("Downloading hand landmarker model...")
+        url = 'https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task'
+        urllib.request.urlretrieve(url, model_path)
+        print("Model downloaded successfully!")
+
+
+def create_detector(num_hands=1):
+    """
+    Create a hand landmarker
+    Each training image is labelled with one sign, so by default only the most
+    prominent hand is landmarked; a second hand in the frame would be an unlabelled sample.
+    """
+    base_options = python.BaseOptions(model_asset_path=model_path)
+    options = vision.HandLandmarkerOptions(
+        base_options=base_options,
+        num_hands=num_hands,
+        min_hand_detection_confidence=0.3,
+        min_hand_presence_confidence=0.3,
+        min_tracking_confidence=0.3
+    )
+    return vision.HandLandmarker.create_from_options(options)
+
+
+def list_images(data_dir):
+    """
+    List all training images in sorted path order
+    Returns:
+        List of (image path, class directory name) tuples
+    """
+    images = []
+    for dir_ in sorted(os.listdir(data_dir)):
+        if not os.path.isdir(os.path.join(data_dir, dir_)):
             continue
-            
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        
-        # Convert to MediaPipe Image
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
-        
-        # Detect hand landmarks
-        results = detector.detect(mp_image)
-        
-        if results.hand_landmarks:
-            for hand_landmarks in results.hand_landmarks:
-                # Extract x, y coordinates
-                for landmark in hand_landmarks:
-                    x_.append(landmark.x)
-                    y_.append(landmark.y)
-
-                # Normalize coordinates relative to bounding box
-                for landmark in hand_landmarks:
-                    data_aux.append(landmark.x - min(x_))
-                    data_aux.append(landmark.y - min(y_))
-
-            data.append(data_aux)
-            labels.append(dir_)  # Keep numeric labels for consistency
-
-print(f"Processed {len(data)} samples across {len(set(labels))} classes")
-
-# Save the dataset
-with open('data.pickle', 'wb') as f:
-    pickle.dump({'data': data, 'labels': labels}, f)
-
-print("Dataset saved as data.pickle")
-print("Alphabet mapping:")
-for i, letter in enumerate(alphabet_labels):
-    print(f"Class {i}: {letter}")
\ No newline at end of file
+        for img_path in sorted(os.listdir(os.path.join(data_dir, dir_))):
+            if img_path.lower().endswith(('.jpg', '.jpeg', '.png')):
+                images.append((os.path.join(data_dir, dir_, img_path), dir_))
+    return images
+
+
+def landmark_image(detector, img_path):
+    """
+    Run the hand landmarker on one image file
+    Returns:
+        Sample dictionary (see landmark_frame), or None if the image can't be
+        read or has no hand
+    """
+    img = cv2.imread(img_path)
+    if img is None:
+        return None
+    return landmark_frame(detector, img)
+
+
+def landmark_frame(detector, img):
+    """
+    Run the hand landmarker on one BGR frame
+    Returns:
+        Sample dictionary with 'features' (42 x, y values relative to the hand's
+        bounding box), raw 'landmarks' (21 x, y, z) and 'handedness', or None if
+        the frame has no hand
+    """
+    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+    # Convert to MediaPipe Image
+    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+
+    # Detect hand landmarks
+    results = detector.detect(mp_image)
+
+    if not results.hand_landmarks:
+        return None
+
+    hand_landmarks = results.hand_landmarks[0]
+    data_aux = []
+    x_ = []
+    y_ = []
+
+    # Extract x, y coordinates
+    for landmark in hand_landmarks:
+        x_.append(landmark.x)
+        y_.append(landmark.y)
+
+    # Normalize coordinates relative to bounding box
+    for landmark in hand_landmarks:
+        data_aux.append(landmark.x - min(x_))
+        data_aux.append(landmark.y - min(y_))
+
+    handedness = None
+    if results.handedness and results.handedness[0]:
+        handedness = results.handedness[0][0].category_name
+
+    return {
+        'features': data_aux,
+        'landmarks': [[lm.x, lm.y, lm.z] for lm in hand_landmarks],
+        'handedness': handedness,
+    }
+
+
+# Each pool worker builds its own detector once, in the initializer
+_worker_detector = None
+
+
+def _init_worker():
+    global _worker_detector
+    _worker_detector = create_detector()
+
+
+def _process_chunk(chunk):
+    """Landmark a chunk of (path, label) items in a pool worker"""
+    return [(img_path, label, landmark_image(_worker_detector, img_path)) for img_path, label in chunk]
+
+
+def build_dataset(data_dir, workers=1, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Landmark every image under data_dir
+    Args:
+        data_dir: Directory with one numbered subdirectory per class
+        workers: Number of worker processes (1 = run in this process)
+        cache_path: Landmark cache file, or None to landmark every image
+    Returns:
+        List of (image path, label, sample) tuples with a hand, in sorted path order
+    """
+    images = list_images(data_dir)
+    total = len(images)
+    print(f"Found {total} images in {len(set(label for _, label in images))} classes")
+
+    # Reuse cached landmarks for unchanged images
+    results = []
+    pending = images
+    cache = None
+    if cache_path:
+        cache = LandmarkCache(cache_path, detector_signature(model_path))
+        pending = []
+        for img_path, label in images:
+            hit, sample = cache.lookup(img_path)
+            if hit:
+                results.append((img_path, label, sample))
+            else:
+                pending.append((img_path, label))
+        removed = cache.prune(p for p, _ in images)
+        print(f"Landmark cache: {cache.hits} unchanged, {len(pending)} new or changed, {removed} deleted")
+
+    todo = len(pending)
+    if todo:
+        print(f"Landmarking {todo} images using {workers} worker(s)")
+    chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, todo, CHUNK_SIZE)]
+    start_time = time.time()
+
+    def report(done):
+        elapsed = time.time() - start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(f"  {done}/{todo} images ({done * 100 // max(todo, 1)}%) - {rate:.1f} images/s")
+
+    landmarked = []
+    if chunks and workers <= 1:
+        detector = create_detector()
+        for chunk in chunks:
+            landmarked.extend((p, label, landmark_image(detector, p)) for p, label in chunk)
+            report(len(landmarked))
+    elif chunks:
+        # Chunks finish out of order; results are re-sorted by path below
+        with Pool(processes=min(workers, len(chunks)), initializer=_init_worker) as pool:
+            for chunk_results in pool.imap_unordered(_process_chunk, chunks):
+                landmarked.extend(chunk_results)
+                report(len(landmarked))
+
+    if todo:
+        elapsed = time.time() - start_time
+        print(f"Landmarked {todo} images in {elapsed:.1f}s ({todo / max(elapsed, 1e-9):.1f} images/s)")
+
+    if cache is not None:
+        for img_path, _, sample in landmarked:
+            cache.store(img_path, sample)
+        cache.save()
+        no_hand = cache.no_hand_images()
+        if no_hand:
+            print(f"Images without a hand (recorded in {cache_path}): {', '.join(no_hand[:5])}"
+                  f"{' ...' if len(no_hand) > 5 else ''}")
+
+    results.extend(landmarked)
+    results.sort(key=lambda r: r[0])
+    samples = [r for r in results if r[2] is not None]
+    print(f"{total - len(samples)} of {total} images had no hand")
+    return samples
+
+
+def save_dataset(samples, dataset_dir=DEFAULT_DATASET_DIR):
+    """Write landmarked samples in the columnar dataset format"""
+    writer = DatasetWriter(dataset_dir, len(samples), alphabet_labels)
+    for img_path, label, sample in samples:
+        writer.append(sample['features'], label, sample['landmarks'], sample['handedness'], img_path)
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create the landmark dataset from collected images')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Directory of collected images')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: all cores)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Landmark cache file')
+    parser.add_argument('--output', default=DEFAULT_DATASET_DIR, help='Output dataset directory')
+    parser.add_argument('--no-cache', action='store_true', help='Landmark every image, ignoring the cache')
+    parser.add_argument('--dedup', type=float, default=None, metavar='THRESHOLD',
+                        help='Drop near-duplicate samples using this grid cell size (e.g. 0.01)')
+    parser.add_argument('--motion', nargs='?', const=DEFAULT_MOTION_DATASET_DIR, default=None, metavar='DIR',
+                        help='Also write windowed motion samples for the motion head (default dir: dataset_motion)')
+    args = parser.parse_args()
+
+    download_hand_landmarker()
+
+    samples = build_dataset(args.data_dir, max(args.workers, 1), None if args.no_cache else args.cache)
+
+    print(f"Processed {len(samples)} samples across {len(set(label for _, label, _ in samples))} classes")
+
+    if args.motion:
+        # Before deduplication, which breaks up the capture runs
+        windows = build_windows(np.array([s['landmarks'] for _, _, s in samples]),
+                                np.array([int(label) for _, label, _ in samples]),
+                                [img_path for img_path, _, _ in samples])
+        save_motion_dataset(args.motion, *windows, window=DEFAULT_WINDOW, label_names=alphabet_labels)
+
+    if args.dedup:
+        keep = deduplicate_indices(np.array([s['features'] for _, _, s in samples], dtype=np.float32),
+                                   np.array([int(label) for _, label, _ in samples]), args.dedup)
+        report_reduction(len(samples), len(keep))
+        samples = [samples[i] for i in keep]
+
+    # Save the dataset
+    save_dataset(samples, args.output)
+
+    print(f"Dataset saved to {args.output}/")
+    print("Alphabet mapping:")
+    for i, letter in enumerate(alphabet_labels):
+        print(f"Class {i}: {letter}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Columnar Landmark Dataset Format
+Replaces data.pickle with one .npy file per column so training and evaluation
+can memory-map the dataset instead of unpickling Python lists:
+
+    dataset/
+        features.npy     float32 (N, 42)    normalized x/y features
+        labels.npy       int32   (N,)       class index
+        landmarks.npy    float32 (N, 21, 3) raw x/y/z landmarks
+        handedness.npy   int8    (N,)       0 = left, 1 = right, -1 = unknown
+        paths.npy        str     (N,)       source image path
+        meta.json        sample count, label names, format version
+"""
+
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+FORMAT_VERSION = 1
+DEFAULT_DATASET_DIR = 'dataset'
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 2
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+MAX_PATH_LENGTH = 256
+
+
+class Dataset:
+    def __init__(self, dataset_dir=DEFAULT_DATASET_DIR, mmap=True):
+        """
+        Open a columnar dataset
+        Args:
+            dataset_dir: Directory written by DatasetWriter
+            mmap: Memory-map the columns (read-only) instead of reading them into RAM
+        """
+        with open(os.path.join(dataset_dir, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset version: {self.meta.get('version')}")
+
+        mode = 'r' if mmap else None
+
+        def load(name):
+            return np.load(os.path.join(dataset_dir, f'{name}.npy'), mmap_mode=mode)
+
+        self.dataset_dir = dataset_dir
+        self.features = load('features')
+        self.labels = load('labels')
+        self.landmarks = load('landmarks')
+        self.handedness = load('handedness')
+        self.paths = load('paths')
+        self.label_names = self.meta.get('label_names', [])
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class DatasetWriter:
+    def __init__(self, dataset_dir, num_samples, label_names=None):
+        """
+        Create the column files for num_samples rows, written incrementally
+        Args:
+            dataset_dir: Output directory
+            num_samples: Total number of rows that will be appended
+            label_names: Optional names of the class indices
+        """
+        os.makedirs(dataset_dir, exist_ok=True)
+        self.dataset_dir = dataset_dir
+        self.num_samples = num_samples
+        self.label_names = list(label_names or [])
+        self.count = 0
+
+        def create(name, dtype, shape):
+            return open_memmap(os.path.join(dataset_dir, f'{name}.npy'), mode='w+',
+                               dtype=dtype, shape=(num_samples,) + shape)
+
+        self.features = create('features', np.float32, (NUM_FEATURES,))
+        self.labels = create('labels', np.int32, ())
+        self.landmarks = create('landmarks', np.float32, (NUM_LANDMARKS, 3))
+        self.handedness = create('handedness', np.int8, ())
+        self.paths = create('paths', f'<U{MAX_PATH_LENGTH}', ())
+
+    def append(self, features, label, landmarks, handedness, path):
+        """Write one sample"""
+        if self.count >= self.num_samples:
+            raise IndexError("DatasetWriter is full")
+        i = self.count
+        self.features[i] = features
+        self.labels[i] = int(label)
+        self.landmarks[i] = landmarks
+        self.handedness[i] = HANDEDNESS_CODES.get(handedness, -1)
+        self.paths[i] = path[-MAX_PATH_LENGTH:]
+        self.count += 1
+
+    def append_batch(self, features, labels, landmarks, handedness, paths):
+        """
+        Write a block of samples
+        Args:
+            features: (n, 42) array
+            labels: (n,) class indices
+            landmarks: (n, 21, 3) array
+            handedness: (n,) handedness codes (0, 1 or -1)
+            paths: n source paths
+        """
+        n = len(labels)
+        if self.count + n > self.num_samples:
+            raise IndexError("DatasetWriter is full")
+        block = slice(self.count, self.count + n)
+        self.features[block] = features
+        self.labels[block] = labels
+        self.landmarks[block] = landmarks
+        self.handedness[block] = handedness
+        self.paths[block] = [p[-MAX_PATH_LENGTH:] for p in paths]
+        self.count += n
+
+    def close(self):
+        """Flush the columns and write meta.json"""
+        if self.count != self.num_samples:
+            raise ValueError(f"Expected {self.num_samples} samples, got {self.count}")
+        for column in (self.features, self.labels, self.landmarks, self.handedness, self.paths):
+            column.flush()
+        labels = np.asarray(self.labels)
+        meta = {
+            'version': FORMAT_VERSION,
+            'num_samples': self.num_samples,
+            'num_features': NUM_FEATURES,
+            'classes': sorted(int(c) for c in np.unique(labels)),
+            'label_names': self.label_names,
+        }
+        with open(os.path.join(self.dataset_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+
+def load_training_data(dataset_dir=DEFAULT_DATASET_DIR, pickle_path='./data.pickle'):
+    """
+    Load (features, labels) for training, preferring the columnar dataset
+    Falls back to the legacy data.pickle if no columnar dataset exists
+    Returns:
+        (features, labels) NumPy arrays; memory-mapped for the columnar format
+    """
+    if os.path.exists(os.path.join(dataset_dir, 'meta.json')):
+        dataset = Dataset(dataset_dir)
+        return dataset.features, dataset.labels
+
+    import pickle
+    print(f"⚠️ No columnar dataset in {dataset_dir}, loading legacy {pickle_path}")
+    with open(pickle_path, 'rb') as f:
+        data_dict = pickle.load(f)
+    return np.asarray(data_dict['data'], dtype=np.float32), np.asarray(data_dict['labels']).astype(np.int32)
+
+
+def append_to_dataset(dataset_dir, samples, label_names=None):
+    """
+    Add landmarked samples to a dataset, creating it if needed
+    Rows of the existing dataset with the same path as a new sample are replaced,
+    so re-collecting a class doesn't leave stale rows behind. The dataset is
+    rewritten to a temporary directory and swapped in.
+    Args:
+        dataset_dir: Dataset directory
+        samples: List of (image path, label, sample dictionary) tuples
+        label_names: Names of the class indices, used when creating the dataset
+    Returns:
+        Number of rows in the updated dataset
+    """
+    existing = None
+    keep = np.zeros(0, dtype=np.int64)
+    if os.path.exists(os.path.join(dataset_dir, 'meta.json')):
+        existing = Dataset(dataset_dir)
+        label_names = existing.label_names or label_names
+        new_paths = set(path[-MAX_PATH_LENGTH:] for path, _, _ in samples)
+        keep = np.array([i for i, p in enumerate(existing.paths) if str(p) not in new_paths], dtype=np.int64)
+
+    tmp_dir = dataset_dir.rstrip('/\\') + '.tmp'
+    writer = DatasetWriter(tmp_dir, len(keep) + len(samples), label_names)
+    if len(keep):
+        writer.append_batch(existing.features[keep], existing.labels[keep], existing.landmarks[keep],
+                            existing.handedness[keep], [str(p) for p in existing.paths[keep]])
+    for img_path, label, sample in samples:
+        writer.append(sample['features'], label, sample['landmarks'], sample['handedness'], img_path)
+    writer.close()
+    total = writer.num_samples
+
+    del existing, writer  # Release the memory maps before swapping directories
+    replace_dataset(tmp_dir, dataset_dir)
+    return total
+
+
+def replace_dataset(new_dir, dataset_dir):
+    """Swap a freshly written dataset directory in place of dataset_dir"""
+    import shutil
+
+    if not os.path.exists(dataset_dir):
+        os.replace(new_dir, dataset_dir)
+        return
+    # Two renames, so readers find dataset_dir missing only for an instant
+    old_dir = dataset_dir.rstrip('/\\') + '.old'
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+    os.replace(dataset_dir, old_dir)
+    os.replace(new_dir, dataset_dir)
+    shutil.rmtree(old_dir)
@@ -0,0 +1,131 @@
+"""
+Near-Duplicate Removal for the Landmark Dataset
+collect_imgs.py saves frames 25ms apart, so consecutive samples of a held sign
+are nearly identical. This pass keeps one representative per group of samples
+of the same class whose features all lie within `threshold` of each other
+(Chebyshev distance), preferring the first sample in path order. It can run on
+its own or from create_dataset.py with --dedup.
+
+Two stages keep it fast on long capture sessions:
+1. Quantized hashing: features are snapped to a grid of threshold/2 cells and
+   rows are collapsed per (class, cell) with one np.unique call. Samples in the
+   same cell are always within the threshold.
+2. Leader clustering: the surviving cell representatives are compared, one
+   vectorized distance computation per sample, against the representatives
+   already kept for their class, which catches near-duplicates that straddle
+   a cell boundary.
+
+Usage:
+    python dedup_dataset.py --threshold 0.01
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from dataset_store import Dataset, DatasetWriter, DEFAULT_DATASET_DIR, replace_dataset
+
+DEFAULT_THRESHOLD = 0.01  # Grid cell size in normalized image coordinates
+BATCH_SIZE = 8192
+
+
+def grid_representatives(features, labels, cell_size):
+    """
+    Collapse samples that fall in the same grid cell
+    Returns:
+        Sorted indices of the first sample of every occupied (class, cell)
+    """
+    cells = np.floor(np.asarray(features, dtype=np.float64) / cell_size).astype(np.int32)
+    keys = np.concatenate([np.asarray(labels, dtype=np.int32)[:, None], cells], axis=1)
+    # View each row as one opaque scalar so np.unique compares whole rows at once
+    row_keys = np.ascontiguousarray(keys).view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1])))
+    _, first = np.unique(row_keys.ravel(), return_index=True)
+    return np.sort(first)
+
+
+def deduplicate_indices(features, labels, threshold=DEFAULT_THRESHOLD):
+    """
+    Pick one representative per group of near-identical samples
+    Args:
+        features: (n, d) feature array
+        labels: (n,) class indices; samples of different classes are never merged
+        threshold: Largest per-coordinate difference treated as a duplicate
+    Returns:
+        Sorted indices of the samples to keep
+    """
+    labels = np.asarray(labels)
+    if len(labels) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    candidates = grid_representatives(features, labels, threshold / 2)
+    features = np.asarray(features, dtype=np.float32)
+
+    keep = []
+    for label in np.unique(labels[candidates]):
+        rows = candidates[labels[candidates] == label]
+        leaders = np.empty((len(rows), features.shape[1]), dtype=np.float32)
+        count = 0
+        for row in rows:
+            sample = features[row]
+            if count and np.abs(leaders[:count] - sample).max(axis=1).min() <= threshold:
+                continue
+            leaders[count] = sample
+            count += 1
+            keep.append(row)
+    return np.sort(np.array(keep, dtype=np.int64))
+
+
+def report_reduction(before, after):
+    """Print how much the dataset shrank"""
+    removed = before - after
+    ratio = before / after if after else float('inf')
+    print(f"Deduplication kept {after} of {before} samples "
+          f"({removed} near-duplicates removed, {removed * 100 / max(before, 1):.1f}%, {ratio:.2f}x reduction)")
+
+
+def dedup_dataset(dataset_dir=DEFAULT_DATASET_DIR, output_dir=None, threshold=DEFAULT_THRESHOLD):
+    """
+    Write a deduplicated copy of a columnar dataset
+    Args:
+        dataset_dir: Source dataset
+        output_dir: Destination directory; None replaces the source dataset
+        threshold: Grid cell size
+    Returns:
+        (samples before, samples after)
+    """
+    source = Dataset(dataset_dir)
+    keep = deduplicate_indices(source.features, source.labels, threshold)
+
+    in_place = output_dir is None or os.path.abspath(output_dir) == os.path.abspath(dataset_dir)
+    target = dataset_dir.rstrip('/\\') + '.tmp' if in_place else output_dir
+    writer = DatasetWriter(target, len(keep), source.label_names)
+    for begin in range(0, len(keep), BATCH_SIZE):
+        rows = keep[begin:begin + BATCH_SIZE]
+        writer.append_batch(source.features[rows], source.labels[rows], source.landmarks[rows],
+                            source.handedness[rows], [str(p) for p in source.paths[rows]])
+    writer.close()
+
+    before = len(source)
+    if in_place:
+        del source, writer  # Release the memory maps before swapping directories
+        replace_dataset(target, dataset_dir)
+
+    report_reduction(before, len(keep))
+    return before, len(keep)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove near-duplicate samples from the landmark dataset')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_DIR, help='Dataset directory')
+    parser.add_argument('--output', default=None, help='Output directory (default: replace the dataset)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Grid cell size; larger values merge more samples')
+    args = parser.parse_args()
+
+    dedup_dataset(args.dataset, args.output, args.threshold)
+    print(f"Deduplicated dataset saved to {args.output or args.dataset}/")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+Memory-Mapped Random Forest Artifact
+Stores a trained RandomForestClassifier as flat node arrays plus a JSON manifest
+instead of a pickle:
+
+    model/
+        manifest.json      labels, feature schema, training stats, content hash
+        feature.npy        int32   (nodes,)          split feature, -1 for leaves
+        threshold.npy      float64 (nodes,)          split threshold (x <= t goes left;
+                                                    float32 after compact_forest.py)
+        left.npy           int32   (nodes,)          left child (global node index)
+        right.npy          int32   (nodes,)          right child (global node index)
+        leaf_index.npy     int32   (nodes,)          row in leaf_values, -1 for splits
+        leaf_values.npy    float32 (leaves, classes) class probabilities of each leaf
+        roots.npy          int32   (trees,)          root node of each tree
+
+The arrays are opened with np.load(mmap_mode='r'), so loading takes milliseconds
+and every server worker on the machine shares one physical copy through the page
+cache. ForestPredictor evaluates all trees at once with NumPy, level by level,
+and exposes the classes_ / predict_proba / predict interface the code already
+uses with the sklearn model.
+
+Usage:
+    python forest_artifact.py model.p --output model
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+ARTIFACT_VERSION = 1
+DEFAULT_ARTIFACT_DIR = 'model'
+DEFAULT_PICKLE_PATH = './model.p'
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'leaf_index', 'leaf_values', 'roots')
+FEATURE_SCHEMA = {
+    'num_features': 42,
+    'layout': 'x0, y0, x1, y1, ... x20, y20',
+    'normalization': 'landmark x/y minus the minimum x/y of the hand',
+}
+
+
+def tree_nodes(estimator):
+    """
+    Node arrays of one fitted decision tree, with local node indices
+    Returns:
+        Dictionary with feature (-1 for leaves), threshold, left, right (-1 for
+        leaves) and value (class probabilities of every node)
+    """
+    tree = estimator.tree_
+    is_leaf = tree.children_left < 0
+    value = tree.value[:, 0, :]
+    return {
+        'feature': np.where(is_leaf, -1, tree.feature),
+        'threshold': tree.threshold,
+        'left': tree.children_left,
+        'right': tree.children_right,
+        'value': value / value.sum(axis=1, keepdims=True),
+    }
+
+
+def pack_trees(trees, threshold_dtype=np.float64):
+    """
+    Concatenate per-tree node arrays into the global arrays of the artifact
+    Args:
+        trees: List of tree_nodes dictionaries
+        threshold_dtype: dtype of the stored split thresholds
+    Returns:
+        Dictionary of the arrays listed in ARRAY_NAMES
+    """
+    features, thresholds, lefts, rights, leaf_indices, leaf_values, roots = [], [], [], [], [], [], []
+    offset = 0
+    leaves = 0
+    for tree in trees:
+        n = len(tree['feature'])
+        is_leaf = tree['feature'] < 0
+
+        leaf_index = np.full(n, -1, dtype=np.int64)
+        leaf_index[is_leaf] = leaves + np.arange(is_leaf.sum())
+
+        features.append(tree['feature'])
+        thresholds.append(tree['threshold'])
+        lefts.append(np.where(is_leaf, -1, tree['left'] + offset))
+        rights.append(np.where(is_leaf, -1, tree['right'] + offset))
+        leaf_indices.append(leaf_index)
+        leaf_values.append(tree['value'][is_leaf])
+        roots.append(offset)
+        offset += n
+        leaves += int(is_leaf.sum())
+
+    return {
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(threshold_dtype),
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'leaf_index': np.concatenate(leaf_indices).astype(np.int32),
+        'leaf_values': np.concatenate(leaf_values).astype(np.float32),
+        'roots': np.array(roots, dtype=np.int32),
+    }
+
+
+def forest_arrays(model):
+    """Flatten the trees of a fitted RandomForestClassifier into global node arrays"""
+    return pack_trees([tree_nodes(estimator) for estimator in model.estimators_])
+
+
+def tree_depths(arrays):
+    """Depth of the deepest tree (number of splits on the longest root-to-leaf path)"""
+    frontier = np.asarray(arrays['roots'])
+    depth = 0
+    while True:
+        frontier = frontier[arrays['feature'][frontier] >= 0]
+        if not len(frontier):
+            return depth
+        frontier = np.concatenate([arrays['left'][frontier], arrays['right'][frontier]])
+        depth += 1
+
+
+def write_artifact(arrays, output_dir, classes, label_names=None, training_stats=None):
+    """
+    Write node arrays and the manifest
+    Args:
+        arrays: Output of forest_arrays
+        output_dir: Artifact directory
+        classes: Class ids in predict_proba column order
+        label_names: Optional names of the class ids
+        training_stats: Optional dictionary stored in the manifest (samples, accuracy, params, ...)
+    Returns:
+        The manifest dictionary
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    digest = hashlib.sha1()
+    for name in ARRAY_NAMES:
+        array = np.ascontiguousarray(arrays[name])
+        np.save(os.path.join(output_dir, f'{name}.npy'), array)
+        digest.update(name.encode())
+        digest.update(array.dtype.str.encode())
+        digest.update(array.tobytes())
+
+    manifest = {
+        'version': ARTIFACT_VERSION,
+        'model_hash': digest.hexdigest(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'classes': [int(c) for c in classes],
+        'label_names': list(label_names or []),
+        'feature_schema': FEATURE_SCHEMA,
+        'n_trees': int(len(arrays['roots'])),
+        'n_nodes': int(len(arrays['feature'])),
+        'n_leaves': int(len(arrays['leaf_values'])),
+        'max_depth': tree_depths(arrays),
+        'size_bytes': int(sum(arrays[name].nbytes for name in ARRAY_NAMES)),
+        'training': training_stats or {},
+    }
+    # Manifest last: a directory with a manifest always has complete arrays
+    tmp_path = os.path.join(output_dir, 'manifest.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(output_dir, 'manifest.json'))
+    return manifest
+
+
+def export_forest(model, output_dir=DEFAULT_ARTIFACT_DIR, label_names=None, training_stats=None):
+    """Write a fitted RandomForestClassifier as a memory-mappable artifact"""
+    return write_artifact(forest_arrays(model), output_dir, model.classes_, label_names, training_stats)
+
+
+class ForestPredictor:
+    def __init__(self, artifact_dir=DEFAULT_ARTIFACT_DIR, mmap=True):
+        """
+        Open a forest artifact
+        Args:
+            artifact_dir: Directory written by export_forest
+            mmap: Memory-map the node arrays instead of reading them into RAM
+        """
+        with open(os.path.join(artifact_dir, 'manifest.json'), 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported model artifact version: {manifest.get('version')}")
+
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(artifact_dir, f'{name}.npy'), mmap_mode=mode)
+                  for name in ARRAY_NAMES}
+        self._setup(arrays, manifest)
+        self.artifact_dir = artifact_dir
+
+    @classmethod
+    def from_arrays(cls, arrays, classes):
+        """Predictor over in-memory node arrays (e.g. while compacting a forest)"""
+        predictor = cls.__new__(cls)
+        predictor._setup(arrays, {'classes': [int(c) for c in classes], 'max_depth': tree_depths(arrays),
+                                  'model_hash': None})
+        predictor.artifact_dir = None
+        return predictor
+
+    def _setup(self, arrays, manifest):
+        self.manifest = manifest
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self.classes_ = np.array(manifest['classes'])
+        self.max_depth = manifest['max_depth']
+        self.model_hash = manifest['model_hash']
+
+    def apply(self, X):
+        """
+        Leaf reached in every tree by every sample
+        Returns:
+            (n_samples, n_trees) array of global node indices
+        """
+        X = np.asarray(X, dtype=np.float32)
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.max_depth):
+            feature = self.feature[nodes]
+            split = feature >= 0
+            if not split.any():
+                break
+            # Leaves get feature -1; the lookup result is discarded for them
+            go_left = X[rows, np.maximum(feature, 0)] <= self.threshold[nodes]
+            nodes = np.where(split, np.where(go_left, self.left[nodes], self.right[nodes]), nodes)
+        return nodes
+
+    def predict_proba(self, X):
+        """Mean leaf class probabilities over all trees, columns ordered like classes_"""
+        leaves = self.leaf_index[self.apply(X)]
+        return self.leaf_values[leaves].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def load_model(artifact_dir=DEFAULT_ARTIFACT_DIR, pickle_path=DEFAULT_PICKLE_PATH):
+    """
+    Load the classifier, preferring the memory-mapped artifact over model.p
+    The artifact may be a forest or a k-NN model (see knn_model.py)
+    Returns:
+        Object with classes_, predict_proba and predict
+    """
+    manifest_path = os.path.join(artifact_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            model_type = json.load(f).get('type', 'forest')
+        if model_type == 'knn':
+            from knn_model import KNNModel
+            predictor = KNNModel(artifact_dir)
+            print(f"k-NN model {artifact_dir}/ ({len(predictor.labels)} samples, hash {predictor.model_hash[:12]})")
+            return predictor
+
+        predictor = ForestPredictor(artifact_dir)
+        print(f"Model artifact {artifact_dir}/ ({predictor.manifest['n_trees']} trees, "
+              f"hash {predictor.model_hash[:12]})")
+        return predictor
+
+    with open(pickle_path, 'rb') as f:
+        return pickle.load(f)['model']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert model.p to a memory-mappable forest artifact')
+    parser.add_argument('model', nargs='?', default=DEFAULT_PICKLE_PATH, help='Pickled model from train_classifier.py')
+    parser.add_argument('--output', default=DEFAULT_ARTIFACT_DIR, help='Artifact directory')
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)['model']
+    manifest = export_forest(model, args.output)
+    print(f"Exported {manifest['n_trees']} trees ({manifest['n_nodes']} nodes, "
+          f"{manifest['size_bytes'] / 1024:.0f} KB) to {args.output}/")
+
+
+if __name__ == '__main__':
+    main()
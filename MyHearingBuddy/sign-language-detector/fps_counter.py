@@ -0,0 +1,37 @@
+"""
+Per-Stage FPS Counter
+Thread-safe rate meter for pipeline stages (capture, inference, render).
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class FPSCounter:
+    def __init__(self, window=1.0):
+        """
+        Args:
+            window: Seconds of history the rate is computed over
+        """
+        self.window = window
+        self.ticks = deque()
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def tick(self, now=None):
+        """Record one processed item"""
+        now = now or time.time()
+        with self.lock:
+            self.ticks.append(now)
+            self.total += 1
+            while self.ticks and now - self.ticks[0] > self.window:
+                self.ticks.popleft()
+
+    def fps(self, now=None):
+        """Items per second over the last window"""
+        now = now or time.time()
+        with self.lock:
+            while self.ticks and now - self.ticks[0] > self.window:
+                self.ticks.popleft()
+            return len(self.ticks) / self.window
@@ -0,0 +1,123 @@
+"""
+Adaptive Detection Scheduling
+Running the MediaPipe hand landmarker on every frame is the bulk of the per-frame
+cost, yet while a sign is held still consecutive frames give the same landmarks
+and the same letter. The scheduler runs detection every N frames and reuses the
+last result in between:
+
+- N doubles (up to MAX_INTERVAL) after each detection that found a hand that
+  barely moved since the previous detection and was classified confidently
+- N drops back to 1 when the hand moves, disappears or the prediction is unsure
+- on skipped frames a cheap check compares a small grayscale thumbnail of the
+  hand's region with the one taken at the last detection; if the pixels changed,
+  detection runs right away instead of waiting for the interval
+
+Used by the desktop detector (inference_classifier.py) and the API server's
+streaming sessions.
+"""
+
+import cv2
+import numpy as np
+
+MAX_INTERVAL = 8                 # Frames between detections for a steady hand
+CONFIDENCE_THRESHOLD = 0.6       # Below this the next frame is always detected
+LANDMARK_MOTION_THRESHOLD = 0.04 # Mean landmark displacement, relative to hand size
+PIXEL_MOTION_THRESHOLD = 6.0     # Mean absolute gray-level change in the hand region
+THUMBNAIL_SIZE = 24
+HAND_LANDMARKS = 21
+ROI_MARGIN = 0.15
+
+
+def hand_thumbnail(frame, landmarks):
+    """
+    Small grayscale thumbnail of the region around a hand
+    Args:
+        frame: BGR frame
+        landmarks: (n, 2) normalized x, y coordinates (the region covers all of them)
+    """
+    H, W = frame.shape[:2]
+    low = landmarks.min(axis=0)
+    high = landmarks.max(axis=0)
+    margin = (high - low) * ROI_MARGIN
+    x1, y1 = np.clip(((low - margin) * (W, H)).astype(int), 0, (W - 1, H - 1))
+    x2, y2 = np.clip(((high + margin) * (W, H)).astype(int) + 1, 1, (W, H))
+    roi = frame[y1:max(y2, y1 + 1), x1:max(x2, x1 + 1)]
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, (THUMBNAIL_SIZE, THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class AdaptiveScheduler:
+    def __init__(self, max_interval=MAX_INTERVAL, confidence_threshold=CONFIDENCE_THRESHOLD,
+                 motion_threshold=LANDMARK_MOTION_THRESHOLD, pixel_threshold=PIXEL_MOTION_THRESHOLD):
+        """
+        Args:
+            max_interval: Largest number of frames between two detections (1 = detect every frame)
+            confidence_threshold: Predictions below this confidence reset the interval
+            motion_threshold: Landmark displacement between detections, relative to hand size,
+                above which the hand counts as moving
+            pixel_threshold: Change of the hand region on a skipped frame that forces detection
+        """
+        self.max_interval = max_interval
+        self.confidence_threshold = confidence_threshold
+        self.motion_threshold = motion_threshold
+        self.pixel_threshold = pixel_threshold
+
+        self.interval = 1
+        self.since_detection = 0
+        self.landmarks = None       # Landmarks of the last detection
+        self.thumbnail = None
+        self.cached = None          # Caller's result of the last detection
+
+        self.frames = 0
+        self.detections = 0
+
+    def should_detect(self, frame):
+        """Whether this frame needs a full detection; otherwise reuse `cached`"""
+        self.frames += 1
+        self.since_detection += 1
+        if self.cached is None or self.landmarks is None or self.since_detection >= self.interval:
+            return True
+        if self.pixel_threshold is not None:
+            change = np.abs(hand_thumbnail(frame, self.landmarks) - self.thumbnail).mean()
+            if change > self.pixel_threshold:
+                self.interval = 1
+                return True
+        return False
+
+    def record(self, frame, landmarks, confidence, result):
+        """
+        Store a detection and adapt the interval
+        Args:
+            frame: The detected frame
+            landmarks: (21 * n_hands, 2) normalized x, y of the detected hands, or None without a hand
+            confidence: Classifier probability of the (primary) prediction
+            result: Whatever the caller wants back on skipped frames
+        """
+        self.detections += 1
+        self.since_detection = 0
+        self.cached = result
+
+        if landmarks is None:
+            self.landmarks = self.thumbnail = None
+            self.interval = 1
+            return
+
+        landmarks = np.asarray(landmarks, dtype=np.float32)[:, :2]
+        steady = False
+        if self.landmarks is not None and self.landmarks.shape == landmarks.shape:
+            hands = landmarks.reshape(-1, HAND_LANDMARKS, 2)
+            hand_size = max(float((hands.max(axis=1) - hands.min(axis=1)).max(axis=1).mean()), 1e-6)
+            motion = np.linalg.norm(landmarks - self.landmarks, axis=1).mean() / hand_size
+            steady = motion <= self.motion_threshold
+
+        if steady and confidence >= self.confidence_threshold:
+            self.interval = min(self.interval * 2, self.max_interval)
+        else:
+            self.interval = 1
+
+        self.landmarks = landmarks
+        self.thumbnail = hand_thumbnail(frame, landmarks) if self.pixel_threshold is not None else None
+
+    def detection_rate(self):
+        """Fraction of frames that ran a full detection"""
+        return self.detections / self.frames if self.frames else 1.0
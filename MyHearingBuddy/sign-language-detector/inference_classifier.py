@@ -1,10 +1,20 @@
-import pickle
 import cv2
 import numpy as np
 import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
+import argparse
+import queue
 import time
+import threading
+from forest_artifact import load_model
+from camera_reader import CameraReader
+from fps_counter import FPSCounter
+from overlay_renderer import OverlayRenderer
+from frame_scheduler import AdaptiveScheduler
+from probability_smoother import ProbabilitySmoother
+from motion_features import MotionTracker, load_motion_head
+from landmark_features import landmarks_array, normalize_landmarks, hand_labels
 
 # Try to import OpenAI integration
 try:
@@ -38,310 +48,500 @@ def send_to_openai(text):
         print(f"❌ {error_msg}")
         return error_msg
 
-def main():
-    # Load the trained model
-    model_dict = pickle.load(open('./model.p', 'rb'))
-    model = model_dict['model']
+class SendDispatcher:
+    def __init__(self, send=None):
+        """
+        Sends completed text to OpenAI on a background thread so detection and
+        rendering keep running during the round trip. Requests are handled one at
+        a time in order; a text that is already waiting or in flight is not sent again.
+        Args:
+            send: Function taking the text and returning the response (default: send_to_openai)
+        """
+        self.send = send or send_to_openai
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = []               # Texts queued or in flight, oldest first
+        self.response = ""              # Most recent response
+        self.lock = threading.Lock()
+        self.thread = None
 
-    # Initialize camera
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("Error: Could not open camera")
-        return
+    def submit(self, text):
+        """
+        Queue text for sending
+        Returns:
+            False if the same text is already being sent
+        """
+        with self.lock:
+            if text in self.pending:
+                print(f"⏳ Already sending '{text}', waiting for the response")
+                return False
+            self.pending.append(text)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='openai-send', daemon=True)
+                self.thread.start()
+        self.requests.put(text)
+        return True
 
-    # Create hand landmarker
+    def _run(self):
+        while True:
+            text = self.requests.get()
+            if text is None:
+                break
+            response = "Send failed"
+            try:
+                response = self.send(text)
+            except Exception as e:
+                # Any send callable may raise; the thread must survive and the text must leave pending
+                print(f"❌ Sending '{text}' failed: {e}")
+                response = f"Send failed: {e}"
+            finally:
+                with self.lock:
+                    self.pending.remove(text)
+                    self.response = response
+                self.results.put((text, response))
+
+    def poll(self):
+        """(text, response) pairs completed since the last call"""
+        completed = []
+        while True:
+            try:
+                completed.append(self.results.get_nowait())
+            except queue.Empty:
+                return completed
+
+    def status(self):
+        """Texts still waiting for a response and the last response, for drawing"""
+        with self.lock:
+            return {'pending': list(self.pending), 'response': self.response}
+
+    def stop(self):
+        """
+        Stop the sender thread
+        The request in flight finishes in the background (the thread is a daemon, so
+        exiting the program cuts it off); queued texts that haven't been sent are
+        dropped and reported.
+        """
+        if self.thread is None:
+            return
+        while True:
+            try:
+                text = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if text is not None:
+                print(f"⚠️ Not sent (stopped): '{text}'")
+                with self.lock:
+                    self.pending.remove(text)
+        self.requests.put(None)
+        self.thread.join(timeout=0.1)
+
+
+# Labels for all 28 classes (A-Z + SPACE + SEND)
+labels_dict = {
+    0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H', 8: 'I', 9: 'J',
+    10: 'K', 11: 'L', 12: 'M', 13: 'N', 14: 'O', 15: 'P', 16: 'Q', 17: 'R', 18: 'S', 19: 'T',
+    20: 'U', 21: 'V', 22: 'W', 23: 'X', 24: 'Y', 25: 'Z', 26: 'SPACE', 27: 'SEND'
+}
+
+LETTER_ACCEPT_SCORE = 0.5       # Smoothed score at which a letter is added
+LETTER_RELEASE_SCORE = 0.25     # Score below which the same letter can be added again
+LETTER_REPEAT_TIME = 1.0        # Seconds to keep holding a letter to add it again (double letters)
+SEND_GESTURE_HOLD_TIME = 2.0     # Seconds to hold SEND gesture (reduced from 3.0)
+
+
+def create_detector(num_hands=1):
+    """Create the MediaPipe hand landmarker, detecting up to num_hands hands"""
     model_path = 'hand_landmarker.task'
     base_options = python.BaseOptions(model_asset_path=model_path)
     options = vision.HandLandmarkerOptions(
         base_options=base_options,
-        num_hands=1,
+        num_hands=num_hands,
         min_hand_detection_confidence=0.3,
         min_hand_presence_confidence=0.3,
         min_tracking_confidence=0.3
     )
-    detector = vision.HandLandmarker.create_from_options(options)
+    return vision.HandLandmarker.create_from_options(options)
 
-    # Labels for all 28 classes (A-Z + SPACE + SEND)
-    labels_dict = {
-        0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H', 8: 'I', 9: 'J',
-        10: 'K', 11: 'L', 12: 'M', 13: 'N', 14: 'O', 15: 'P', 16: 'Q', 17: 'R', 18: 'S', 19: 'T',
-        20: 'U', 21: 'V', 22: 'W', 23: 'X', 24: 'Y', 25: 'Z', 26: 'SPACE', 27: 'SEND'
-    }
 
-    print("Starting real-time sign language detection...")
-    print("Press 'q' to quit")
-    print("Press 'c' to clear text")
-    print("Press 's' to send text to OpenAI")
-    print("Hold SEND gesture for 2 seconds to send text to OpenAI")
-    print("Hold any letter for 0.2 seconds to add it to text")
+class TextAccumulator:
+    def __init__(self, send_hold_time=SEND_GESTURE_HOLD_TIME, smoothing='ema',
+                 accept_score=LETTER_ACCEPT_SCORE, release_score=LETTER_RELEASE_SCORE,
+                 repeat_time=LETTER_REPEAT_TIME):
+        """
+        Turns the stream of per-frame class probabilities into text
+        Probabilities are smoothed over the last frames (see probability_smoother.py).
+        A letter is added once when its smoothed score reaches accept_score, and again
+        only after its score fades below release_score or it is held for repeat_time
+        seconds; holding SEND for send_hold_time seconds sends the text.
+        """
+        self.send_gesture_hold_time = send_hold_time
+        self.accept_score = accept_score
+        self.release_score = release_score
+        self.repeat_time = repeat_time
+        self.smoother = ProbabilitySmoother(len(labels_dict), mode=smoothing)
+        self.lock = threading.Lock()
 
-    # Text accumulation variables
-    accumulated_text = ""
-    last_prediction = ""
-    prediction_stability_time = 0.2  # Seconds to wait before adding letter (reduced from 1.0)
-    stable_prediction_start = 0
+        # Text accumulation variables
+        self.accumulated_text = ""
+        self.last_prediction = ""
+        self.last_score = 0.0
+        self.accepted = None            # Class added last, until it is released
+        self.accepted_at = 0
 
-    # SEND gesture specific variables
-    send_gesture_hold_time = 2.0  # Seconds to hold SEND gesture (reduced from 3.0)
-    send_gesture_start_time = 0
-    is_holding_send = False
+        # SEND gesture specific variables
+        self.send_gesture_start_time = 0
+        self.is_holding_send = False
 
-    while True:
-        data_aux = []
-        x_ = []
-        y_ = []
+    def update(self, probabilities, current_time):
+        """
+        Feed one frame
+        Args:
+            probabilities: Class probabilities indexed like labels_dict, or None without a hand
+            current_time: Frame time in seconds
+        Returns:
+            Text to send when the SEND gesture completes, otherwise None
+        """
+        to_send = None
+        with self.lock:
+            scores = self.smoother.push(probabilities)
+            leader = int(np.argmax(scores))
+            score = float(scores[leader])
+            predicted_character = labels_dict[leader]
+            self.last_prediction = predicted_character if score >= self.release_score else ""
+            self.last_score = score
 
-        ret, frame = cap.read()
-        if not ret:
-            print("Error: Could not read frame from camera")
-            break
+            # Re-arm once the added sign fades (a brief flicker to another sign doesn't)
+            if self.accepted is not None and scores[self.accepted] < self.release_score:
+                self.accepted = None
 
-        H, W, _ = frame.shape
-        
-        # Create a wider frame to accommodate the text display
-        display_width = W + 400  # Add 400 pixels for text area
-        display_frame = np.zeros((H, display_width, 3), dtype=np.uint8)
-        
-        # Place the camera frame on the left side
-        display_frame[:, :W] = frame
-        
-        # Create text display area on the right side
-        text_area = display_frame[:, W:]
-        text_area.fill(50)  # Dark gray background
-        
+            if self.is_holding_send and self.last_prediction != "SEND":
+                self.is_holding_send = False
+                self.send_gesture_start_time = 0
+
+            if score < self.accept_score or (self.accepted == leader and predicted_character == "SEND"):
+                return None
+
+            # Special handling for SEND gesture
+            if predicted_character == "SEND":
+                if not self.is_holding_send:
+                    # Start holding SEND gesture
+                    self.is_holding_send = True
+                    self.send_gesture_start_time = current_time
+                    print("Hold SEND gesture for 2 seconds to send text...")
+                elif current_time - self.send_gesture_start_time >= self.send_gesture_hold_time:
+                    # SEND gesture held long enough
+                    print(f"SEND gesture held for {self.send_gesture_hold_time} seconds!")
+                    if self.accumulated_text.strip():
+                        to_send = self.accumulated_text
+                    else:
+                        print("No text to send")
+                    self.accumulated_text = ""  # Clear after sending
+                    self.is_holding_send = False
+                    self.send_gesture_start_time = 0
+                    self.accepted = leader  # Prevent immediate re-trigger
+            elif leader != self.accepted or current_time - self.accepted_at >= self.repeat_time:
+                # Regular letter or SPACE
+                if predicted_character == "SPACE":
+                    self.accumulated_text += " "
+                else:
+                    self.accumulated_text += predicted_character
+                self.accepted = leader
+                self.accepted_at = current_time
+        return to_send
+
+    def clear(self):
+        with self.lock:
+            self.accumulated_text = ""
+
+    def snapshot(self):
+        """Consistent copy of the state for drawing"""
+        with self.lock:
+            return {
+                'text': self.accumulated_text,
+                'last_prediction': self.last_prediction,
+                'score': self.last_score,
+                'is_holding_send': self.is_holding_send,
+                'send_gesture_start_time': self.send_gesture_start_time,
+            }
+
+
+def model_class_ids(model):
+    """Label indices of the model's predict_proba columns (model.p from older datasets stores them as strings)"""
+    return np.array([int(c) for c in model.classes_])
+
+
+def classify_hands(model, hand_landmarks_list, class_ids=None):
+    """
+    Classify every detected hand with one batched model call
+    Args:
+        class_ids: model_class_ids(model), computed once by the caller (derived here if omitted)
+    Returns:
+        (class probabilities of shape (n_hands, len(labels_dict)), landmarks of shape (n_hands, 21, 2))
+    """
+    if class_ids is None:
+        class_ids = model_class_ids(model)
+    landmarks = landmarks_array(hand_landmarks_list)
+    probabilities = np.zeros((len(landmarks), len(labels_dict)))
+    probabilities[:, class_ids] = model.predict_proba(normalize_landmarks(landmarks))
+    return probabilities, landmarks
+
+
+def process_frame(detector, model, frame, scheduler=None, motion=None, class_ids=None):
+    """
+    Detect the hand in a BGR frame and classify it
+    Args:
+        class_ids: model_class_ids(model), so the conversion isn't repeated every frame
+        scheduler: Optional AdaptiveScheduler; on frames it skips, the last result is reused
+        motion: Optional MotionTracker of this stream, for the motion signs (J, Z)
+    Returns:
+        Result dictionary with 'hands' (landmark lists), 'hand_results' (prediction,
+        confidence, probabilities, handedness and 'x_'/'y_' of every hand), the index
+        of the 'primary' hand (the most confident one) and a copy of its fields at the
+        top level ('prediction' is None without a hand), whether the frame was
+        'detected' or reused, and per-stage 'timings_ms'
+    """
+    if scheduler is not None and not scheduler.should_detect(frame):
+        result = dict(scheduler.cached, detected=False, timings_ms={'detect': 0.0, 'classify': 0.0})
+    else:
+        start = time.perf_counter()
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
+
         # Convert to MediaPipe Image
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-        
+
         # Detect hand landmarks
         results = detector.detect(mp_image)
-        
+        detected = time.perf_counter()
+
+        result = {'hands': results.hand_landmarks or [], 'hand_results': [], 'primary': None,
+                  'prediction': None, 'confidence': 0.0, 'probabilities': None, 'detected': True}
         if results.hand_landmarks:
-            for hand_landmarks in results.hand_landmarks:
-                # Convert landmarks to pixel coordinates
-                landmark_points = []
-                for landmark in hand_landmarks:
-                    x = int(landmark.x * W)
-                    y = int(landmark.y * H)
-                    landmark_points.append((x, y))
-                
-                # Draw hand connections (skeleton)
-                connections = [
-                    # Thumb
-                    (0, 1), (1, 2), (2, 3), (3, 4),
-                    # Index finger
-                    (0, 5), (5, 6), (6, 7), (7, 8),
-                    # Middle finger
-                    (0, 9), (9, 10), (10, 11), (11, 12),
-                    # Ring finger
-                    (0, 13), (13, 14), (14, 15), (15, 16),
-                    # Pinky
-                    (0, 17), (17, 18), (18, 19), (19, 20),
-                    # Palm connections
-                    (5, 9), (9, 13), (13, 17)
-                ]
-                
-                # Define colors for different parts
-                colors = {
-                    # Thumb - Red
-                    (0, 1): (0, 0, 255), (1, 2): (0, 0, 255), (2, 3): (0, 0, 255), (3, 4): (0, 0, 255),
-                    # Index - Green
-                    (0, 5): (0, 255, 0), (5, 6): (0, 255, 0), (6, 7): (0, 255, 0), (7, 8): (0, 255, 0),
-                    # Middle - Blue
-                    (0, 9): (255, 0, 0), (9, 10): (255, 0, 0), (10, 11): (255, 0, 0), (11, 12): (255, 0, 0),
-                    # Ring - Yellow
-                    (0, 13): (0, 255, 255), (13, 14): (0, 255, 255), (14, 15): (0, 255, 255), (15, 16): (0, 255, 255),
-                    # Pinky - Magenta
-                    (0, 17): (255, 0, 255), (17, 18): (255, 0, 255), (18, 19): (255, 0, 255), (19, 20): (255, 0, 255),
-                    # Palm - Gray
-                    (5, 9): (128, 128, 128), (9, 13): (128, 128, 128), (13, 17): (128, 128, 128)
-                }
-                
-                # Draw connections on camera frame
-                for connection in connections:
-                    start_idx, end_idx = connection
-                    if start_idx < len(landmark_points) and end_idx < len(landmark_points):
-                        start_point = landmark_points[start_idx]
-                        end_point = landmark_points[end_idx]
-                        color = colors.get(connection, (255, 255, 255))  # Default white
-                        cv2.line(display_frame, start_point, end_point, color, 3)
-                
-                # Draw landmark points on top of lines on camera frame
-                for i, point in enumerate(landmark_points):
-                    # Different colors for different landmark types
-                    if i == 0:  # Wrist
-                        color = (255, 255, 255)  # White
-                    elif i in [4, 8, 12, 16, 20]:  # Fingertips
-                        color = (0, 255, 255)  # Yellow
-                    else:  # Other joints
-                        color = (255, 255, 0)  # Cyan
-                    cv2.circle(display_frame, point, 6, color, -1)
-                    cv2.circle(display_frame, point, 6, (0, 0, 0), 2)  # Black border
-                
-                # Extract coordinates for prediction
-                for landmark in hand_landmarks:
-                    x_.append(landmark.x)
-                    y_.append(landmark.y)
-
-                # Normalize coordinates
-                for landmark in hand_landmarks:
-                    data_aux.append(landmark.x - min(x_))
-                    data_aux.append(landmark.y - min(y_))
-
-            # Make prediction
-            if len(data_aux) == 42:  # 21 landmarks * 2 coordinates
-                prediction = model.predict([np.asarray(data_aux)])
-                predicted_character = labels_dict[int(prediction[0])]
-                current_time = time.time()
-
-                # Handle prediction stability and text accumulation
-                if predicted_character == last_prediction:
-                    if stable_prediction_start == 0:
-                        stable_prediction_start = current_time
-                    elif current_time - stable_prediction_start >= prediction_stability_time:
-                        # Special handling for SEND gesture
-                        if predicted_character == "SEND":
-                            if not is_holding_send:
-                                # Start holding SEND gesture
-                                is_holding_send = True
-                                send_gesture_start_time = current_time
-                                print("Hold SEND gesture for 2 seconds to send text...")
-                            elif current_time - send_gesture_start_time >= send_gesture_hold_time:
-                                # SEND gesture held long enough
-                                print(f"SEND gesture held for {send_gesture_hold_time} seconds!")
-                                if accumulated_text.strip():
-                                    print(f"Sending text to OpenAI: '{accumulated_text}'")
-                                    ai_response = send_to_openai(accumulated_text)
-                                    print(f"AI Response: {ai_response}")
-                                else:
-                                    print("No text to send")
-                                accumulated_text = ""  # Clear after sending
-                                is_holding_send = False
-                                send_gesture_start_time = 0
-                                stable_prediction_start = 0  # Reset to prevent immediate re-trigger
-                        else:
-                            # Regular letter or SPACE
-                            if predicted_character == "SPACE":
-                                accumulated_text += " "
-                            else:
-                                accumulated_text += predicted_character
-                            
-                            # Reset stability timer
-                            stable_prediction_start = 0
-                            # Reset SEND gesture tracking if we're not doing SEND
-                            is_holding_send = False
-                            send_gesture_start_time = 0
-                else:
-                    # Different prediction, reset all timers
-                    last_prediction = predicted_character
-                    stable_prediction_start = 0
-                    is_holding_send = False
-                    send_gesture_start_time = 0
-
-                # Draw bounding box and prediction on camera frame
-                x1 = int(min(x_) * W) - 10
-                y1 = int(min(y_) * H) - 10
-                x2 = int(max(x_) * W) + 10
-                y2 = int(max(y_) * H) + 10
-
-                cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
-                cv2.putText(display_frame, predicted_character, (x1, y1 - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3, cv2.LINE_AA)
-
-        # Draw text display area
-        # Title
-        cv2.putText(display_frame, "Detected Text:", (W + 10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-        
-        # Current prediction (if any)
-        if 'predicted_character' in locals():
-            cv2.putText(display_frame, f"Current: {predicted_character}", (W + 10, 70), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            
-            # Show SEND gesture progress
-            if predicted_character == "SEND" and is_holding_send:
-                elapsed_time = current_time - send_gesture_start_time
-                progress = min(elapsed_time / send_gesture_hold_time, 1.0)
-                remaining_time = max(send_gesture_hold_time - elapsed_time, 0)
-                
-                # Progress bar
-                bar_width = 300
-                bar_height = 20
-                bar_x = W + 10
-                bar_y = 100
-                
-                # Background bar
-                cv2.rectangle(display_frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (100, 100, 100), -1)
-                
-                # Progress bar
-                progress_width = int(bar_width * progress)
-                color = (0, 255, 0) if progress >= 1.0 else (0, 165, 255)  # Green when complete, orange otherwise
-                cv2.rectangle(display_frame, (bar_x, bar_y), (bar_x + progress_width, bar_y + bar_height), color, -1)
-                
-                # Progress text
-                cv2.putText(display_frame, f"Hold SEND: {remaining_time:.1f}s", (bar_x, bar_y - 5), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        # Accumulated text (word wrap for long text)
-        y_offset = 150  # Moved down to make room for progress bar
-        max_chars_per_line = 25
-        
-        if accumulated_text:
-            # Split text into lines
-            words = accumulated_text.split(' ')
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                if len(current_line + word) <= max_chars_per_line:
-                    current_line += word + " "
-                else:
-                    if current_line:
-                        lines.append(current_line.strip())
-                    current_line = word + " "
-            
-            if current_line:
-                lines.append(current_line.strip())
-            
-            # Display lines
-            for i, line in enumerate(lines[-10:]):  # Show last 10 lines
-                cv2.putText(display_frame, line, (W + 10, y_offset + i * 30), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-        
-        # Instructions
-        instructions_y = H - 140
-        cv2.putText(display_frame, "Controls:", (W + 10, instructions_y), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
-        cv2.putText(display_frame, "Q - Quit", (W + 10, instructions_y + 25), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-        cv2.putText(display_frame, "C - Clear text", (W + 10, instructions_y + 45), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-        cv2.putText(display_frame, "S - Send to AI", (W + 10, instructions_y + 65), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-        cv2.putText(display_frame, "SEND gesture (2s) - Send", (W + 10, instructions_y + 85), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
-        cv2.putText(display_frame, "Letters (0.2s) - Add letter", (W + 10, instructions_y + 105), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+            # Classify all hands at once
+            probabilities, landmarks = classify_hands(model, results.hand_landmarks, class_ids)
+            for hand_probabilities, hand_points, (handedness, _) in zip(probabilities, landmarks,
+                                                                        hand_labels(results)):
+                best = int(np.argmax(hand_probabilities))
+                result['hand_results'].append({
+                    'prediction': labels_dict[best],
+                    'confidence': float(hand_probabilities[best]),
+                    'probabilities': hand_probabilities,
+                    'handedness': handedness,
+                    'x_': hand_points[:, 0],
+                    'y_': hand_points[:, 1],
+                })
+            # The most confidently classified hand drives the text
+            result['primary'] = max(range(len(result['hand_results'])),
+                                    key=lambda i: result['hand_results'][i]['confidence'])
+            result.update(result['hand_results'][result['primary']])
+        classified = time.perf_counter()
+
+        result['timings_ms'] = {
+            'detect': (detected - start) * 1000,
+            'classify': (classified - detected) * 1000,
+        }
+        if scheduler is not None:
+            # All hands together, so motion of any of them ends the skipping
+            landmarks = np.concatenate([np.column_stack([hand['x_'], hand['y_']]) for hand in result['hand_results']]) \
+                if results.hand_landmarks else None
+            scheduler.record(frame, landmarks, result['confidence'], result)
+
+    if motion is not None:
+        # Every frame, reused or not, advances the motion window
+        start = time.perf_counter()
+        landmarks = np.column_stack([result['x_'], result['y_']]) if result['prediction'] is not None else None
+        probabilities = motion.update(landmarks, result['probabilities'])
+        if probabilities is not result['probabilities']:
+            best = int(np.argmax(probabilities))
+            result = dict(result, prediction=labels_dict[best], confidence=float(probabilities[best]),
+                          probabilities=probabilities)
+        result['timings_ms'] = dict(result['timings_ms'])
+        result['timings_ms']['classify'] += (time.perf_counter() - start) * 1000
+    return result
+
+
+class InferenceWorker:
+    def __init__(self, reader, detector, model, text, scheduler=None, motion=None, sender=None):
+        """
+        Runs hand detection and classification on the newest camera frame, on its own thread
+        Args:
+            reader: CameraReader or SharedFrameReader providing frames
+            detector: MediaPipe hand landmarker (only used from the worker thread)
+            model: Sign classifier
+            text: TextAccumulator fed with every frame's probabilities
+            scheduler: Optional AdaptiveScheduler that skips detection while the hand is steady
+            motion: Optional MotionTracker for the motion signs
+            sender: SendDispatcher for text completed with the SEND gesture (one is created if omitted)
+        """
+        self.reader = reader
+        self.detector = detector
+        self.model = model
+        self.class_ids = model_class_ids(model)
+        self.text = text
+        self.scheduler = scheduler
+        self.motion = motion
+        self.sender = sender if sender is not None else SendDispatcher()
+        self.fps = FPSCounter()
+        self.latest = None          # Most recent result, read by the render loop
+        self.inference_ms = 0.0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='inference', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+    def _run(self):
+        seq = 0
+        while self.running:
+            seq, frame = self.reader.read(seq, timeout=0.5)
+            if frame is None:
+                if self.reader.failed:
+                    break
+                continue
+
+            start = time.time()
+            result = process_frame(self.detector, self.model, frame, self.scheduler, self.motion,
+                                   self.class_ids)
+            result['seq'] = seq
+            to_send = self.text.update(result['probabilities'], time.time())
+            if to_send:
+                print(f"Sending text to OpenAI: '{to_send}'")
+                self.sender.submit(to_send)
+
+            if result['detected']:
+                self.inference_ms = (time.time() - start) * 1000
+            self.latest = result
+            self.fps.tick()
+
+
+CONTROL_INSTRUCTIONS = (
+    "Q - Quit",
+    "C - Clear text",
+    "S - Send to AI",
+    "SEND gesture (2s) - Send",
+    "Hold a letter - Add it",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Real-time sign language detection')
+    parser.add_argument('--input', help='Run headless over a video file or image directory instead of the camera')
+    parser.add_argument('--output', help='Headless mode: JSONL file for per-frame predictions (default: stdout)')
+    parser.add_argument('--fps', type=float, default=30.0, help='Headless mode: frame rate of an image directory')
+    parser.add_argument('--send', action='store_true', help='Headless mode: send completed text to OpenAI')
+    parser.add_argument('--sources', nargs='+', metavar='SOURCE',
+                        help='Run on several camera indices or stream URLs, one worker process each')
+    parser.add_argument('--hands', type=int, default=1,
+                        help='Hands to detect per frame; each is classified, the most confident one types')
+    parser.add_argument('--every-frame', action='store_true',
+                        help='Run hand detection on every frame instead of skipping while the hand is steady')
+    parser.add_argument('--capture-process', action='store_true',
+                        help='Capture frames in a separate process and share them through shared memory')
+    args = parser.parse_args()
+
+    if args.input:
+        from batch_inference import run_headless
+        run_headless(args.input, args.output, args.fps, args.send, adaptive=not args.every_frame,
+                     num_hands=args.hands)
+        return
+
+    if args.sources:
+        from multi_camera import run_multi_camera
+        run_multi_camera(args.sources, args.hands, adaptive=not args.every_frame)
+        return
+
+    # Load the trained model
+    model = load_model()
+
+    # Initialize camera; frames are read on a background thread (or process) that keeps only the latest one
+    if args.capture_process:
+        from shared_frame_ring import SharedFrameReader
+        reader = SharedFrameReader(0)
+    else:
+        reader = CameraReader(0)
+    if not reader.is_opened():
+        print("Error: Could not open camera")
+        reader.stop()
+        return
+
+    # Create hand landmarker
+    detector = create_detector(args.hands)
+
+    print("Starting real-time sign language detection...")
+    print("Press 'q' to quit")
+    print("Press 'c' to clear text")
+    print("Press 's' to send text to OpenAI")
+    print("Hold SEND gesture for 2 seconds to send text to OpenAI")
+    print("Hold a letter briefly to add it to text (keep holding to repeat it)")
+
+    text = TextAccumulator()
+    reader.start()
+    scheduler = None if args.every_frame else AdaptiveScheduler()
+    motion_head = load_motion_head()
+    motion = MotionTracker(motion_head) if motion_head is not None else None
+    sender = SendDispatcher()
+    worker = InferenceWorker(reader, detector, model, text, scheduler, motion, sender).start()
+    render_fps = FPSCounter()
+    renderer = OverlayRenderer(CONTROL_INSTRUCTIONS, text.send_gesture_hold_time)
+
+    # Render loop: draws the newest camera frame with the most recent inference result
+    seq = 0
+    while True:
+        seq, frame = reader.read(seq)
+        if frame is None:
+            if reader.failed:
+                print("Error: Could not read frame from camera")
+                break
+            continue
+
+        H, W, _ = frame.shape
+
+        # Camera frame on the left, text display area on the right (preallocated, static parts cached)
+        display_frame = renderer.compose(frame)
+
+        result = worker.latest
+        if result is not None:
+            for hand_landmarks in result['hands']:
+                renderer.draw_hand(display_frame, hand_landmarks, W, H)
+            for i, hand in enumerate(result['hand_results']):
+                # The primary hand shows the motion-adjusted prediction
+                prediction = result['prediction'] if i == result['primary'] else hand['prediction']
+                renderer.draw_prediction(display_frame, prediction, hand['x_'], hand['y_'], W, H)
+
+        for _, ai_response in sender.poll():
+            print(f"AI Response: {ai_response}")
+
+        render_fps.tick()
+        stage_fps = (reader.fps.fps(), worker.fps.fps(), render_fps.fps(), worker.inference_ms)
+        renderer.draw_panel(display_frame, W, H, text.snapshot(), stage_fps, sender.status())
 
         cv2.imshow('Sign Language Detection', display_frame)
-        
+
         key = cv2.waitKey(1) & 0xFF
         if key == ord('q'):
             break
         elif key == ord('c'):
-            accumulated_text = ""
+            text.clear()
             print("Text cleared")
         elif key == ord('s'):
+            accumulated_text = text.snapshot()['text']
             if accumulated_text:
                 print(f"Manually sending text to OpenAI: '{accumulated_text}'")
-                ai_response = send_to_openai(accumulated_text)
-                print(f"AI Response: {ai_response}")
+                sender.submit(accumulated_text)
             else:
                 print("No text to send")
 
-    cap.release()
+    worker.stop()
+    sender.stop()
+    reader.stop()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
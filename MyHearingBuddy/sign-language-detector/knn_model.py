@@ -0,0 +1,152 @@
+"""
+Incrementally Updatable k-NN Sign Classifier
+A nearest-neighbour model over the landmark features, indexed with a ball tree.
+Unlike the random forest it needs no retraining: new samples (and new classes)
+are merged by appending rows and rebuilding the index, which takes well under a
+second for tens of thousands of samples.
+
+The model is stored as an artifact directory like the forest (see
+forest_artifact.py), so load_model() and the API server's hot reload handle it
+the same way:
+
+    model_knn/
+        manifest.json    type 'knn', classes, label names, k, content hash
+        features.npy     float32 (N, 42)
+        labels.npy       int32   (N,)
+        paths.npy        str     (N,)   source image of each sample
+
+Usage:
+    python update_model.py                # merge new dataset samples into model_knn/
+    MODEL_DIR=model_knn python api_server.py
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+from dataset_store import replace_dataset
+
+KNN_VERSION = 1
+DEFAULT_KNN_DIR = 'model_knn'
+DEFAULT_K = 5
+DISTANCE_EPSILON = 1e-6
+
+
+class KNNModel:
+    def __init__(self, model_dir=DEFAULT_KNN_DIR, mmap=True):
+        """
+        Load a k-NN artifact and build its ball tree
+        Args:
+            model_dir: Directory written by write_knn_model
+            mmap: Memory-map the sample arrays
+        """
+        with open(os.path.join(model_dir, 'manifest.json'), 'r') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != KNN_VERSION or self.manifest.get('type') != 'knn':
+            raise ValueError(f"Not a k-NN model artifact: {model_dir}")
+
+        mode = 'r' if mmap else None
+        self.model_dir = model_dir
+        self.features = np.load(os.path.join(model_dir, 'features.npy'), mmap_mode=mode)
+        self.labels = np.load(os.path.join(model_dir, 'labels.npy'), mmap_mode=mode)
+        # write_knn_model swaps the whole directory; a manifest that changed while the
+        # arrays were opened means they may come from different versions
+        with open(os.path.join(model_dir, 'manifest.json'), 'r') as f:
+            swapped = json.load(f) != self.manifest
+        if swapped or not len(self.features) == len(self.labels) == self.manifest['n_samples']:
+            raise ValueError(f"k-NN model in {model_dir} is being updated, try again")
+        self.k = min(self.manifest.get('k', DEFAULT_K), len(self.labels))
+        self.model_hash = self.manifest['model_hash']
+        self.classes_ = np.array(self.manifest['classes'])
+
+        self.tree = BallTree(np.asarray(self.features))
+        # Column of each sample's label in predict_proba
+        self.label_columns = np.searchsorted(self.classes_, self.labels)
+
+    def predict_proba(self, X):
+        """Distance-weighted votes of the k nearest samples, columns ordered like classes_"""
+        X = np.asarray(X, dtype=np.float32)
+        distances, indices = self.tree.query(X, k=self.k)
+        weights = 1.0 / (distances + DISTANCE_EPSILON)
+        proba = np.zeros((len(X), len(self.classes_)))
+        np.add.at(proba, (np.arange(len(X))[:, None], self.label_columns[indices]), weights)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def write_knn_model(model_dir, features, labels, paths, label_names=None, k=DEFAULT_K, training_stats=None):
+    """
+    Write a k-NN artifact into a fresh directory and swap it in place of model_dir
+    A server polling the manifest never sees a new manifest next to old arrays.
+    Returns:
+        The manifest dictionary
+    """
+    tmp_dir = model_dir.rstrip('/\\') + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)   # Left over from an interrupted update
+    os.makedirs(tmp_dir)
+    arrays = {
+        'features': np.ascontiguousarray(features, dtype=np.float32),
+        'labels': np.ascontiguousarray(labels, dtype=np.int32),
+        'paths': np.asarray(paths, dtype=str),
+    }
+    digest = hashlib.sha1()
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f'{name}.npy'), array)
+        if name != 'paths':
+            digest.update(array.tobytes())
+
+    manifest = {
+        'version': KNN_VERSION,
+        'type': 'knn',
+        'model_hash': digest.hexdigest(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'classes': sorted(int(c) for c in np.unique(arrays['labels'])),
+        'label_names': list(label_names or []),
+        'k': k,
+        'n_samples': int(len(arrays['labels'])),
+        'training': training_stats or {},
+    }
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    # Running servers keep their memory maps of the old files
+    replace_dataset(tmp_dir, model_dir)
+    return manifest
+
+
+def merge_samples(model_dir, features, labels, paths, label_names=None, k=DEFAULT_K):
+    """
+    Merge samples into a k-NN artifact, creating it if needed
+    Samples whose path is already in the model replace the old row.
+    Returns:
+        (manifest, number of new samples, number of replaced samples)
+    """
+    paths = [str(p) for p in paths]
+    features = np.asarray(features, dtype=np.float32)
+    labels = np.asarray(labels, dtype=np.int32)
+    incoming = len(paths)
+
+    manifest_path = os.path.join(model_dir, 'manifest.json')
+    replaced = 0
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            old_manifest = json.load(f)
+        old_paths = np.load(os.path.join(model_dir, 'paths.npy'))
+        new_paths = set(paths)
+        keep = np.array([str(p) not in new_paths for p in old_paths], dtype=bool)
+        replaced = int((~keep).sum())
+        features = np.concatenate([np.load(os.path.join(model_dir, 'features.npy'))[keep], features])
+        labels = np.concatenate([np.load(os.path.join(model_dir, 'labels.npy'))[keep], labels])
+        paths = [str(p) for p in old_paths[keep]] + paths
+        label_names = label_names or old_manifest.get('label_names')
+        k = old_manifest.get('k', k)
+
+    manifest = write_knn_model(model_dir, features, labels, paths, label_names, k)
+    return manifest, incoming - replaced, replaced
@@ -0,0 +1,115 @@
+"""
+Incremental Landmark Cache for Dataset Rebuilds
+Remembers the landmark sample of every image create_dataset.py has processed,
+keyed by path and validated by file size, mtime and content hash. Rebuilds only
+run the hand landmarker on new or changed images. Images without a hand are
+cached too, so they are not re-landmarked on every run.
+"""
+
+import hashlib
+import os
+import pickle
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_PATH = 'landmark_cache.pickle'
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def detector_signature(model_path):
+    """Identifies the landmarker model; cached landmarks are invalid if it changes"""
+    if not os.path.exists(model_path):
+        return None
+    stat = os.stat(model_path)
+    return f"{os.path.basename(model_path)}:{stat.st_size}:{file_hash(model_path)}"
+
+
+class LandmarkCache:
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, signature=None):
+        """
+        Load the cache from disk (an empty cache if missing or out of date)
+        Args:
+            cache_path: Pickle file holding the cache
+            signature: Detector signature; entries made with another detector are dropped
+        """
+        self.cache_path = cache_path
+        self.signature = signature
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('version') == CACHE_VERSION and cached.get('signature') == signature:
+                    self.entries = cached['entries']
+                else:
+                    print("Landmark cache is out of date, rebuilding it")
+            except Exception as e:
+                print(f"Could not read landmark cache ({e}), rebuilding it")
+
+    def lookup(self, img_path):
+        """
+        Check an image against the cache
+        Returns:
+            (hit, sample) - sample is None for a cached no-hand image
+        """
+        entry = self.entries.get(img_path)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        stat = os.stat(img_path)
+        if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            self.hits += 1
+            return True, entry['sample']
+
+        # Touched but possibly unchanged (e.g. copied back): compare contents
+        if entry['size'] == stat.st_size and entry['sha1'] == file_hash(img_path):
+            entry['mtime'] = stat.st_mtime_ns
+            self.hits += 1
+            return True, entry['sample']
+
+        self.misses += 1
+        return False, None
+
+    def store(self, img_path, sample):
+        """Record the landmark sample (or None for no hand) of an image"""
+        stat = os.stat(img_path)
+        self.entries[img_path] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha1': file_hash(img_path),
+            'sample': sample,
+        }
+
+    def prune(self, valid_paths):
+        """
+        Remove entries for images that no longer exist
+        Returns:
+            Number of entries removed
+        """
+        valid_paths = set(valid_paths)
+        removed = [p for p in self.entries if p not in valid_paths]
+        for p in removed:
+            del self.entries[p]
+        return len(removed)
+
+    def no_hand_images(self):
+        """Paths of cached images where no hand was detected"""
+        return sorted(p for p, entry in self.entries.items() if entry['sample'] is None)
+
+    def save(self):
+        """Write the cache atomically"""
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'signature': self.signature, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.cache_path)
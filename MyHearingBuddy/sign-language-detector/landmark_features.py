@@ -0,0 +1,54 @@
+"""
+Landmark Feature Extraction
+Vectorized version of the 42-feature normalization used throughout the project:
+each landmark's x and y minus the minimum x and y of the hand, interleaved as
+x0, y0, x1, y1, ... x20, y20.
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 2
+
+
+def normalize_landmarks(landmarks):
+    """
+    Compute classifier features from raw landmarks
+    Args:
+        landmarks: Array of shape (..., 21, 2 or 3) with x, y (and z) coordinates
+    Returns:
+        float32 array of shape (..., 42)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    xy = landmarks[..., :2]
+    relative = xy - xy.min(axis=-2, keepdims=True)
+    return relative.reshape(landmarks.shape[:-2] + (NUM_FEATURES,))
+
+
+def landmarks_array(hand_landmarks_list):
+    """
+    Stack MediaPipe hand landmark lists for batched classification
+    Args:
+        hand_landmarks_list: results.hand_landmarks of a HandLandmarker
+    Returns:
+        float32 array of shape (n_hands, 21, 2) with x, y coordinates
+    """
+    return np.array([[(lm.x, lm.y) for lm in hand] for hand in hand_landmarks_list],
+                    dtype=np.float32).reshape(-1, NUM_LANDMARKS, 2)
+
+
+def hand_labels(results):
+    """
+    Handedness of every detected hand
+    Returns:
+        List of (category name, score) per hand, (None, 0.0) where unknown
+    """
+    labels = []
+    handedness = getattr(results, 'handedness', None)
+    for i in range(len(results.hand_landmarks or [])):
+        if handedness and i < len(handedness) and handedness[i]:
+            category = handedness[i][0]
+            labels.append((category.category_name, float(category.score)))
+        else:
+            labels.append((None, 0.0))
+    return labels
@@ -0,0 +1,140 @@
+"""
+Windowed Motion Dataset
+Builds training samples for the motion head (motion_features.py) from the
+landmark dataset. collect_imgs.py saves each class as one continuous capture
+(data/<class>/0.jpg, 1.jpg, ...), so frames with consecutive numbers form
+trajectories. Every run of consecutive frames is fed through a MotionWindow
+exactly as the live detector does, and each full window becomes one sample:
+
+    dataset_motion/
+        features.npy     float32 (N, 81)   static features + motion features
+        labels.npy       int32   (N,)      class index
+        sequences.npy    int32   (N,)      capture run the window came from
+        paths.npy        str     (N,)      image of the window's newest frame
+        meta.json        window length, sample count, label names
+
+Build it before deduplication (create_dataset.py --motion does): dropped frames
+break the runs.
+
+Usage:
+    python motion_dataset.py                       # dataset/ -> dataset_motion/
+    python motion_dataset.py --window 12
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from dataset_store import Dataset, DEFAULT_DATASET_DIR
+from motion_features import MotionWindow, DEFAULT_WINDOW, NUM_WINDOW_FEATURES
+
+DEFAULT_MOTION_DATASET_DIR = 'dataset_motion'
+MOTION_DATASET_VERSION = 1
+MAX_FRAME_GAP = 2   # A run survives one frame without a detected hand
+
+
+def frame_sequences(paths, labels):
+    """
+    Group dataset rows into runs of consecutively numbered frames of one class
+    Returns:
+        List of row index lists, each in capture order
+    """
+    frames = []
+    for row, (path, label) in enumerate(zip(paths, labels)):
+        stem = os.path.splitext(os.path.basename(str(path)))[0]
+        if stem.isdigit():
+            frames.append((os.path.dirname(str(path)), int(label), int(stem), row))
+    frames.sort()
+
+    sequences = []
+    previous = None
+    for directory, label, index, row in frames:
+        if previous is not None and previous[:2] == (directory, label) and index - previous[2] <= MAX_FRAME_GAP:
+            sequences[-1].append(row)
+        else:
+            sequences.append([row])
+        previous = (directory, label, index)
+    return sequences
+
+
+def build_windows(landmarks, labels, paths, window=DEFAULT_WINDOW):
+    """
+    Slide a MotionWindow over every capture run
+    Args:
+        landmarks: (N, 21, 2 or 3) raw landmarks
+        labels: (N,) class indices
+        paths: (N,) image paths
+        window: Frames per window
+    Returns:
+        (features, labels, sequence ids, paths) of the full windows
+    """
+    features, window_labels, sequence_ids, window_paths = [], [], [], []
+    for sequence_id, rows in enumerate(frame_sequences(paths, labels)):
+        if len(rows) < window:
+            continue
+        motion = MotionWindow(window)
+        for row in rows:
+            motion.push(landmarks[row])
+            if motion.ready():
+                features.append(motion.features())
+                window_labels.append(int(labels[row]))
+                sequence_ids.append(sequence_id)
+                window_paths.append(str(paths[row]))
+
+    return (np.array(features, dtype=np.float32).reshape(-1, NUM_WINDOW_FEATURES),
+            np.array(window_labels, dtype=np.int32), np.array(sequence_ids, dtype=np.int32),
+            np.array(window_paths, dtype=str))
+
+
+def save_motion_dataset(output_dir, features, labels, sequences, paths, window, label_names=None):
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, 'features.npy'), features)
+    np.save(os.path.join(output_dir, 'labels.npy'), labels)
+    np.save(os.path.join(output_dir, 'sequences.npy'), sequences)
+    np.save(os.path.join(output_dir, 'paths.npy'), paths)
+    meta = {
+        'version': MOTION_DATASET_VERSION,
+        'window': window,
+        'n_samples': int(len(labels)),
+        'n_features': int(features.shape[1]),
+        'label_names': list(label_names or []),
+    }
+    with open(os.path.join(output_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    print(f"Motion dataset saved to {output_dir}/: {len(labels)} windows of {window} frames "
+          f"from {len(np.unique(sequences))} capture runs")
+
+
+def load_motion_dataset(dataset_dir=DEFAULT_MOTION_DATASET_DIR):
+    """
+    Returns:
+        (features, labels, sequence ids, meta dictionary)
+    """
+    with open(os.path.join(dataset_dir, 'meta.json'), 'r') as f:
+        meta = json.load(f)
+    if meta.get('version') != MOTION_DATASET_VERSION:
+        raise ValueError(f"Unsupported motion dataset version in {dataset_dir}: {meta.get('version')}")
+    load = lambda name: np.load(os.path.join(dataset_dir, f'{name}.npy'))
+    return load('features'), load('labels'), load('sequences'), meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build windowed motion samples from the landmark dataset')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_DIR, help='Landmark dataset (not deduplicated)')
+    parser.add_argument('--output', default=DEFAULT_MOTION_DATASET_DIR, help='Output directory')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='Frames per window')
+    args = parser.parse_args()
+
+    dataset = Dataset(args.dataset)
+    features, labels, sequences, paths = build_windows(
+        np.asarray(dataset.landmarks), np.asarray(dataset.labels), dataset.paths, args.window)
+    if not len(labels):
+        print(f"❌ No capture run in {args.dataset}/ has {args.window} consecutive frames")
+        return
+    save_motion_dataset(args.output, features, labels, sequences, paths, args.window, dataset.label_names)
+
+
+if __name__ == '__main__':
+    main()
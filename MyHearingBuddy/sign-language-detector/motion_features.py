@@ -0,0 +1,185 @@
+"""
+Sliding-Window Motion Features for Dynamic Signs
+J and Z are traced in the air, so a single frame's 42 shape features can't tell
+them apart from their static start or end pose. This module keeps a sliding
+window of the most recent frames of one hand and adds trajectory features for a
+few key points (wrist, index tip for Z, pinky tip for J):
+
+- net displacement (x, y) over the window
+- path length
+- an 8-bin histogram of movement directions, weighted by speed
+- signed and absolute turning (sine of the turn between consecutive movements,
+  weighted by speed): a J curves one way, a Z zigzags
+
+Movements are measured in hand sizes per frame, so the features don't depend on
+the distance to the camera. Every feature is a sum over the window of a per-frame
+term; the per-frame terms live in a preallocated ring buffer and the sums are
+updated by adding the new frame's term and subtracting the expiring one, so each
+frame costs the same whatever the window length.
+
+A classifier head trained on windows of consecutive dataset frames
+(motion_dataset.py, train_motion_head.py) decides between the motion signs and
+"static"; its output is combined with the static classifier's probabilities.
+"""
+
+import os
+import pickle
+
+import numpy as np
+
+from landmark_features import normalize_landmarks, NUM_FEATURES
+
+MOTION_KEYPOINTS = (0, 8, 20)    # Wrist, index fingertip, pinky fingertip
+DEFAULT_WINDOW = 16              # Frames (about half a second of capture)
+DIRECTION_BINS = 8
+FEATURES_PER_KEYPOINT = 2 + 1 + DIRECTION_BINS + 2
+NUM_MOTION_FEATURES = len(MOTION_KEYPOINTS) * FEATURES_PER_KEYPOINT
+NUM_WINDOW_FEATURES = NUM_FEATURES + NUM_MOTION_FEATURES
+MOTION_LABELS = ('J', 'Z')
+STATIC_CLASS = -1                # Head label of every non-motion sign
+DEFAULT_MOTION_HEAD_PATH = './motion_head.p'
+RESYNC_INTERVAL = 4096           # Pushes between exact re-summations of the running sums
+
+
+class MotionWindow:
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Args:
+            window: Number of consecutive frames the motion features cover
+        """
+        self.window = window
+        self.terms = np.zeros((window, len(MOTION_KEYPOINTS), FEATURES_PER_KEYPOINT))
+        self.sums = np.zeros((len(MOTION_KEYPOINTS), FEATURES_PER_KEYPOINT))
+        self.position = 0
+        self.count = 0
+        self.pushes = 0
+        self.previous_points = None
+        self.previous_velocity = None
+        self.static = None
+
+    def reset(self):
+        """Forget the trajectory (the hand was lost)"""
+        self.terms[:] = 0
+        self.sums[:] = 0
+        self.position = 0
+        self.count = 0
+        self.previous_points = None
+        self.previous_velocity = None
+        self.static = None
+
+    def push(self, landmarks):
+        """
+        Add one frame
+        Args:
+            landmarks: (21, 2 or 3) normalized image coordinates, or None without a hand
+        """
+        if landmarks is None:
+            self.reset()
+            return
+
+        landmarks = np.asarray(landmarks, dtype=np.float32)[:, :2]
+        self.static = normalize_landmarks(landmarks)
+        points = landmarks[list(MOTION_KEYPOINTS)].astype(np.float64)
+        hand_size = max(float((landmarks.max(axis=0) - landmarks.min(axis=0)).max()), 1e-6)
+
+        term = np.zeros((len(MOTION_KEYPOINTS), FEATURES_PER_KEYPOINT))
+        if self.previous_points is not None:
+            velocity = (points - self.previous_points) / hand_size
+            speed = np.linalg.norm(velocity, axis=1)
+            term[:, 0:2] = velocity
+            term[:, 2] = speed
+            angle = np.arctan2(velocity[:, 1], velocity[:, 0])
+            bins = np.floor((angle + np.pi) / (2 * np.pi) * DIRECTION_BINS).astype(int) % DIRECTION_BINS
+            term[np.arange(len(MOTION_KEYPOINTS)), 3 + bins] = speed
+            if self.previous_velocity is not None:
+                previous = self.previous_velocity
+                cross = previous[:, 0] * velocity[:, 1] - previous[:, 1] * velocity[:, 0]
+                turn = cross / (np.linalg.norm(previous, axis=1) + 1e-9)
+                term[:, 3 + DIRECTION_BINS] = turn
+                term[:, 4 + DIRECTION_BINS] = np.abs(turn)
+            self.previous_velocity = velocity
+        self.previous_points = points
+
+        slot = self.position
+        self.sums += term - self.terms[slot]
+        self.terms[slot] = term
+        self.position = (slot + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+
+        # Running sums accumulate rounding error; re-sum the buffer once in a while
+        self.pushes += 1
+        if self.pushes % RESYNC_INTERVAL == 0:
+            self.sums = self.terms.sum(axis=0)
+
+    def ready(self):
+        """Whether the window holds `window` consecutive frames of the hand"""
+        return self.count == self.window
+
+    def features(self):
+        """Static features of the newest frame followed by the motion features, float32"""
+        return np.concatenate([self.static, self.sums.ravel()]).astype(np.float32)
+
+
+class MotionHead:
+    def __init__(self, path=DEFAULT_MOTION_HEAD_PATH):
+        """
+        Load a head written by train_motion_head.py
+        """
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        self.model = data['model']
+        self.window = data['window']
+        self.motion_classes = np.asarray(data['motion_classes'])
+        self.motion_labels = data['motion_labels']
+
+    def combine(self, features, probabilities):
+        """
+        Mix the head's verdict into the static classifier's probabilities
+        The motion signs get the head's probability; the remaining mass (the
+        head's "static" probability) is shared by the other signs in proportion
+        to the static classifier's scores.
+        Args:
+            features: MotionWindow.features()
+            probabilities: Static class probabilities indexed by class id
+        Returns:
+            Combined probabilities indexed by class id
+        """
+        head = dict(zip(self.model.classes_.tolist(), self.model.predict_proba([features])[0]))
+        static = np.array(probabilities, dtype=np.float64)
+        static[self.motion_classes] = 0
+        total = static.sum()
+        combined = static * (head.get(STATIC_CLASS, 0.0) / total) if total > 0 else static
+        combined[self.motion_classes] = [head.get(int(c), 0.0) for c in self.motion_classes]
+        return combined
+
+
+class MotionTracker:
+    def __init__(self, head):
+        """
+        Per-stream motion state: one sliding window feeding a shared MotionHead
+        """
+        self.head = head
+        self.window = MotionWindow(head.window)
+
+    def update(self, landmarks, probabilities):
+        """
+        Add a frame and adjust its static probabilities with the motion head
+        Args:
+            landmarks: (21, 2 or 3) landmarks of the classified hand, or None without a hand
+            probabilities: Static class probabilities indexed by class id, or None
+        Returns:
+            Probabilities to use for this frame
+        """
+        self.window.push(landmarks)
+        if landmarks is None or probabilities is None or not self.window.ready():
+            return probabilities
+        return self.head.combine(self.window.features(), probabilities)
+
+
+def load_motion_head(path=DEFAULT_MOTION_HEAD_PATH):
+    """Load the motion head if it has been trained, otherwise None"""
+    if not os.path.exists(path):
+        return None
+    head = MotionHead(path)
+    print(f"✅ Motion head loaded for {', '.join(head.motion_labels)} ({head.window}-frame window)")
+    return head
@@ -0,0 +1,220 @@
+"""
+Multi-Camera Detection
+Runs the live detector on several cameras or streams at once, one worker process
+per source so each one gets its own core. Every worker owns a complete pipeline -
+camera reader, hand landmarker, classifier, accumulated text and SEND state - so
+signers in front of different cameras type independently. The main process only
+shows a combined status view: a tile per source with a small preview, the current
+prediction, the text and per-stage FPS.
+
+Workers report a few times per second through a queue with a downscaled preview;
+full frames never leave the worker.
+
+Usage:
+    python inference_classifier.py --sources 0 1 2
+    python inference_classifier.py --sources 0 rtsp://192.168.1.20/stream
+"""
+
+import multiprocessing as mp
+import queue
+import time
+
+import cv2
+import numpy as np
+
+STATUS_INTERVAL = 0.1            # Seconds between status reports of a worker
+TILE_WIDTH = 480
+TILE_HEIGHT = 360
+TEXT_STRIP_HEIGHT = 110
+WORKER_START_METHOD = 'spawn'    # MediaPipe and OpenCV threads don't survive fork
+
+
+def parse_source(source):
+    """Camera index for numeric sources, otherwise a file path or stream URL"""
+    return int(source) if str(source).isdigit() else source
+
+
+def report_error(status_queue, index, source, error):
+    """Send an error status without blocking; if the view is behind it notices the exited worker instead"""
+    try:
+        status_queue.put_nowait({'index': index, 'source': str(source), 'error': error})
+    except queue.Full:
+        pass
+
+
+def source_worker(index, source, status_queue, command_queue, stop_event, options):
+    """
+    Worker process: full detection pipeline for one source
+    Args:
+        index: Position of the source in the grid
+        source: Camera index, video path or stream URL
+        status_queue: Receives status dictionaries for the combined view
+        command_queue: 'clear' commands from the main process
+        stop_event: Set by the main process to stop all workers
+        options: {'hands': int, 'adaptive': bool}
+    """
+    from inference_classifier import (load_model, create_detector, TextAccumulator, InferenceWorker,
+                                      SendDispatcher, AdaptiveScheduler, MotionTracker, load_motion_head)
+    from camera_reader import CameraReader
+    from overlay_renderer import OverlayRenderer
+
+    reader = CameraReader(parse_source(source))
+    if not reader.is_opened():
+        report_error(status_queue, index, source, 'Could not open source')
+        return
+
+    model = load_model()
+    detector = create_detector(options['hands'])
+    text = TextAccumulator()
+    scheduler = AdaptiveScheduler() if options['adaptive'] else None
+    motion_head = load_motion_head()
+    motion = MotionTracker(motion_head) if motion_head is not None else None
+    reader.start()
+    sender = SendDispatcher()
+    worker = InferenceWorker(reader, detector, model, text, scheduler, motion, sender).start()
+    renderer = OverlayRenderer((), text.send_gesture_hold_time)
+
+    try:
+        while not stop_event.is_set() and not reader.failed:
+            time.sleep(STATUS_INTERVAL)
+            try:
+                while True:
+                    if command_queue.get_nowait() == 'clear':
+                        text.clear()
+            except queue.Empty:
+                pass
+
+            for _, ai_response in sender.poll():
+                print(f"AI Response ({source}): {ai_response}")
+
+            frame = reader.frame
+            preview = None
+            if frame is not None:
+                preview = cv2.resize(frame, (TILE_WIDTH, TILE_HEIGHT), interpolation=cv2.INTER_AREA)
+                result = worker.latest
+                if result is not None:
+                    for i, hand in enumerate(result['hand_results']):
+                        prediction = result['prediction'] if i == result['primary'] else hand['prediction']
+                        renderer.draw_prediction(preview, prediction, hand['x_'], hand['y_'],
+                                                 TILE_WIDTH, TILE_HEIGHT)
+
+            status = {
+                'index': index,
+                'source': str(source),
+                'state': text.snapshot(),
+                'send': sender.status(),
+                'capture_fps': reader.fps.fps(),
+                'inference_fps': worker.fps.fps(),
+                'inference_ms': worker.inference_ms,
+                'detection_rate': scheduler.detection_rate() if scheduler is not None else 1.0,
+                'preview': preview,
+            }
+            try:
+                status_queue.put_nowait(status)
+            except queue.Full:
+                pass   # The view is behind; it only needs the newest status
+        if reader.failed:
+            report_error(status_queue, index, source, 'Source stopped delivering frames')
+    finally:
+        worker.stop()
+        sender.stop()
+        reader.stop()
+
+
+def draw_tile(status, send_hold_time):
+    """Preview and text strip of one source"""
+    tile = np.full((TILE_HEIGHT + TEXT_STRIP_HEIGHT, TILE_WIDTH, 3), 50, dtype=np.uint8)
+    if status is None:
+        cv2.putText(tile, "Starting...", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 200), 1)
+        return tile
+    if 'error' in status:
+        cv2.putText(tile, f"Source {status['source']}: {status['error']}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 0, 255), 1)
+        return tile
+
+    if status['preview'] is not None:
+        tile[:TILE_HEIGHT] = status['preview']
+    state = status['state']
+    y = TILE_HEIGHT + 22
+    cv2.putText(tile, f"Source {status['source']}  Capture {status['capture_fps']:.0f} | Infer "
+                f"{status['inference_fps']:.0f} FPS ({status['inference_ms']:.0f}ms, "
+                f"detect {status['detection_rate'] * 100:.0f}%)", (10, y),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 200, 255), 1)
+    current = f"Current: {state['last_prediction']}" if state['last_prediction'] else "Current: -"
+    if state['last_prediction'] == "SEND" and state['is_holding_send']:
+        remaining = max(send_hold_time - (time.time() - state['send_gesture_start_time']), 0)
+        current += f"  (hold {remaining:.1f}s to send)"
+    if status['send']['pending']:
+        current += "  [sending to AI...]"
+    cv2.putText(tile, current, (10, y + 28), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+    cv2.putText(tile, state['text'][-40:], (10, y + 60), cv2.FONT_HERSHEY_SIMPLEX, 0.65, (255, 255, 255), 1)
+    return tile
+
+
+def run_multi_camera(sources, num_hands=1, adaptive=True):
+    """
+    Start one worker process per source and show the combined status view
+    Keys: q quits, c clears the text of every source.
+    """
+    from inference_classifier import SEND_GESTURE_HOLD_TIME
+
+    context = mp.get_context(WORKER_START_METHOD)
+    status_queue = context.Queue(maxsize=4 * len(sources))
+    stop_event = context.Event()
+    command_queues = [context.Queue() for _ in sources]
+    options = {'hands': num_hands, 'adaptive': adaptive}
+    workers = [
+        context.Process(target=source_worker, name=f'source-{i}', daemon=True,
+                        args=(i, source, status_queue, command_queues[i], stop_event, options))
+        for i, source in enumerate(sources)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"Started {len(workers)} detection workers: {', '.join(str(s) for s in sources)}")
+    print("Press 'q' to quit, 'c' to clear all text")
+
+    latest = [None] * len(sources)
+    columns = min(len(sources), 3)
+    rows = (len(sources) + columns - 1) // columns
+    tile_height = TILE_HEIGHT + TEXT_STRIP_HEIGHT
+    view = np.zeros((rows * tile_height, columns * TILE_WIDTH, 3), dtype=np.uint8)
+
+    try:
+        while True:
+            # Drain status reports, keeping the newest per source
+            try:
+                while True:
+                    status = status_queue.get(timeout=0.02)
+                    latest[status['index']] = status
+                    if 'error' in status:
+                        print(f"❌ Source {status['source']}: {status['error']}")
+            except queue.Empty:
+                pass
+
+            for i, status in enumerate(latest):
+                if not workers[i].is_alive() and (status is None or 'error' not in status):
+                    # Exited without its error status getting through
+                    status = latest[i] = {'index': i, 'source': str(sources[i]), 'error': 'Worker stopped'}
+                    print(f"❌ Source {sources[i]}: worker stopped")
+                row, column = divmod(i, columns)
+                view[row * tile_height:(row + 1) * tile_height,
+                     column * TILE_WIDTH:(column + 1) * TILE_WIDTH] = draw_tile(status, SEND_GESTURE_HOLD_TIME)
+            cv2.imshow('Sign Language Detection - All Sources', view)
+
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
+                break
+            elif key == ord('c'):
+                for command_queue in command_queues:
+                    command_queue.put('clear')
+                print("Text cleared")
+            if not any(worker.is_alive() for worker in workers):
+                print("All sources stopped")
+                break
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=3.0)
+            if worker.is_alive():
+                worker.terminate()
+        cv2.destroyAllWindows()
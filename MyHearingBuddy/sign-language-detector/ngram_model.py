@@ -0,0 +1,332 @@
+"""
+Offline N-gram Language Model for Sentence Completion
+Word-level trigram model with stupid backoff, trained from a plain-text corpus.
+The model is stored as flat NumPy arrays so it can be memory-mapped at load time
+and queried without any network access.
+
+Usage:
+    python ngram_model.py corpus.txt [more_corpus.txt ...] --output ngram_model
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+# Vocabulary ids are packed 21 bits at a time into uint64 n-gram keys
+ID_BITS = 21
+MAX_VOCAB_SIZE = (1 << ID_BITS) - 1
+MAX_WORD_LENGTH = 24
+
+SENTENCE_START = '<s>'
+FORMAT_VERSION = 1
+
+# Stupid backoff weight and candidate penalties
+BACKOFF_ALPHA = 0.4
+PREFIX_PENALTY = 0.6       # Completing a partial word
+EDIT_PENALTY = 0.05        # Replacing a garbled word with an edit-distance-1 word
+MAX_PREFIX_CANDIDATES = 2000
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+def tokenize(line: str) -> List[str]:
+    """Split a line of text into lowercase word tokens"""
+    return [w for w in WORD_PATTERN.findall(line.lower()) if len(w) <= MAX_WORD_LENGTH]
+
+
+def edits1(word: str) -> set:
+    """All strings one delete, transpose, replace or insert away from word"""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    deletes = [l + r[1:] for l, r in splits if r]
+    transposes = [l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1]
+    replaces = [l + c + r[1:] for l, r in splits if r for c in LETTERS]
+    inserts = [l + c + r for l, r in splits for c in LETTERS]
+    candidates = set(deletes + transposes + replaces + inserts)
+    candidates.discard(word)
+    candidates.discard('')
+    return candidates
+
+
+def _pack(*ids) -> np.ndarray:
+    """Pack vocabulary ids into uint64 n-gram keys"""
+    key = np.zeros(np.broadcast(*ids).shape, dtype=np.uint64)
+    for word_ids in ids:
+        key = (key << np.uint64(ID_BITS)) | np.asarray(word_ids, dtype=np.uint64)
+    return key
+
+
+def train_ngram_model(corpus_paths: Iterable[str], output_dir: str, min_count: int = 1) -> dict:
+    """
+    Train a trigram model from plain-text files and save it as .npy arrays
+    Args:
+        corpus_paths: Plain-text files, one sentence or utterance per line
+        output_dir: Directory to write the model files into
+        min_count: Minimum word frequency to keep a word in the vocabulary
+    Returns:
+        Model metadata (vocabulary size, n-gram counts)
+    """
+    sentences = []
+    word_counts = Counter()
+    for path in corpus_paths:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                tokens = tokenize(line)
+                if tokens:
+                    sentences.append(tokens)
+                    word_counts.update(tokens)
+
+    words = sorted(w for w, c in word_counts.items() if c >= min_count)
+    if len(words) + 1 > MAX_VOCAB_SIZE:
+        raise ValueError(f"Vocabulary too large: {len(words)} words (max {MAX_VOCAB_SIZE - 1})")
+
+    # Sorted vocabulary lets prefix lookups use binary search
+    vocab = np.array(sorted(words + [SENTENCE_START]))
+    word_to_id = {w: i for i, w in enumerate(vocab.tolist())}
+    start_id = word_to_id[SENTENCE_START]
+
+    unigrams = np.zeros(len(vocab), dtype=np.uint32)
+    bigrams = Counter()
+    trigrams = Counter()
+    for tokens in sentences:
+        ids = [start_id, start_id] + [word_to_id.get(t, -1) for t in tokens]
+        for i in range(2, len(ids)):
+            w = ids[i]
+            if w < 0:
+                continue
+            unigrams[w] += 1
+            if ids[i - 1] >= 0:
+                bigrams[(ids[i - 1], w)] += 1
+                if ids[i - 2] >= 0:
+                    trigrams[(ids[i - 2], ids[i - 1], w)] += 1
+    # Sentence-start context counts so backoff from <s> is normalised
+    unigrams[start_id] = len(sentences)
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, 'vocab.npy'), vocab)
+    np.save(os.path.join(output_dir, 'unigram_counts.npy'), unigrams)
+    for name, table in (('bigram', bigrams), ('trigram', trigrams)):
+        if table:
+            keys = _pack(*np.array(list(table.keys()), dtype=np.uint64).T)
+            counts = np.array(list(table.values()), dtype=np.uint32)
+            order = np.argsort(keys)
+            keys, counts = keys[order], counts[order]
+        else:
+            keys = np.zeros(0, dtype=np.uint64)
+            counts = np.zeros(0, dtype=np.uint32)
+        np.save(os.path.join(output_dir, f'{name}_keys.npy'), keys)
+        np.save(os.path.join(output_dir, f'{name}_counts.npy'), counts)
+
+    meta = {
+        'version': FORMAT_VERSION,
+        'order': 3,
+        'vocab_size': int(len(vocab)),
+        'total_tokens': int(unigrams.sum() - unigrams[start_id]),
+        'bigrams': len(bigrams),
+        'trigrams': len(trigrams),
+        'min_count': min_count,
+    }
+    with open(os.path.join(output_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class NGramModel:
+    def __init__(self, model_dir: str, mmap: bool = True):
+        """
+        Load a trained n-gram model
+        Args:
+            model_dir: Directory written by train_ngram_model
+            mmap: Memory-map the arrays instead of reading them into RAM
+        """
+        mode = 'r' if mmap else None
+        with open(os.path.join(model_dir, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported n-gram model version: {self.meta.get('version')}")
+
+        def load(name):
+            return np.load(os.path.join(model_dir, f'{name}.npy'), mmap_mode=mode)
+
+        self.vocab = load('vocab')
+        self.unigram_counts = load('unigram_counts')
+        self.bigram_keys = load('bigram_keys')
+        self.bigram_counts = load('bigram_counts')
+        self.trigram_keys = load('trigram_keys')
+        self.trigram_counts = load('trigram_counts')
+
+        self.start_id = self.word_id(SENTENCE_START)
+        self.total_tokens = max(int(self.meta['total_tokens']), 1)
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def word_id(self, word: str) -> int:
+        """Vocabulary id of word, or -1 if it is unknown"""
+        idx = int(np.searchsorted(self.vocab, word))
+        if idx < len(self.vocab) and self.vocab[idx] == word:
+            return idx
+        return -1
+
+    def word(self, word_id: int) -> str:
+        return str(self.vocab[word_id])
+
+    def word_frequencies(self) -> dict:
+        """Corpus count of every vocabulary word"""
+        counts = np.asarray(self.unigram_counts).tolist()
+        return {w: c for w, c in zip(self.vocab.tolist(), counts) if w != SENTENCE_START}
+
+    def _lookup(self, keys: np.ndarray, counts: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Counts for each query key (0 where the n-gram was never seen)"""
+        if len(keys) == 0:
+            return np.zeros(len(query), dtype=np.float64)
+        idx = np.searchsorted(keys, query)
+        idx = np.minimum(idx, len(keys) - 1)
+        found = keys[idx] == query
+        return np.where(found, counts[idx], 0).astype(np.float64)
+
+    def score(self, prev2: int, prev1: int, candidates: np.ndarray) -> np.ndarray:
+        """
+        Stupid backoff scores for candidate word ids given two words of context
+        Args:
+            prev2: Id of the word two positions back (-1 if unknown)
+            prev1: Id of the previous word (-1 if unknown)
+            candidates: Array of candidate word ids
+        Returns:
+            Array of scores, higher is more likely
+        """
+        candidates = np.asarray(candidates, dtype=np.int64)
+        scores = self.unigram_counts[candidates] / self.total_tokens
+        if prev1 < 0:
+            return scores
+
+        bigram = self._lookup(self.bigram_keys, self.bigram_counts, _pack(prev1, candidates))
+        bigram = bigram / max(int(self.unigram_counts[prev1]), 1)
+        scores = np.where(bigram > 0, bigram, BACKOFF_ALPHA * scores)
+        if prev2 < 0:
+            return scores
+
+        context = self._lookup(self.bigram_keys, self.bigram_counts, _pack(np.array([prev2]), prev1))[0]
+        if context == 0:
+            return BACKOFF_ALPHA * scores
+        trigram = self._lookup(self.trigram_keys, self.trigram_counts, _pack(prev2, prev1, candidates))
+        trigram = trigram / context
+        return np.where(trigram > 0, trigram, BACKOFF_ALPHA * scores)
+
+    def _prefix_range(self, prefixes: List[str]):
+        """Vocabulary index ranges [lo, hi) of words starting with each prefix"""
+        prefixes = np.array(prefixes)
+        lo = np.searchsorted(self.vocab, prefixes, side='left')
+        hi = np.searchsorted(self.vocab, np.char.add(prefixes, '\uffff'), side='left')
+        return lo, hi
+
+    def _prefix_candidates(self, prefixes: List[str]) -> np.ndarray:
+        """Ids of the most frequent words starting with any of the prefixes"""
+        lo, hi = self._prefix_range(prefixes)
+        ranges = [np.arange(l, h) for l, h in zip(lo, hi) if h > l]
+        if not ranges:
+            return np.zeros(0, dtype=np.int64)
+        ids = np.unique(np.concatenate(ranges))
+        if len(ids) > MAX_PREFIX_CANDIDATES:
+            top = np.argpartition(-self.unigram_counts[ids], MAX_PREFIX_CANDIDATES)[:MAX_PREFIX_CANDIDATES]
+            ids = ids[top]
+        return ids
+
+    def _known_words(self, words) -> np.ndarray:
+        """Ids of the given strings that are in the vocabulary"""
+        if not words:
+            return np.zeros(0, dtype=np.int64)
+        words = np.array(sorted(words))
+        idx = np.minimum(np.searchsorted(self.vocab, words), len(self.vocab) - 1)
+        return idx[self.vocab[idx] == words].astype(np.int64)
+
+    def _best(self, prev2: int, prev1: int, groups, next_id: int = -1):
+        """Best (id, score) among (candidate ids, penalty) groups"""
+        best_id, best_score = -1, 0.0
+        for ids, penalty in groups:
+            if len(ids) == 0:
+                continue
+            scores = self.score(prev2, prev1, ids) * penalty
+            if next_id >= 0:
+                # Also reward candidates that make the following word likely
+                follow = self._lookup(self.bigram_keys, self.bigram_counts, _pack(ids, next_id))
+                scores = scores * (follow + 1.0) / (self.unigram_counts[ids] + 1.0)
+            i = int(np.argmax(scores))
+            if scores[i] > best_score:
+                best_id, best_score = int(ids[i]), float(scores[i])
+        return best_id, best_score
+
+    def complete(self, text: str) -> Optional[str]:
+        """
+        Complete the partial last word and fix garbled words using left context
+        Args:
+            text: Input text such as "I AM HUNDR" or "HOW AR YOU"
+        Returns:
+            Lowercase completed text, or None if the model cannot improve it
+        """
+        words = tokenize(text)
+        if not words:
+            return None
+
+        ids = [self.word_id(w) for w in words]
+        output = list(words)
+        prev2, prev1 = self.start_id, self.start_id
+
+        for i, word in enumerate(words):
+            is_last = i == len(words) - 1
+            if not is_last and ids[i] >= 0:
+                prev2, prev1 = prev1, ids[i]
+                continue
+
+            # Single letters are too ambiguous to correct by edit distance
+            variants = edits1(word) if len(word) >= 2 else set()
+            if is_last:
+                groups = [
+                    (np.array([ids[i]]) if ids[i] >= 0 else np.zeros(0, dtype=np.int64), 1.0),
+                    (self._prefix_candidates([word]), PREFIX_PENALTY),
+                    (self._known_words(variants), EDIT_PENALTY),
+                ]
+                if len(word) >= 3:
+                    groups.append((self._prefix_candidates(sorted(variants)), EDIT_PENALTY * PREFIX_PENALTY))
+                best_id, _ = self._best(prev2, prev1, groups)
+            else:
+                next_id = ids[i + 1]
+                best_id, _ = self._best(prev2, prev1, [(self._known_words(variants), EDIT_PENALTY)], next_id)
+
+            if best_id >= 0:
+                output[i] = self.word(best_id)
+                ids[i] = best_id
+            prev2, prev1 = prev1, ids[i]
+
+        if output == words:
+            return None
+        return ' '.join(output)
+
+
+def load_ngram_model(model_dir: str) -> Optional[NGramModel]:
+    """Load an n-gram model if the directory exists, otherwise return None"""
+    if not model_dir or not os.path.exists(os.path.join(model_dir, 'meta.json')):
+        return None
+    try:
+        return NGramModel(model_dir)
+    except Exception as e:
+        print(f"⚠️ Could not load n-gram model from {model_dir}: {e}")
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train an offline n-gram sentence completion model')
+    parser.add_argument('corpus', nargs='+', help='Plain-text corpus files')
+    parser.add_argument('--output', default='ngram_model', help='Output model directory')
+    parser.add_argument('--min-count', type=int, default=1, help='Minimum word frequency')
+    args = parser.parse_args()
+
+    print(f"📚 Training n-gram model from {len(args.corpus)} file(s)...")
+    meta = train_ngram_model(args.corpus, args.output, args.min_count)
+    print(f"✅ Saved model to {args.output}: {meta['vocab_size']} words, "
+          f"{meta['bigrams']} bigrams, {meta['trigrams']} trigrams")
@@ -6,23 +6,158 @@ Enhanced with smart word prediction and frequency-based completion.
 
 from openai import OpenAI
 import os
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Tuple
 import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from ngram_model import load_ngram_model
+from spell_index import build_spell_index, CORRECTION_MAX_DISTANCE, CORRECTION_MARGIN
+
+# Completion modes:
+#   local_first - local dictionary and n-gram model, then OpenAI if they don't help
+#   local_only  - never call OpenAI (works offline, no API key required)
+#   hedged      - run local and OpenAI at the same time, answer by a deadline
+COMPLETION_MODES = ('local_first', 'local_only', 'hedged')
+DEFAULT_DEADLINE_MS = 800
+MAX_REMOTE_REQUESTS = 4        # Hedged OpenAI requests in flight at once; more fall back to local
+REQUEST_TIMEOUT_MARGIN = 2.0   # Seconds past the deadline before a hedged OpenAI request is abandoned
+REQUEST_TIMEOUT = 15.0         # Seconds for OpenAI requests outside hedged mode
+
+# Allow at most this many words beyond the original in a completion
+MAX_ADDITIONAL_WORDS = 2
+
+# Complete words that should not be modified by prediction
+COMPLETE_WORDS = {
+    # Common complete words
+    'HI', 'HELLO', 'BYE', 'YES', 'NO', 'OK', 'OKAY', 'THANKS', 'THANK', 'PLEASE',
+    'GOOD', 'BAD', 'NICE', 'GREAT', 'FINE', 'WELL', 'BEST', 'LOVE', 'LIKE',
+    'HELP', 'STOP', 'GO', 'COME', 'SEE', 'LOOK', 'HEAR', 'FEEL', 'KNOW',
+    'WANT', 'NEED', 'HAVE', 'GET', 'GIVE', 'TAKE', 'MAKE', 'DO', 'BE',
+    'I', 'YOU', 'HE', 'SHE', 'WE', 'THEY', 'IT', 'ME', 'HIM', 'HER', 'US', 'THEM',
+    'MY', 'YOUR', 'HIS', 'HER', 'OUR', 'THEIR', 'THIS', 'THAT', 'THESE', 'THOSE',
+    'THE', 'A', 'AN', 'AND', 'OR', 'BUT', 'SO', 'IF', 'WHEN', 'WHERE', 'WHY', 'HOW',
+    'WHO', 'WHAT', 'WHICH', 'WHOSE', 'WHOM', 'IS', 'ARE', 'WAS', 'WERE', 'WILL',
+    'CAN', 'COULD', 'SHOULD', 'WOULD', 'MAY', 'MIGHT', 'MUST', 'SHALL',
+    'HOME', 'WORK', 'SCHOOL', 'FOOD', 'WATER', 'TIME', 'DAY', 'NIGHT',
+    'MOM', 'DAD', 'FAMILY', 'FRIEND', 'BABY', 'CHILD', 'MAN', 'WOMAN',
+    'HOT', 'COLD', 'BIG', 'SMALL', 'FAST', 'SLOW', 'NEW', 'OLD', 'YOUNG',
+    'RED', 'BLUE', 'GREEN', 'YELLOW', 'BLACK', 'WHITE', 'BROWN', 'PINK',
+    'ONE', 'TWO', 'THREE', 'FOUR', 'FIVE', 'SIX', 'SEVEN', 'EIGHT', 'NINE', 'TEN'
+}
+
+COMPLETION_SYSTEM_PROMPT = """You are an intelligent word completion assistant for sign language input. Your job is to predict and complete incomplete words and sentences.
+
+                        CORE RULES:
+                        - ONLY complete the given text, do NOT add extra words or sentences
+                        - If a word is already COMPLETE and CORRECT, do NOT change it
+                        - Focus on completing the LAST incomplete word first
+                        - If all words seem complete, return the text as-is
+                        - Fix obvious spelling errors
+                        - Use common, everyday words (avoid rare/technical terms)
+                        - Consider context from previous words
+                        - If input seems garbled or unclear, try to find the intended word
+                        
+                        COMPLETE WORDS - DO NOT MODIFY:
+                        - "HI" is complete → return "Hi" (do NOT change to "Him")
+                        - "HELLO" is complete → return "Hello" 
+                        - "YES" is complete → return "Yes"
+                        - "NO" is complete → return "No"
+                        - "THANKS" is complete → return "Thanks"
+                        - Any other complete English words should remain unchanged
+                        
+                        SIGN LANGUAGE SPECIFIC PATTERNS:
+                        - "H" + any letter(s) (HY, HK, HJ, HA, HB, etc.) → "Hi" (greeting)
+                        - This is a common sign language input pattern where "H" gets combined with accidental letters
+                        - BUT if input is exactly "HI", keep it as "Hi" (already complete)
+                        
+                        WORD PREDICTION STRATEGIES:
+                        1. Check if word is already complete first
+                        2. Complete partial words based on common patterns
+                        3. Prioritize high-frequency English words
+                        4. Consider word context and grammar
+                        5. Avoid uncommon or technical vocabulary
+                        6. If multiple completions possible, choose the most common one
+                        7. Clean up garbled input to find intended words
+                        8. Recognize sign language input patterns (H + letters = Hi)
+                        
+                        EXAMPLES:
+                        Input: "HI" → Output: "Hi" (already complete, don't change)
+                        Input: "HELLO" → Output: "Hello" (already complete, don't change)
+                        Input: "YES" → Output: "Yes" (already complete, don't change)
+                        Input: "HY" → Output: "Hi" (sign language pattern)
+                        Input: "HK" → Output: "Hi" (sign language pattern)
+                        Input: "HJ" → Output: "Hi" (sign language pattern)
+                        Input: "I WANT TO GO TO TH" → Output: "I want to go to the"
+                        Input: "HOW AR YOU" → Output: "How are you"
+                        Input: "WHAT IS YOUR NAM" → Output: "What is your name"
+                        Input: "I AM HUNDR" → Output: "I am hungry" (not "hundred")
+                        Input: "CAN YOU HEL" → Output: "Can you help"
+                        Input: "GOOD MORN" → Output: "Good morning"
+                        Input: "THANK Y" → Output: "Thank you"
+                        Input: "HELO" → Output: "Hello"
+                        
+                        FREQUENCY-BASED COMPLETION:
+                        - Complete words like "HI", "YES", "NO" → Keep as-is
+                        - "H" + any letters → "Hi" (sign language greeting pattern)
+                        - "TH" → "the" (most common)
+                        - "AN" → "and" (very common)
+                        - "YOU" → complete as-is
+                        - "WH" → "what", "when", "where" (choose based on context)
+                        - "HEL" → "help" (more common than "hello" in most contexts)
+                        
+                        Return ONLY the completed text, nothing else."""
 
 class OpenAIIntegrator:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, ngram_model_path: Optional[str] = None,
+                 completion_mode: Optional[str] = None, deadline_ms: Optional[float] = None):
         """
         Initialize OpenAI client and text-to-speech engine
         Args:
             api_key: OpenAI API key. If None, will try to get from environment variable
+            ngram_model_path: Directory of a trained n-gram model (see ngram_model.py).
+                If None, uses NGRAM_MODEL_PATH or ./ngram_model when present
+            completion_mode: One of COMPLETION_MODES. If None, uses COMPLETION_MODE
+                environment variable (default 'local_first')
+            deadline_ms: Latency budget for hedged mode. If None, uses
+                COMPLETION_DEADLINE_MS environment variable (default 800)
         """
+        self.completion_mode = completion_mode or os.getenv('COMPLETION_MODE', 'local_first')
+        if self.completion_mode not in COMPLETION_MODES:
+            raise ValueError(f"Unknown completion mode '{self.completion_mode}'. Use one of {COMPLETION_MODES}")
+        
         # Set API key
         if not api_key:
             api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
+            if not api_key and self.completion_mode != 'local_only':
                 raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key) if api_key else None
+        
+        # Offline n-gram model for context-aware completion (optional)
+        self.ngram_model = load_ngram_model(ngram_model_path or os.getenv('NGRAM_MODEL_PATH', 'ngram_model'))
+        if self.ngram_model is not None:
+            print(f"📚 N-gram model loaded: {len(self.ngram_model)} words")
+        
+        # Hedged completion: background workers for remote requests and win metrics
+        if deadline_ms is None:
+            deadline_ms = os.getenv('COMPLETION_DEADLINE_MS', DEFAULT_DEADLINE_MS)
+        self.deadline_ms = float(deadline_ms)
+        # Hung upstream calls must not pile up: each request times out shortly after the
+        # deadline, and a request that finds every slot busy doesn't queue for one
+        self.request_timeout = REQUEST_TIMEOUT
+        self._executor = None
+        self._remote_slots = None
+        if self.completion_mode == 'hedged':
+            self.request_timeout = self.deadline_ms / 1000.0 + REQUEST_TIMEOUT_MARGIN
+            self._executor = ThreadPoolExecutor(max_workers=MAX_REMOTE_REQUESTS, thread_name_prefix='completion')
+            self._remote_slots = threading.BoundedSemaphore(MAX_REMOTE_REQUESTS)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0, 'remote_wins': 0, 'local_wins': 0, 'no_answer': 0,
+            'remote_timeouts': 0, 'remote_late': 0, 'remote_errors': 0, 'remote_skipped': 0,
+            'total_latency_ms': 0.0, 'max_latency_ms': 0.0,
+        }
         
         # Note: TTS is handled on the client side (React Native app)
         # Server only handles text completion
@@ -164,6 +299,13 @@ class OpenAIIntegrator:
             'WRI': ['write'],
             'YEA': ['year', 'yeah'],
         }
+        
+        # Symmetric-delete spell index over the local lexicon (plus n-gram vocabulary)
+        lexicon = set(COMPLETE_WORDS)
+        for completions in self.common_completions.values():
+            lexicon.update(completions)
+        ngram_frequencies = self.ngram_model.word_frequencies() if self.ngram_model is not None else None
+        self.spell_index = build_spell_index(lexicon, ngram_frequencies)
     
     def speak_text(self, text: str):
         """
@@ -185,33 +327,14 @@ class OpenAIIntegrator:
         """
         text_upper = text.upper().strip()
         
-        # List of complete words that should not be modified
-        complete_words = {
-            # Common complete words
-            'HI', 'HELLO', 'BYE', 'YES', 'NO', 'OK', 'OKAY', 'THANKS', 'THANK', 'PLEASE',
-            'GOOD', 'BAD', 'NICE', 'GREAT', 'FINE', 'WELL', 'BEST', 'LOVE', 'LIKE',
-            'HELP', 'STOP', 'GO', 'COME', 'SEE', 'LOOK', 'HEAR', 'FEEL', 'KNOW',
-            'WANT', 'NEED', 'HAVE', 'GET', 'GIVE', 'TAKE', 'MAKE', 'DO', 'BE',
-            'I', 'YOU', 'HE', 'SHE', 'WE', 'THEY', 'IT', 'ME', 'HIM', 'HER', 'US', 'THEM',
-            'MY', 'YOUR', 'HIS', 'HER', 'OUR', 'THEIR', 'THIS', 'THAT', 'THESE', 'THOSE',
-            'THE', 'A', 'AN', 'AND', 'OR', 'BUT', 'SO', 'IF', 'WHEN', 'WHERE', 'WHY', 'HOW',
-            'WHO', 'WHAT', 'WHICH', 'WHOSE', 'WHOM', 'IS', 'ARE', 'WAS', 'WERE', 'WILL',
-            'CAN', 'COULD', 'SHOULD', 'WOULD', 'MAY', 'MIGHT', 'MUST', 'SHALL',
-            'HOME', 'WORK', 'SCHOOL', 'FOOD', 'WATER', 'TIME', 'DAY', 'NIGHT',
-            'MOM', 'DAD', 'FAMILY', 'FRIEND', 'BABY', 'CHILD', 'MAN', 'WOMAN',
-            'HOT', 'COLD', 'BIG', 'SMALL', 'FAST', 'SLOW', 'NEW', 'OLD', 'YOUNG',
-            'RED', 'BLUE', 'GREEN', 'YELLOW', 'BLACK', 'WHITE', 'BROWN', 'PINK',
-            'ONE', 'TWO', 'THREE', 'FOUR', 'FIVE', 'SIX', 'SEVEN', 'EIGHT', 'NINE', 'TEN'
-        }
-        
         # Check if it's a single complete word
         words = text_upper.split()
         if len(words) == 1:
-            return words[0] in complete_words
+            return words[0] in COMPLETE_WORDS
         
         # For multiple words, check if all words are complete
         # This prevents modification of phrases like "HI THERE" 
-        return all(word in complete_words for word in words)
+        return all(word in COMPLETE_WORDS for word in words)
 
     def _clean_input_text(self, text: str) -> str:
         """
@@ -247,9 +370,10 @@ class OpenAIIntegrator:
         partial_upper = partial_word.upper()
         
         # Special sign language pattern: H + any letter(s) = Hi
-        if len(partial_upper) >= 2 and partial_upper.startswith('H') and partial_upper != 'HE':
-            # Check if it's H followed by any letters (but not common words like "HELLO", "HELP", etc.)
-            if not any(partial_upper.startswith(word) for word in ['HEL', 'HER', 'HIM', 'HIS', 'HOW', 'HOM']):
+        # The spell index scores this as a cheap weighted edit; partial words that start a
+        # lexicon word (like "HEL" for "HELLO"/"HELP") are left for completion
+        if len(partial_upper) >= 2 and partial_upper.startswith('H') and not self.spell_index.is_prefix(partial_upper):
+            if self.spell_index.correct(partial_upper) == 'hi':
                 return 'Hi'
         
         # Direct match
@@ -306,6 +430,55 @@ class OpenAIIntegrator:
         
         return text
     
+    def _try_spell_correction(self, text: str) -> str:
+        """
+        Correct garbled words with the symmetric-delete spell index
+        Args:
+            text: Cleaned input text (uppercase letters from the classifier)
+        Returns:
+            Text with unknown words replaced by a clearly closest lexicon word; words
+            without one are kept as signed (names, words missing from the lexicon)
+        """
+        words = text.split()
+        corrected = []
+        for i, word in enumerate(words):
+            lower = word.lower()
+            is_last = i == len(words) - 1
+            # Leave single letters, known words and a partial last word untouched
+            if (len(lower) < 2 or not lower.isalpha() or lower in self.spell_index
+                    or (is_last and self.spell_index.is_prefix(lower))):
+                corrected.append(word)
+                continue
+            correction = self.spell_index.correct(lower, CORRECTION_MAX_DISTANCE, CORRECTION_MARGIN)
+            corrected.append(correction.upper() if correction else word)
+        return ' '.join(corrected)
+    
+    def _format_sentence(self, text: str) -> str:
+        """Lowercase text, keep the "Hi" greeting and capitalize the first letter"""
+        words = ['Hi' if word == 'hi' else word for word in text.lower().split()]
+        return self._capitalize_first(' '.join(words))
+    
+    def _capitalize_first(self, text: str) -> str:
+        """Capitalize the first letter of text, leaving the rest unchanged"""
+        return text[0].upper() + text[1:] if text else text
+    
+    def _try_ngram_completion(self, text: str) -> str:
+        """
+        Try to complete text using the offline n-gram language model
+        Args:
+            text: Input text to complete
+        Returns:
+            Completed text or original if the model is missing or has no better guess
+        """
+        if self.ngram_model is None:
+            return text
+        
+        completed = self.ngram_model.complete(text)
+        if not completed:
+            return text
+        
+        return self._format_sentence(completed)
+    
     def _clean_completion(self, original: str, completed: str) -> str:
         """
         Clean the completion to ensure it doesn't add unnecessary extra content
@@ -313,28 +486,249 @@ class OpenAIIntegrator:
             original: Original partial text
             completed: AI completed text
         Returns:
-            Cleaned completion
+            Cleaned completion with the model's casing kept (proper nouns, "I") and
+            only the first letter capitalized. The cleaning is word by word, so a
+            streamed completion cleaned as it grows only ever gains words at the end
+            and ends up identical to the non-streamed one
+        """
+        # Allow at most 2 additional words beyond the original
+        completed_words = completed.split()[:len(original.split()) + MAX_ADDITIONAL_WORDS]
+        return self._capitalize_first(' '.join(completed_words))
+    
+    def _local_prediction(self, cleaned_text: str,
+                          corrected_text: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """
+        Run the local predictors (dictionary and n-gram model) on cleaned text
+        Args:
+            cleaned_text: Text already passed through _clean_input_text
+            corrected_text: _try_spell_correction(cleaned_text) if the caller already has it
+        Returns:
+            (completed text or None if no local predictor could complete it,
+            spell-corrected text to send to OpenAI or to use offline)
         """
-        # Convert to lowercase for comparison
-        original_lower = original.lower().strip()
-        completed_lower = completed.lower().strip()
+        # Fix garbled words first so the predictors see real words
+        if corrected_text is None:
+            corrected_text = self._try_spell_correction(cleaned_text)
+        if corrected_text != cleaned_text:
+            print(f"🔤 Spell correction: '{corrected_text}'")
         
-        # If the completion is much longer than expected, truncate it
-        original_words = original_lower.split()
-        completed_words = completed_lower.split()
+        # With previous words available the n-gram model has context the
+        # dictionary lacks, so it goes first for multi-word input
+        local_predictors = [
+            ("🔍 Local prediction", self._try_local_completion),
+            ("📚 N-gram prediction", self._try_ngram_completion),
+        ]
+        if len(corrected_text.split()) > 1:
+            local_predictors.reverse()
         
-        # Allow at most 2 additional words beyond the original
-        max_additional_words = 2
-        if len(completed_words) > len(original_words) + max_additional_words:
-            # Truncate to reasonable length
-            truncated_words = completed_words[:len(original_words) + max_additional_words]
-            completed = ' '.join(truncated_words)
+        for label, predict in local_predictors:
+            local_prediction = predict(corrected_text)
+            if local_prediction != corrected_text:
+                print(f"{label}: {local_prediction}")
+                return local_prediction, corrected_text
+        return None, corrected_text
+    
+    def _offline_answer(self, cleaned_text: str, corrected_text: str) -> str:
+        """Formatted input, with spelling corrections, when no completion is available"""
+        if corrected_text != cleaned_text:
+            return self._format_sentence(corrected_text)
+        return self._capitalize_first(cleaned_text.lower())
+    
+    def _completion_messages(self, cleaned_text: str) -> List[Dict[str, str]]:
+        """Chat messages for an OpenAI completion request"""
+        return [
+            {
+                "role": "system", 
+                "content": COMPLETION_SYSTEM_PROMPT
+            },
+            {
+                "role": "user", 
+                "content": cleaned_text
+            }
+        ]
+    
+    def _remote_completion(self, cleaned_text: str) -> str:
+        """
+        Complete cleaned text with OpenAI
+        Args:
+            cleaned_text: Text already passed through _clean_input_text
+        Returns:
+            Completed sentence, truncated by _clean_completion
+        """
+        response = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=self._completion_messages(cleaned_text),
+            timeout=self.request_timeout,
+            max_tokens=30,  # Reduced to prevent adding extra words
+            temperature=0.1,  # Very low temperature for consistent, predictable completions
+            frequency_penalty=0.5,  # Reduce repetition
+            presence_penalty=0.3   # Encourage diverse but relevant completions
+        )
+        
+        completed_sentence = response.choices[0].message.content.strip()
+        
+        # Additional post-processing to ensure we don't add extra content
+        completed_sentence = self._clean_completion(cleaned_text, completed_sentence)
+        
+        return completed_sentence
+    
+    def _stream_remote_completion(self, cleaned_text: str) -> Iterator[str]:
+        """
+        Stream an OpenAI completion, cleaned with _clean_completion on the fly
+        Words are forwarded once they are finished, so the joined deltas equal the
+        _clean_completion result of the non-streaming path.
+        Args:
+            cleaned_text: Text already passed through _clean_input_text
+        Yields:
+            Text deltas; joined together they form the completed sentence
+        """
+        max_words = len(cleaned_text.split()) + MAX_ADDITIONAL_WORDS
+        stream = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=self._completion_messages(cleaned_text),
+            timeout=self.request_timeout,
+            max_tokens=30,
+            temperature=0.1,
+            frequency_penalty=0.5,
+            presence_penalty=0.3,
+            stream=True
+        )
+        
+        raw_text = ""
+        sent_text = ""
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                raw_text += chunk.choices[0].delta.content or ""
+                words = raw_text.split()
+                
+                # Stop once the word limit is reached: either an extra word has started
+                # or the last allowed word is finished
+                limit_reached = len(words) > max_words or (
+                    len(words) == max_words and raw_text[-1:].isspace())
+                finished_words = words if limit_reached or raw_text[-1:].isspace() else words[:-1]
+                text = self._clean_completion(cleaned_text, ' '.join(finished_words))
+                
+                if len(text) > len(sent_text):
+                    yield text[len(sent_text):]
+                    sent_text = text
+                if limit_reached:
+                    print(f"✂️ Word limit reached, stopping stream: '{sent_text}'")
+                    break
+            else:
+                # The last word is finished when the stream ends
+                text = self._clean_completion(cleaned_text, raw_text)
+                if len(text) > len(sent_text):
+                    yield text[len(sent_text):]
+        finally:
+            # Closing the connection stops generation of tokens we would truncate
+            stream.close()
+    
+    def stream_sentence(self, partial_text: str) -> Iterator[str]:
+        """
+        Streaming version of complete_sentence
+        Local answers (complete text, dictionary, n-gram) are yielded in one piece;
+        otherwise OpenAI tokens are forwarded as they arrive
+        Args:
+            partial_text: The partial sentence from sign language detection
+        Yields:
+            Text deltas; joined together they form the completed sentence
+        """
+        cleaned_text = self._clean_input_text(partial_text)
+        
+        if (not cleaned_text or len(cleaned_text) < 2 or self._is_complete_text(cleaned_text)
+                or self.completion_mode == 'local_only' or self.client is None):
+            yield self.complete_sentence(partial_text)
+            return
+        
+        local_prediction, corrected_text = self._local_prediction(cleaned_text)
+        if local_prediction is not None:
+            yield local_prediction
+            return
+        
+        yield from self._stream_remote_completion(corrected_text)
+    
+    def _record_stat(self, name: str, latency_ms: Optional[float] = None):
+        """Increment a hedged completion counter (thread-safe)"""
+        with self._stats_lock:
+            self._stats[name] += 1
+            if latency_ms is not None:
+                self._stats['requests'] += 1
+                self._stats['total_latency_ms'] += latency_ms
+                self._stats['max_latency_ms'] = max(self._stats['max_latency_ms'], latency_ms)
+    
+    def _hedged_completion(self, cleaned_text: str) -> str:
+        """
+        Start OpenAI and the local predictors at the same time and return the best
+        answer available when the deadline passes. A remote reply that arrives after
+        the deadline is discarded.
+        Args:
+            cleaned_text: Text already passed through _clean_input_text
+        Returns:
+            Remote completion if it arrived in time, else local prediction, else the
+            formatted input
+        """
+        start_time = time.perf_counter()
+        corrected_text = self._try_spell_correction(cleaned_text)
+        remote_future = None
+        if self._remote_slots.acquire(blocking=False):
+            remote_future = self._executor.submit(self._remote_completion, corrected_text)
+            remote_future.add_done_callback(lambda future: self._remote_slots.release())
+        else:
+            # Every slot is taken by a slow request; waiting in the pool queue would only
+            # use up the deadline
+            self._record_stat('remote_skipped')
         
-        # Capitalize first letter
-        if completed:
-            completed = completed[0].upper() + completed[1:] if len(completed) > 1 else completed.upper()
+        local_prediction, corrected_text = self._local_prediction(cleaned_text, corrected_text)
         
-        return completed
+        remaining = self.deadline_ms / 1000.0 - (time.perf_counter() - start_time)
+        try:
+            remote_prediction = remote_future.result(timeout=max(remaining, 0)) if remote_future else None
+        except FutureTimeoutError:
+            remote_prediction = None
+            self._record_stat('remote_timeouts')
+            remote_future.add_done_callback(self._discard_late_completion)
+        except Exception as e:
+            remote_prediction = None
+            self._record_stat('remote_errors')
+            print(f"❌ OpenAI Error: {e}")
+        
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        if remote_prediction:
+            print(f"🌐 Remote completion won ({latency_ms:.0f}ms): {remote_prediction}")
+            self._record_stat('remote_wins', latency_ms)
+            return remote_prediction
+        if local_prediction is not None:
+            print(f"⚡ Local completion won ({latency_ms:.0f}ms): {local_prediction}")
+            self._record_stat('local_wins', latency_ms)
+            return local_prediction
+        self._record_stat('no_answer', latency_ms)
+        return self._offline_answer(cleaned_text, corrected_text)
+    
+    def _discard_late_completion(self, future: Future):
+        """Done callback for remote requests that missed the deadline"""
+        if not future.cancelled() and future.exception() is None:
+            self._record_stat('remote_late')
+            print(f"⏱️ Discarded late remote completion: {future.result()}")
+        else:
+            self._record_stat('remote_errors')
+    
+    def get_completion_stats(self) -> Dict[str, float]:
+        """
+        Hedged completion metrics: how often each path won, timeouts and latency
+        Returns:
+            Dictionary of counters, win rates and latency figures
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        requests = stats['requests']
+        stats['mode'] = self.completion_mode
+        stats['deadline_ms'] = self.deadline_ms
+        stats['avg_latency_ms'] = stats['total_latency_ms'] / requests if requests else 0.0
+        for name in ('remote_wins', 'local_wins', 'no_answer'):
+            stats[name.replace('wins', 'win') + '_rate'] = stats[name] / requests if requests else 0.0
+        return stats
     
     def complete_sentence(self, partial_text: str) -> str:
         """
@@ -363,104 +757,30 @@ class OpenAIIntegrator:
                     formatted_text = formatted_text[0].upper() + formatted_text[1:] if len(formatted_text) > 1 else formatted_text.upper()
                 return formatted_text
             
+            # Hedged mode races the local path against OpenAI under a deadline
+            if self.completion_mode == 'hedged' and self.client is not None:
+                return self._hedged_completion(cleaned_text)
+            
             # First, try local prediction for quick common words
-            local_prediction = self._try_local_completion(cleaned_text)
-            if local_prediction != cleaned_text:
-                print(f"🔍 Local prediction: {local_prediction}")
+            local_prediction, corrected_text = self._local_prediction(cleaned_text)
+            if local_prediction is not None:
                 return local_prediction
             
-            # If local prediction doesn't help, use OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": """You are an intelligent word completion assistant for sign language input. Your job is to predict and complete incomplete words and sentences.
-
-                        CORE RULES:
-                        - ONLY complete the given text, do NOT add extra words or sentences
-                        - If a word is already COMPLETE and CORRECT, do NOT change it
-                        - Focus on completing the LAST incomplete word first
-                        - If all words seem complete, return the text as-is
-                        - Fix obvious spelling errors
-                        - Use common, everyday words (avoid rare/technical terms)
-                        - Consider context from previous words
-                        - If input seems garbled or unclear, try to find the intended word
-                        
-                        COMPLETE WORDS - DO NOT MODIFY:
-                        - "HI" is complete → return "Hi" (do NOT change to "Him")
-                        - "HELLO" is complete → return "Hello" 
-                        - "YES" is complete → return "Yes"
-                        - "NO" is complete → return "No"
-                        - "THANKS" is complete → return "Thanks"
-                        - Any other complete English words should remain unchanged
-                        
-                        SIGN LANGUAGE SPECIFIC PATTERNS:
-                        - "H" + any letter(s) (HY, HK, HJ, HA, HB, etc.) → "Hi" (greeting)
-                        - This is a common sign language input pattern where "H" gets combined with accidental letters
-                        - BUT if input is exactly "HI", keep it as "Hi" (already complete)
-                        
-                        WORD PREDICTION STRATEGIES:
-                        1. Check if word is already complete first
-                        2. Complete partial words based on common patterns
-                        3. Prioritize high-frequency English words
-                        4. Consider word context and grammar
-                        5. Avoid uncommon or technical vocabulary
-                        6. If multiple completions possible, choose the most common one
-                        7. Clean up garbled input to find intended words
-                        8. Recognize sign language input patterns (H + letters = Hi)
-                        
-                        EXAMPLES:
-                        Input: "HI" → Output: "Hi" (already complete, don't change)
-                        Input: "HELLO" → Output: "Hello" (already complete, don't change)
-                        Input: "YES" → Output: "Yes" (already complete, don't change)
-                        Input: "HY" → Output: "Hi" (sign language pattern)
-                        Input: "HK" → Output: "Hi" (sign language pattern)
-                        Input: "HJ" → Output: "Hi" (sign language pattern)
-                        Input: "I WANT TO GO TO TH" → Output: "I want to go to the"
-                        Input: "HOW AR YOU" → Output: "How are you"
-                        Input: "WHAT IS YOUR NAM" → Output: "What is your name"
-                        Input: "I AM HUNDR" → Output: "I am hungry" (not "hundred")
-                        Input: "CAN YOU HEL" → Output: "Can you help"
-                        Input: "GOOD MORN" → Output: "Good morning"
-                        Input: "THANK Y" → Output: "Thank you"
-                        Input: "HELO" → Output: "Hello"
-                        
-                        FREQUENCY-BASED COMPLETION:
-                        - Complete words like "HI", "YES", "NO" → Keep as-is
-                        - "H" + any letters → "Hi" (sign language greeting pattern)
-                        - "TH" → "the" (most common)
-                        - "AN" → "and" (very common)
-                        - "YOU" → complete as-is
-                        - "WH" → "what", "when", "where" (choose based on context)
-                        - "HEL" → "help" (more common than "hello" in most contexts)
-                        
-                        Return ONLY the completed text, nothing else."""
-                    },
-                    {
-                        "role": "user", 
-                        "content": cleaned_text
-                    }
-                ],
-                max_tokens=30,  # Reduced to prevent adding extra words
-                temperature=0.1,  # Very low temperature for consistent, predictable completions
-                frequency_penalty=0.5,  # Reduce repetition
-                presence_penalty=0.3   # Encourage diverse but relevant completions
-            )
-            
-            completed_sentence = response.choices[0].message.content.strip()
-            
-            # Additional post-processing to ensure we don't add extra content
-            completed_sentence = self._clean_completion(cleaned_text, completed_sentence)
+            if self.completion_mode == 'local_only' or self.client is None:
+                # No remote completion available, return the (corrected) text formatted
+                return self._offline_answer(cleaned_text, corrected_text)
             
-            return completed_sentence
+            # If local prediction doesn't help, use OpenAI on the corrected text
+            return self._remote_completion(corrected_text)
             
         except Exception as e:
             # Fallback to local prediction if OpenAI fails
             try:
                 cleaned_text = self._clean_input_text(partial_text)
-                local_fallback = self._try_local_completion(cleaned_text)
-                if local_fallback != cleaned_text and cleaned_text:
+                local_fallback, corrected_text = self._local_prediction(cleaned_text)
+                if local_fallback is None and corrected_text != cleaned_text:
+                    local_fallback = self._format_sentence(corrected_text)
+                if local_fallback is not None and cleaned_text:
                     print(f"🔄 Using local fallback: {local_fallback}")
                     return local_fallback
             except:
@@ -0,0 +1,204 @@
+"""
+Render Layer for the Desktop Viewer
+Draws the camera frame, hand skeletons and the side panel for
+inference_classifier.py with as little per-frame work as possible:
+
+- the display frame is a preallocated buffer, reused while the camera size stays the same
+- the static parts of the side panel (background, title, controls) are rendered
+  once and copied in each frame
+- each finger of the skeleton is one polyline, drawn with one cv2.polylines call
+  per color instead of one cv2.line per bone
+- the 21 joints are stamped in a single NumPy assignment from a precomputed disc
+  stencil instead of 42 cv2.circle calls
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+PANEL_WIDTH = 400
+PANEL_BACKGROUND = 50  # Dark gray
+WRAP_CACHE_SIZE = 8    # Wrapped texts kept (accumulated text, AI response)
+
+# Skeleton as polylines, grouped by color (BGR)
+FINGER_POLYLINES = (
+    ((0, 0, 255), (0, 1, 2, 3, 4)),            # Thumb - Red
+    ((0, 255, 0), (0, 5, 6, 7, 8)),            # Index - Green
+    ((255, 0, 0), (0, 9, 10, 11, 12)),         # Middle - Blue
+    ((0, 255, 255), (0, 13, 14, 15, 16)),      # Ring - Yellow
+    ((255, 0, 255), (0, 17, 18, 19, 20)),      # Pinky - Magenta
+    ((128, 128, 128), (5, 9, 13, 17)),         # Palm - Gray
+)
+
+# Joint colors: wrist white, fingertips yellow, other joints cyan
+JOINT_COLORS = np.array([(255, 255, 0)] * 21, dtype=np.uint8)
+JOINT_COLORS[0] = (255, 255, 255)
+JOINT_COLORS[[4, 8, 12, 16, 20]] = (0, 255, 255)
+
+JOINT_RADIUS = 6
+JOINT_BORDER = 2
+
+
+def _disc_stencil(radius, border):
+    """Pixel offsets of a joint marker and whether each one belongs to its black border"""
+    outer = radius + border // 2
+    ys, xs = np.mgrid[-outer:outer + 1, -outer:outer + 1]
+    distance = np.sqrt(xs ** 2 + ys ** 2)
+    inside = distance <= outer + 0.5
+    offsets = np.stack([ys[inside], xs[inside]], axis=1)
+    is_border = distance[inside] > radius - border // 2 - 0.5
+    return offsets, is_border
+
+
+JOINT_OFFSETS, JOINT_IS_BORDER = _disc_stencil(JOINT_RADIUS, JOINT_BORDER)
+
+
+class OverlayRenderer:
+    def __init__(self, instructions, send_gesture_hold_time):
+        """
+        Args:
+            instructions: Control hint lines shown at the bottom of the panel
+            send_gesture_hold_time: Seconds the SEND gesture must be held (progress bar)
+        """
+        self.instructions = list(instructions)
+        self.send_gesture_hold_time = send_gesture_hold_time
+        self.buffer = None
+        self.static_panel = None
+        self._wrap_cache = {}
+
+    def _prepare(self, H, W):
+        """(Re)allocate the display buffer and render the static panel for a frame size"""
+        if self.buffer is not None and self.buffer.shape[:2] == (H, W + PANEL_WIDTH):
+            return
+        self.buffer = np.empty((H, W + PANEL_WIDTH, 3), dtype=np.uint8)
+
+        panel = np.full((H, PANEL_WIDTH, 3), PANEL_BACKGROUND, dtype=np.uint8)
+        # Title
+        cv2.putText(panel, "Detected Text:", (10, 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        # Instructions
+        instructions_y = H - 140
+        cv2.putText(panel, "Controls:", (10, instructions_y),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 200), 1)
+        for i, line in enumerate(self.instructions):
+            cv2.putText(panel, line, (10, instructions_y + 25 + i * 20),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        self.static_panel = panel
+
+    def compose(self, frame):
+        """
+        Copy the camera frame and the static panel into the display buffer
+        Returns:
+            The display buffer (reused between calls)
+        """
+        H, W = frame.shape[:2]
+        self._prepare(H, W)
+        self.buffer[:, :W] = frame
+        self.buffer[:, W:] = self.static_panel
+        return self.buffer
+
+    def draw_hand(self, display_frame, hand_landmarks, W, H):
+        """Draw the skeleton and joints of one hand"""
+        # Convert landmarks to pixel coordinates
+        points = np.array([(lm.x, lm.y) for lm in hand_landmarks], dtype=np.float32)
+        points = (points * (W, H)).astype(np.int32)
+
+        for color, chain in FINGER_POLYLINES:
+            cv2.polylines(display_frame, [points[list(chain)]], False, color, 3)
+
+        # Stamp every joint marker at once
+        ys = points[:, 1, None] + JOINT_OFFSETS[None, :, 0]
+        xs = points[:, 0, None] + JOINT_OFFSETS[None, :, 1]
+        colors = np.where(JOINT_IS_BORDER[None, :, None], np.uint8(0), JOINT_COLORS[:, None, :])
+        visible = (ys >= 0) & (ys < H) & (xs >= 0) & (xs < W)
+        display_frame[ys[visible], xs[visible]] = colors[visible]
+
+    def draw_prediction(self, display_frame, prediction, x_, y_, W, H):
+        """Draw bounding box and prediction on camera frame"""
+        x1 = int(min(x_) * W) - 10
+        y1 = int(min(y_) * H) - 10
+        x2 = int(max(x_) * W) + 10
+        y2 = int(max(y_) * H) + 10
+
+        cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 0, 0), 4)
+        cv2.putText(display_frame, prediction, (x1, y1 - 10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3, cv2.LINE_AA)
+
+    def _wrap(self, text, max_chars_per_line=25):
+        """Word-wrap text (cached until it changes)"""
+        key = (text, max_chars_per_line)
+        if key in self._wrap_cache:
+            return self._wrap_cache[key]
+        lines = []
+        current_line = ""
+        for word in text.split(' '):
+            if len(current_line + word) <= max_chars_per_line:
+                current_line += word + " "
+            else:
+                if current_line:
+                    lines.append(current_line.strip())
+                current_line = word + " "
+        if current_line:
+            lines.append(current_line.strip())
+        if len(self._wrap_cache) >= WRAP_CACHE_SIZE:
+            self._wrap_cache.clear()
+        self._wrap_cache[key] = lines
+        return lines
+
+    def draw_panel(self, display_frame, W, H, state, stage_fps, send_status=None):
+        """
+        Draw the dynamic parts of the side panel
+        Args:
+            send_status: Optional SendDispatcher.status(); shows a pending indicator and the last AI response
+        """
+        # Current prediction (if any)
+        predicted_character = state['last_prediction']
+        if predicted_character:
+            cv2.putText(display_frame, f"Current: {predicted_character}", (W + 10, 70),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+            # Show SEND gesture progress
+            if predicted_character == "SEND" and state['is_holding_send']:
+                elapsed_time = time.time() - state['send_gesture_start_time']
+                progress = min(elapsed_time / self.send_gesture_hold_time, 1.0)
+                remaining_time = max(self.send_gesture_hold_time - elapsed_time, 0)
+
+                bar_width = 300
+                bar_height = 20
+                bar_x = W + 10
+                bar_y = 100
+
+                # Background bar
+                cv2.rectangle(display_frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height),
+                              (100, 100, 100), -1)
+                # Progress bar, green when complete, orange otherwise
+                progress_width = int(bar_width * progress)
+                color = (0, 255, 0) if progress >= 1.0 else (0, 165, 255)
+                cv2.rectangle(display_frame, (bar_x, bar_y), (bar_x + progress_width, bar_y + bar_height), color, -1)
+                # Progress text
+                cv2.putText(display_frame, f"Hold SEND: {remaining_time:.1f}s", (bar_x, bar_y - 5),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+        # Accumulated text, last 10 lines
+        y_offset = 150
+        for i, line in enumerate(self._wrap(state['text'])[-10:]):
+            cv2.putText(display_frame, line, (W + 10, y_offset + i * 30),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+        # OpenAI request in flight, or the last response
+        if send_status is not None:
+            y = H - 215
+            if send_status['pending']:
+                cv2.putText(display_frame, f"Sending to AI... ({len(send_status['pending'])} pending)",
+                           (W + 10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 165, 255), 1)
+            elif send_status['response']:
+                for i, line in enumerate(self._wrap("AI: " + send_status['response'], 38)[:2]):
+                    cv2.putText(display_frame, line, (W + 10, y + i * 22),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+
+        # Per-stage FPS
+        capture_fps, inference_fps, render_fps, inference_ms = stage_fps
+        cv2.putText(display_frame, f"Capture {capture_fps:.0f} | Infer {inference_fps:.0f} ({inference_ms:.0f}ms) | "
+                   f"Render {render_fps:.0f} FPS", (W + 10, H - 165),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 200, 255), 1)
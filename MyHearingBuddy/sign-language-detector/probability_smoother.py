@@ -0,0 +1,98 @@
+"""
+Temporal Smoothing of Class Probabilities
+Keeps the classifier's probability vectors for the last few frames in a
+fixed-size NumPy ring buffer and turns them into smoothed per-class scores, so a
+single misclassified frame doesn't decide (or reset) what the user is signing.
+Every update is O(1) in the window length:
+
+- 'mean': average probability over the window (running sum: add the new
+  vector, subtract the one it overwrites)
+- 'vote': fraction of frames in the window whose top class is each class
+  (running counts)
+- 'ema':  exponential moving average, score = alpha * p + (1 - alpha) * score
+
+Frames without a hand are pushed as all-zero vectors, so the scores decay
+instead of being reset.
+"""
+
+import numpy as np
+
+DEFAULT_WINDOW = 8
+DEFAULT_EMA_ALPHA = 0.35
+SMOOTHING_MODES = ('mean', 'vote', 'ema')
+RESYNC_INTERVAL = 4096  # Pushes between exact re-summations of the running sum
+
+
+class ProbabilitySmoother:
+    def __init__(self, n_classes, window=DEFAULT_WINDOW, mode='ema', alpha=DEFAULT_EMA_ALPHA):
+        """
+        Args:
+            n_classes: Length of the probability vectors
+            window: Number of frames kept in the ring buffer
+            mode: 'mean', 'vote' or 'ema'
+            alpha: Weight of the newest frame in 'ema' mode
+        """
+        if mode not in SMOOTHING_MODES:
+            raise ValueError(f"Unknown smoothing mode '{mode}', expected one of {SMOOTHING_MODES}")
+        self.n_classes = n_classes
+        self.window = window
+        self.mode = mode
+        self.alpha = alpha
+
+        self.buffer = np.zeros((window, n_classes))
+        self.top = np.full(window, -1, dtype=np.int64)   # Top class of each slot, -1 = no hand
+        self.sum = np.zeros(n_classes)
+        self.votes = np.zeros(n_classes)
+        self.ema = np.zeros(n_classes)
+        self.position = 0
+        self.pushes = 0
+
+    def reset(self):
+        self.buffer[:] = 0
+        self.top[:] = -1
+        self.sum[:] = 0
+        self.votes[:] = 0
+        self.ema[:] = 0
+        self.position = 0
+
+    def push(self, probabilities):
+        """
+        Add one frame
+        Args:
+            probabilities: Class probability vector, or None for a frame without a hand
+        Returns:
+            Smoothed scores (see scores())
+        """
+        slot = self.position
+        old_top = self.top[slot]
+        if probabilities is None:
+            new = np.zeros(self.n_classes)
+            new_top = -1
+        else:
+            new = np.asarray(probabilities, dtype=np.float64)
+            new_top = int(np.argmax(new))
+
+        self.sum += new - self.buffer[slot]
+        if old_top >= 0:
+            self.votes[old_top] -= 1
+        if new_top >= 0:
+            self.votes[new_top] += 1
+        self.ema += self.alpha * (new - self.ema)
+
+        self.buffer[slot] = new
+        self.top[slot] = new_top
+        self.position = (slot + 1) % self.window
+
+        # Running sums accumulate rounding error; re-sum the buffer once in a while
+        self.pushes += 1
+        if self.pushes % RESYNC_INTERVAL == 0:
+            self.sum = self.buffer.sum(axis=0)
+        return self.scores()
+
+    def scores(self):
+        """Smoothed per-class scores in [0, 1]; frames not seen yet count as empty"""
+        if self.mode == 'mean':
+            return self.sum / self.window
+        if self.mode == 'vote':
+            return self.votes / self.window
+        return self.ema.copy()
@@ -0,0 +1,433 @@
+"""
+Shared-Memory Frame Ring
+Moves camera frames from a capture process to the inference process without
+pickling them through a queue. Frames live in a ring of slots in one
+multiprocessing.shared_memory block:
+
+- the capture process decodes each frame straight into a free slot
+  (cv2.VideoCapture.read into the slot's array) and then publishes it as the
+  newest frame with the next sequence number
+- a consumer gets a read-only view of the newest slot, no copy; it keeps that
+  slot pinned until its next read, and the writer never writes into a pinned
+  slot or the newest one, so a frame can't change while it is being used
+- with readers + 2 slots the writer always has a free slot: it never waits for
+  a slow consumer, consumers skip straight to the newest frame (latest-frame
+  semantics as in camera_reader.py)
+
+Only the slot bookkeeping (a few integers) is done under the ring's lock; the
+pixels are written and read outside it.
+
+SharedFrameReader has the CameraReader interface, so InferenceWorker and the
+render loop of inference_classifier.py work on it unchanged.
+
+Usage:
+    python inference_classifier.py --capture-process
+    python shared_frame_ring.py --benchmark                 # ring vs multiprocessing.Queue
+    python shared_frame_ring.py --benchmark --width 1920 --height 1080
+"""
+
+import argparse
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from fps_counter import FPSCounter
+
+DEFAULT_MAX_SHAPE = (1080, 1920, 3)   # Largest frame a slot holds
+DEFAULT_READERS = 2                   # Inference thread and render loop
+SLOT_ALIGNMENT = 64
+START_TIMEOUT = 10.0                  # Seconds to wait for the capture process to open the source
+CAPTURE_START_METHOD = 'spawn'
+
+# Ring states
+STARTING, RUNNING, FAILED, STOPPED = range(4)
+
+# Integer header: newest frame, state, then one pin per reader and (seq, h, w, c) per slot
+LATEST_SEQ, LATEST_SLOT, STATE = range(3)
+SLOT_FIELDS = 4
+# Float header: capture rate, then one timestamp per slot
+CAPTURE_FPS = 0
+
+
+class SharedFrameRing:
+    def __init__(self, max_shape=DEFAULT_MAX_SHAPE, readers=DEFAULT_READERS, context=None):
+        """
+        Create the ring; pass it to a child process as a Process argument to share it
+        Args:
+            max_shape: (height, width, channels) of the largest frame, uint8
+            readers: Number of consumers (threads or processes) reading at the same time
+            context: multiprocessing context the child processes are started with
+        """
+        context = context or mp.get_context(CAPTURE_START_METHOD)
+        self.max_shape = tuple(max_shape)
+        self.readers = readers
+        self.slots = readers + 2
+        self.condition = context.Condition()
+        self.shm = shared_memory.SharedMemory(create=True, size=self._layout())
+        self.owner = True
+        self._map()
+        self.ints[:] = 0
+        self.ints[LATEST_SLOT] = -1
+        self.ints[self.pin_offset:self.pin_offset + readers] = -1
+        self.floats[:] = 0.0
+        self.writing = None
+
+    def _layout(self):
+        """Offsets of the headers and slots; returns the total size in bytes"""
+        self.pin_offset = STATE + 1
+        self.slot_offset = self.pin_offset + self.readers
+        n_ints = self.slot_offset + self.slots * SLOT_FIELDS
+        n_floats = 1 + self.slots
+        header = n_ints * 8 + n_floats * 8
+        self.data_offset = (header + SLOT_ALIGNMENT - 1) // SLOT_ALIGNMENT * SLOT_ALIGNMENT
+        self.slot_size = (int(np.prod(self.max_shape)) + SLOT_ALIGNMENT - 1) // SLOT_ALIGNMENT * SLOT_ALIGNMENT
+        self.n_ints = n_ints
+        self.n_floats = n_floats
+        return self.data_offset + self.slots * self.slot_size
+
+    def _map(self):
+        buf = self.shm.buf
+        self.ints = np.ndarray((self.n_ints,), dtype=np.int64, buffer=buf)
+        self.floats = np.ndarray((self.n_floats,), dtype=np.float64, buffer=buf, offset=self.n_ints * 8)
+        self.data = np.ndarray((self.slots, self.slot_size), dtype=np.uint8, buffer=buf, offset=self.data_offset)
+
+    def __getstate__(self):
+        return {'max_shape': self.max_shape, 'readers': self.readers, 'condition': self.condition,
+                'name': self.shm.name}
+
+    def __setstate__(self, state):
+        self.max_shape = state['max_shape']
+        self.readers = state['readers']
+        self.slots = self.readers + 2
+        self.condition = state['condition']
+        self._layout()
+        self.shm = shared_memory.SharedMemory(name=state['name'])
+        self.owner = False
+        self._map()
+        self.writing = None
+
+    def _slot_array(self, slot, shape):
+        return self.data[slot, :int(np.prod(shape))].reshape(shape)
+
+    # Writer side (one writer)
+
+    def begin_write(self, shape):
+        """
+        Reserve a slot that no reader holds for the next frame
+        Args:
+            shape: (height, width, channels) of the frame
+        Returns:
+            Writable uint8 array in shared memory to put the frame into
+        """
+        shape = tuple(shape)
+        if len(shape) != 3 or any(s > m for s, m in zip(shape, self.max_shape)):
+            raise ValueError(f"Frame of shape {shape} doesn't fit the ring's {self.max_shape} slots")
+        with self.condition:
+            busy = set(self.ints[self.pin_offset:self.pin_offset + self.readers].tolist())
+            busy.add(int(self.ints[LATEST_SLOT]))
+            slot = next(s for s in range(self.slots) if s not in busy)
+            self.ints[self.slot_offset + slot * SLOT_FIELDS] = 0   # Not a valid frame while written
+        self.writing = (slot, shape)
+        return self._slot_array(slot, shape)
+
+    def commit(self, timestamp=None):
+        """Publish the slot filled since begin_write as the newest frame; returns its sequence number"""
+        slot, shape = self.writing
+        self.writing = None
+        with self.condition:
+            seq = int(self.ints[LATEST_SEQ]) + 1
+            base = self.slot_offset + slot * SLOT_FIELDS
+            self.ints[base:base + SLOT_FIELDS] = (seq, *shape)
+            self.floats[1 + slot] = timestamp if timestamp is not None else time.time()
+            self.ints[LATEST_SLOT] = slot
+            self.ints[LATEST_SEQ] = seq
+            self.condition.notify_all()
+        return seq
+
+    def write(self, frame, timestamp=None):
+        """Copy a frame into the ring and publish it"""
+        self.begin_write(frame.shape)[...] = frame
+        return self.commit(timestamp)
+
+    def set_state(self, state):
+        with self.condition:
+            self.ints[STATE] = state
+            self.condition.notify_all()
+
+    @property
+    def state(self):
+        return int(self.ints[STATE])
+
+    # Reader side
+
+    def read(self, last_seq=0, timeout=1.0, reader=0):
+        """
+        Wait for a frame newer than last_seq and pin it
+        Args:
+            last_seq: Sequence number of the last frame this reader processed
+            timeout: Seconds to wait for a new frame
+            reader: Index of the consumer (0 .. readers - 1); each holds one pinned slot
+        Returns:
+            (seq, frame, timestamp) with a read-only view of the slot, valid until
+            this reader's next read or release; (last_seq, None, 0.0) on timeout or
+            when the capture stopped
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.ints[LATEST_SEQ] > last_seq or self.ints[STATE] >= FAILED,
+                                    timeout)
+            seq = int(self.ints[LATEST_SEQ])
+            if seq <= last_seq:
+                return last_seq, None, 0.0
+            slot = int(self.ints[LATEST_SLOT])
+            self.ints[self.pin_offset + reader] = slot
+            base = self.slot_offset + slot * SLOT_FIELDS
+            shape = tuple(int(v) for v in self.ints[base + 1:base + SLOT_FIELDS])
+            timestamp = float(self.floats[1 + slot])
+        frame = self._slot_array(slot, shape)
+        frame.flags.writeable = False
+        return seq, frame, timestamp
+
+    def release(self, reader=0):
+        """Unpin the frame this reader holds"""
+        with self.condition:
+            self.ints[self.pin_offset + reader] = -1
+
+    def close(self):
+        """Detach from the shared memory; the creating process also frees it"""
+        self.ints = self.floats = self.data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def capture_frames(source, ring, stop_event, width=None, height=None):
+    """
+    Capture process: decode frames from a cv2.VideoCapture source into the ring
+    Args:
+        source: Camera index or video path
+        ring: SharedFrameRing created by the consumer
+        stop_event: Set by the consumer to stop capturing
+        width, height: Optional capture resolution
+    """
+    cap = cv2.VideoCapture(source)
+    if width:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    if height:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    ret, frame = cap.read() if cap.isOpened() else (False, None)
+    if not ret:
+        ring.set_state(FAILED)
+        cap.release()
+        ring.close()
+        return
+
+    fps = FPSCounter()
+    ring.set_state(RUNNING)
+    try:
+        ring.write(frame)
+        while not stop_event.is_set():
+            target = ring.begin_write(frame.shape)
+            ret, frame = cap.read(target)
+            if not ret:
+                ring.set_state(FAILED)
+                break
+            if frame is not target and not np.shares_memory(frame, target):
+                target[...] = frame   # Size changed or the backend didn't decode in place
+            now = time.time()
+            ring.commit(now)
+            fps.tick(now)
+            ring.floats[CAPTURE_FPS] = fps.fps(now)
+        else:
+            ring.set_state(STOPPED)
+    finally:
+        cap.release()
+        ring.close()
+
+
+class CaptureRate:
+    """FPSCounter stand-in reporting the rate measured by the capture process"""
+
+    def __init__(self, ring):
+        self.ring = ring
+
+    def fps(self, now=None):
+        return float(self.ring.floats[CAPTURE_FPS])
+
+
+class SharedFrameReader:
+    def __init__(self, source=0, width=None, height=None, max_shape=DEFAULT_MAX_SHAPE, readers=DEFAULT_READERS):
+        """
+        CameraReader drop-in whose frames come from a capture process through shared memory
+        Args:
+            source: Camera index or video path for cv2.VideoCapture
+            width, height: Optional capture resolution
+            max_shape: Largest frame the ring holds
+            readers: Number of consumer threads calling read()
+        """
+        context = mp.get_context(CAPTURE_START_METHOD)
+        self.ring = SharedFrameRing(max_shape, readers, context)
+        self.stop_event = context.Event()
+        self.process = context.Process(target=capture_frames, name='camera-capture', daemon=True,
+                                       args=(source, self.ring, self.stop_event, width, height))
+        self.process.start()
+        self.fps = CaptureRate(self.ring)
+        self.reader_ids = {}        # Consumer thread -> pin index
+        self.lock = threading.Lock()
+
+    def is_opened(self):
+        """Wait for the capture process to open the source"""
+        deadline = time.time() + START_TIMEOUT
+        while self.ring.state == STARTING and self.process.is_alive() and time.time() < deadline:
+            time.sleep(0.01)
+        return self.ring.state == RUNNING
+
+    def start(self):
+        """Capture already runs in its own process; kept for the CameraReader interface"""
+        return self
+
+    @property
+    def failed(self):
+        return self.ring.state == FAILED or not self.process.is_alive()
+
+    @property
+    def seq(self):
+        return int(self.ring.ints[LATEST_SEQ])
+
+    def _reader_id(self):
+        thread = threading.get_ident()
+        with self.lock:
+            if thread not in self.reader_ids:
+                if len(self.reader_ids) >= self.ring.readers:
+                    raise RuntimeError(f"More than {self.ring.readers} threads read from the shared frame ring")
+                self.reader_ids[thread] = len(self.reader_ids)
+            return self.reader_ids[thread]
+
+    def read(self, last_seq=0, timeout=1.0):
+        """
+        Wait for a frame newer than last_seq
+        Returns:
+            (seq, frame) like CameraReader.read; the frame is a read-only view into
+            shared memory that stays valid until this thread's next read
+        """
+        seq, frame, _ = self.ring.read(last_seq, timeout, self._reader_id())
+        return seq, frame
+
+    def stop(self):
+        """Stop the capture process and free the shared memory"""
+        self.stop_event.set()
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
+
+
+# Benchmark: capture process -> consumer, shared-memory ring vs multiprocessing.Queue
+
+def _produce_ring(ring, stop_event, shape):
+    frames = [np.full(shape, i * 40, dtype=np.uint8) for i in range(4)]
+    ring.set_state(RUNNING)
+    i = 0
+    while not stop_event.is_set():
+        ring.write(frames[i % len(frames)])
+        i += 1
+    ring.close()
+
+
+def _produce_queue(frame_queue, stop_event, shape):
+    frames = [np.full(shape, i * 40, dtype=np.uint8) for i in range(4)]
+    i = 0
+    while not stop_event.is_set():
+        # Latest-frame queue: drop the frame that is still waiting
+        try:
+            frame_queue.put_nowait((time.time(), frames[i % len(frames)]))
+        except queue.Full:
+            try:
+                frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+        i += 1
+
+
+def _consume(get_frame, duration):
+    """Read frames for `duration` seconds, doing a color conversion on each like process_frame"""
+    latencies = []
+    start = time.time()
+    while time.time() - start < duration:
+        frame, timestamp = get_frame()
+        if frame is None:
+            continue
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        latencies.append((time.time() - timestamp) * 1000)
+    elapsed = time.time() - start
+    return len(latencies) / elapsed, float(np.mean(latencies)), float(np.percentile(latencies, 95))
+
+
+def benchmark(shape, duration):
+    """
+    Frames per second and capture-to-consumer latency of both transports
+    Returns:
+        {'ring': (fps, mean ms, p95 ms), 'queue': (fps, mean ms, p95 ms)}
+    """
+    context = mp.get_context(CAPTURE_START_METHOD)
+    results = {}
+
+    ring = SharedFrameRing(shape, readers=1, context=context)
+    stop_event = context.Event()
+    producer = context.Process(target=_produce_ring, args=(ring, stop_event, shape), daemon=True)
+    producer.start()
+    state = {'seq': 0}
+
+    def from_ring():
+        seq, frame, timestamp = ring.read(state['seq'], timeout=1.0)
+        state['seq'] = seq
+        return frame, timestamp
+
+    results['ring'] = _consume(from_ring, duration)
+    stop_event.set()
+    producer.join()
+    ring.close()
+
+    frame_queue = context.Queue(maxsize=1)
+    stop_event = context.Event()
+    producer = context.Process(target=_produce_queue, args=(frame_queue, stop_event, shape), daemon=True)
+    producer.start()
+
+    def from_queue():
+        try:
+            timestamp, frame = frame_queue.get(timeout=1.0)
+        except queue.Empty:
+            return None, 0.0
+        return frame, timestamp
+
+    results['queue'] = _consume(from_queue, duration)
+    stop_event.set()
+    producer.join(timeout=2.0)
+    if producer.is_alive():
+        producer.terminate()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shared-memory frame ring against a Queue')
+    parser.add_argument('--benchmark', action='store_true', help='Run the transport benchmark')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per transport')
+    args = parser.parse_args()
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    shape = (args.height, args.width, 3)
+    print(f"📊 Capture process -> consumer, {args.width}x{args.height} frames, {args.duration:.0f}s each")
+    for name, (fps, mean_ms, p95_ms) in benchmark(shape, args.duration).items():
+        print(f"  {name:5s}  {fps:7.1f} frames/s   latency mean {mean_ms:6.2f} ms   p95 {p95_ms:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Symmetric-Delete Spell Correction for Garbled Letter Streams
+SymSpell-style index over the local lexicon. All deletes (up to the maximum edit
+distance) of every lexicon word are precomputed, so candidate lookup is a handful
+of dictionary probes instead of a scan. Candidates are ranked with a weighted
+edit distance that makes common sign recognition mistakes cheap.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7  # Only the first letters are indexed, which bounds index size
+
+# Pairs of similar handshapes the classifier tends to confuse
+CONFUSABLE_LETTERS = {
+    frozenset(pair) for pair in [
+        ('m', 'n'), ('u', 'v'), ('a', 's'), ('a', 'e'), ('e', 's'), ('s', 't'),
+        ('k', 'v'), ('g', 'h'), ('i', 'j'), ('d', 'z'), ('c', 'o'), ('r', 'u'),
+    ]
+}
+CONFUSABLE_COST = 0.5
+
+# A letter repeated because the sign was held a little too long
+REPEAT_COST = 0.3
+
+# A letter the classifier skipped because the sign was not held long enough
+MISSING_LETTER_COST = 0.8
+
+# Rewriting a word that isn't in the lexicon is only safe for the cheap, sign-specific edits
+# above: a plain substitution (cost 1) turns real names and words into other words ("BOB" -> "box").
+# The best candidate must also beat the runner-up clearly, otherwise the word is kept
+CORRECTION_MAX_DISTANCE = 0.8
+CORRECTION_MARGIN = 0.5
+
+# Sign language greeting pattern: "H" + accidental letter(s) = "Hi"
+GREETING = 'hi'
+GREETING_COST = 0.3
+
+
+def _substitution_cost(typed: str, intended: str, i: int, j: int) -> float:
+    a, b = typed[i - 1], intended[j - 1]
+    if a == b:
+        return 0.0
+    if intended == GREETING and typed[0] == 'h' and i == 2 and j == 2:
+        return GREETING_COST
+    if frozenset((a, b)) in CONFUSABLE_LETTERS:
+        return CONFUSABLE_COST
+    return 1.0
+
+
+def _deletion_cost(typed: str, intended: str, i: int) -> float:
+    """Cost of dropping typed[i - 1] (an extra letter in the input)"""
+    if i >= 2 and typed[i - 1] == typed[i - 2]:
+        return REPEAT_COST
+    if intended == GREETING and typed[0] == 'h' and i > 2:
+        return GREETING_COST
+    return 1.0
+
+
+def weighted_distance(typed: str, intended: str) -> float:
+    """
+    Weighted Damerau-Levenshtein (optimal string alignment) distance
+    Args:
+        typed: Word as produced by the letter classifier
+        intended: Lexicon word
+    Returns:
+        Edit cost; confusable letters, repeated letters and the H + letter
+        greeting pattern are cheaper than ordinary edits
+    """
+    n, m = len(typed), len(intended)
+    prev2 = None
+    prev = [j * MISSING_LETTER_COST for j in range(m + 1)]
+    for i in range(1, n + 1):
+        row = [prev[0] + _deletion_cost(typed, intended, i)] + [0.0] * m
+        for j in range(1, m + 1):
+            cost = min(
+                prev[j] + _deletion_cost(typed, intended, i),
+                row[j - 1] + MISSING_LETTER_COST,
+                prev[j - 1] + _substitution_cost(typed, intended, i, j),
+            )
+            if (prev2 is not None and i > 1 and j > 1 and typed[i - 1] == intended[j - 2]
+                    and typed[i - 2] == intended[j - 1]):
+                cost = min(cost, prev2[j - 2] + 1.0)
+            row[j] = cost
+        prev2, prev = prev, row
+    return prev[m]
+
+
+# Most frequent everyday English words, most frequent first. Always part of the
+# lexicon so corrections work without a trained n-gram model
+COMMON_WORDS = (
+    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i', 'it', 'for', 'not', 'on',
+    'with', 'he', 'as', 'you', 'do', 'at', 'this', 'but', 'his', 'by', 'from', 'they', 'we',
+    'say', 'her', 'she', 'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their',
+    'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go', 'me', 'when',
+    'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know', 'take', 'people', 'into',
+    'year', 'your', 'good', 'some', 'could', 'them', 'see', 'other', 'than', 'then', 'now',
+    'look', 'only', 'come', 'its', 'over', 'think', 'also', 'back', 'after', 'use', 'two',
+    'how', 'our', 'work', 'first', 'well', 'way', 'even', 'new', 'want', 'because', 'any',
+    'these', 'give', 'day', 'most', 'us', 'is', 'am', 'are', 'was', 'were', 'been', 'has',
+    'had', 'did', 'does', 'name', 'here', 'where', 'why', 'yes', 'please', 'thank', 'thanks',
+    'sorry', 'hello', 'hi', 'bye', 'help', 'need', 'eat', 'drink', 'water', 'food', 'home',
+    'school', 'friend', 'family', 'mother', 'father', 'hungry', 'thirsty', 'tired', 'happy',
+    'sad', 'sick', 'fine', 'okay', 'morning', 'night', 'today', 'tomorrow', 'again', 'more',
+    'very', 'much', 'many', 'love', 'doing', 'going', 'call', 'talk', 'wait', 'stop', 'learn',
+    'toilet', 'doctor', 'hospital', 'money', 'phone', 'understand', 'sign', 'language',
+)
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """All strings reachable from word by up to max_distance deletions"""
+    results = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                deleted = w[:i] + w[i + 1:]
+                if deleted not in results:
+                    next_frontier.add(deleted)
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+class SpellIndex:
+    def __init__(self, word_frequencies: Dict[str, int], max_edit_distance: int = MAX_EDIT_DISTANCE,
+                 prefix_length: int = PREFIX_LENGTH):
+        """
+        Build the symmetric-delete index
+        Args:
+            word_frequencies: Lexicon words (lowercase) mapped to frequency counts
+            max_edit_distance: Maximum number of plain edits between input and candidate
+            prefix_length: Number of leading letters indexed per word
+        """
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.frequencies = {w.lower(): f for w, f in word_frequencies.items() if w}
+        self.sorted_words = sorted(self.frequencies)
+
+        self.deletes: Dict[str, List[str]] = {}
+        for word in self.frequencies:
+            key = word[:prefix_length]
+            for deleted in _deletes(key, max_edit_distance) | {key}:
+                self.deletes.setdefault(deleted, []).append(word)
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.frequencies
+
+    def is_prefix(self, partial: str) -> bool:
+        """True if partial is the start of some lexicon word"""
+        partial = partial.lower()
+        idx = bisect_left(self.sorted_words, partial)
+        return idx < len(self.sorted_words) and self.sorted_words[idx].startswith(partial)
+
+    def lookup(self, word: str, max_distance: float = MAX_EDIT_DISTANCE) -> List[Tuple[str, float, int]]:
+        """
+        Find lexicon words close to word
+        Args:
+            word: Possibly garbled input word
+            max_distance: Maximum weighted edit distance
+        Returns:
+            (word, distance, frequency) tuples, best first
+        """
+        word = word.lower()
+        if word in self.frequencies:
+            return [(word, 0.0, self.frequencies[word])]
+
+        key = word[:self.prefix_length]
+        candidates = set()
+        for probe in _deletes(key, self.max_edit_distance) | {key}:
+            candidates.update(self.deletes.get(probe, ()))
+
+        results = []
+        for candidate in candidates:
+            distance = weighted_distance(word, candidate)
+            if distance <= max_distance:
+                results.append((candidate, distance, self.frequencies[candidate]))
+        results.sort(key=lambda r: (r[1], -r[2], r[0]))
+        return results
+
+    def correct(self, word: str, max_distance: float = MAX_EDIT_DISTANCE, margin: float = 0.0) -> Optional[str]:
+        """
+        Best correction for word
+        Args:
+            max_distance: Maximum weighted edit distance of the correction
+            margin: Distance by which the best candidate must beat the next one
+        Returns:
+            The correction, or None if nothing is close enough or the best candidate is ambiguous
+        """
+        results = self.lookup(word, max_distance + margin)
+        if not results or results[0][1] > max_distance + 1e-9:
+            return None
+        if len(results) > 1 and results[1][1] - results[0][1] < margin - 1e-9:
+            return None
+        return results[0][0]
+
+
+def build_spell_index(words: Iterable[str], extra_frequencies: Optional[Dict[str, int]] = None,
+                      max_words: int = 20000) -> SpellIndex:
+    """
+    Build a spell index from a word list and optional corpus frequencies
+    Args:
+        words: Core lexicon words, added to COMMON_WORDS with a base frequency of 1
+        extra_frequencies: Additional word counts, e.g. from the n-gram model
+        max_words: Keep only the most frequent extra words to bound build time
+    Returns:
+        SpellIndex over the combined lexicon
+    """
+    # Rank-based counts so frequent everyday words win ties
+    frequencies = {w: len(COMMON_WORDS) - rank + 1 for rank, w in enumerate(COMMON_WORDS)}
+    for w in words:
+        if w.isalpha():
+            frequencies.setdefault(w.lower(), 1)
+    if extra_frequencies:
+        top = sorted(extra_frequencies.items(), key=lambda item: -item[1])[:max_words]
+        for w, count in top:
+            if w.isalpha():
+                frequencies[w] = frequencies.get(w, 0) + int(count)
+    return SpellIndex(frequencies)
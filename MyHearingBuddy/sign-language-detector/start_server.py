@@ -199,10 +199,14 @@ def main():
     print(f"\n🔧 Available endpoints:")
     print(f"   GET  /health - Health check")
     print(f"   POST /detect - Sign language detection")
+    print(f"   POST /session/start - Streaming detection session")
     print(f"   POST /complete_text - Text completion")
+    print(f"   POST /complete_text_stream - Streaming completion")
+    print(f"   GET  /completion_stats - Completion metrics")
     print(f"   POST /speak - Text-to-speech")
     print(f"   GET  /labels - Available labels")
     print(f"   GET  /model_info - Model information")
+    print(f"   POST /reload_model - Reload the model artifact")
     
     print(f"\n🧪 Test the API:")
     print(f"   python test_api.py")
@@ -0,0 +1,112 @@
+"""
+Streaming Detection Sessions
+Per-client state for the /session endpoints of the API server. Each session
+feeds the classifier's per-frame probability vectors to its own beam decoder,
+so words are recovered locally as frames arrive. Each session also keeps an
+adaptive scheduler, so a client streaming a steady hand doesn't pay for hand
+detection on every frame, and, when the motion head is trained, a sliding window
+of its landmarks for the motion signs (J, Z).
+"""
+
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from beam_decoder import BeamDecoder
+from frame_scheduler import AdaptiveScheduler
+from motion_features import MotionTracker
+
+SESSION_TIMEOUT = 300  # Seconds of inactivity before a session is dropped
+
+
+class StreamingSession:
+    def __init__(self, decoder: BeamDecoder, scheduler: AdaptiveScheduler = None,
+                 motion: MotionTracker = None, labels: dict = None):
+        """
+        Initialize a streaming session
+        Args:
+            decoder: Beam decoder dedicated to this session
+            scheduler: Detection scheduler for this session's frames (None = detect every frame)
+            motion: Motion tracker for this session (None = static signs only)
+            labels: Class index -> sign name, to relabel frames the motion head changes
+        """
+        self.session_id = uuid.uuid4().hex
+        self.decoder = decoder
+        self.scheduler = scheduler
+        self.motion = motion
+        self.labels = labels or {}
+        self.created_at = time.time()
+        self.last_active = self.created_at
+        self.frames = 0
+        self.hand_frames = 0
+        # The server is threaded: hold this across detect() and process() of one frame so
+        # concurrent requests don't interleave updates of the session state
+        self.lock = threading.Lock()
+
+    def detect(self, image, detect_fn):
+        """
+        Run detect_fn on a frame, or reuse the last detection if the scheduler allows it
+        Args:
+            image: BGR frame
+            detect_fn: detect_sign_language, returning (result, error)
+        Returns:
+            (result, error, whether detection ran)
+        """
+        if self.scheduler is not None and not self.scheduler.should_detect(image):
+            result, error = self.scheduler.cached
+            detected = False
+        else:
+            result, error = detect_fn(image)
+            detected = True
+            if self.scheduler is not None:
+                if result is not None:
+                    # All hands together, so motion of any of them ends the skipping
+                    landmarks = [(lm['x'], lm['y']) for hand in result['hands'] for lm in hand['landmarks']]
+                    self.scheduler.record(image, landmarks, result['confidence'], (result, error))
+                else:
+                    self.scheduler.record(image, None, 0.0, (result, error))
+
+        if self.motion is not None:
+            result = self._apply_motion(result)
+        return result, error, detected
+
+    def _apply_motion(self, result):
+        """Advance the motion window and let the motion head adjust the frame's probabilities"""
+        if result is None:
+            self.motion.update(None, None)
+            return None
+        landmarks = [(lm['x'], lm['y']) for lm in result['landmarks']]
+        probabilities = self.motion.update(landmarks, result['probabilities'])
+        if probabilities is result['probabilities']:
+            return result
+        best = int(np.argmax(probabilities))
+        return dict(result, probabilities=probabilities, confidence=float(probabilities[best]),
+                    prediction=self.labels.get(best, result['prediction']))
+
+    def process(self, detection) -> dict:
+        """
+        Update the session with one frame's detection result
+        Args:
+            detection: Result of detect_sign_language, or None if no hand was found
+        Returns:
+            Current decoding from the beam decoder
+        """
+        self.last_active = time.time()
+        self.frames += 1
+
+        # Frames without a hand and SEND gestures carry no letter information
+        if detection is None or detection['prediction'] == 'SEND':
+            return self.decoder.output()
+
+        self.hand_frames += 1
+        return self.decoder.update(detection['probabilities'])
+
+    def finish(self) -> dict:
+        """End the utterance and return the final decoding"""
+        self.last_active = time.time()
+        return self.decoder.finalize()
+
+    def is_expired(self, now=None) -> bool:
+        return (now or time.time()) - self.last_active > SESSION_TIMEOUT
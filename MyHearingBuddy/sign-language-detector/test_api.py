@@ -89,6 +89,39 @@ def test_detection_endpoint():
         print(f"❌ Detection test failed: {e}")
         return False
 
+def test_streaming_session():
+    """Test the streaming session endpoints with a test image"""
+    print("🔍 Testing streaming session...")
+    try:
+        response = requests.post(f'{API_BASE_URL}/session/start')
+        result = response.json()
+        if response.status_code != 200:
+            print(f"⚠️ Session start error: {result}")
+            return False
+        session_id = result['session_id']
+        
+        base64_image = create_test_image()
+        for _ in range(3):
+            response = requests.post(f'{API_BASE_URL}/session/{session_id}/frame', 
+                                   json={'image': base64_image})
+            result = response.json()
+            if response.status_code != 200:
+                print(f"⚠️ Session frame error: {result}")
+                return False
+        print(f"   Decoded after 3 frames: {result['decoded']}")
+        
+        response = requests.post(f'{API_BASE_URL}/session/{session_id}/end')
+        result = response.json()
+        if response.status_code != 200:
+            print(f"⚠️ Session end error: {result}")
+            return False
+        
+        print(f"✅ Streaming session: {result['frames']} frames, text '{result['text']}'")
+        return True
+    except Exception as e:
+        print(f"❌ Streaming session test failed: {e}")
+        return False
+
 def test_text_completion():
     """Test the text completion endpoint"""
     print("🔍 Testing text completion...")
@@ -109,6 +142,48 @@ def test_text_completion():
         print(f"❌ Text completion test failed: {e}")
         return False
 
+def test_text_completion_stream():
+    """Test the streaming text completion endpoint"""
+    print("🔍 Testing streaming text completion...")
+    try:
+        test_text = "WHAT IS YOUR NAM"
+        start_time = time.time()
+        first_delta_time = None
+        completed_text = None
+        
+        with requests.post(f'{API_BASE_URL}/complete_text_stream', 
+                           json={'text': test_text}, stream=True) as response:
+            if response.status_code != 200:
+                print(f"⚠️ Streaming completion error: {response.json()}")
+                return False
+            
+            event = 'message'
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith('event: '):
+                    event = line[len('event: '):]
+                elif line.startswith('data: '):
+                    payload = json.loads(line[len('data: '):])
+                    if event == 'error':
+                        print(f"⚠️ Streaming completion error: {payload}")
+                        return False
+                    if event == 'done':
+                        completed_text = payload['completed_text']
+                    elif first_delta_time is None:
+                        first_delta_time = time.time() - start_time
+                elif not line:
+                    event = 'message'
+        
+        if completed_text is None:
+            print("⚠️ Stream ended without a done event")
+            return False
+        
+        print(f"✅ Streaming completion: '{test_text}' -> '{completed_text}' "
+              f"(first delta after {first_delta_time * 1000:.0f}ms)")
+        return True
+    except Exception as e:
+        print(f"❌ Streaming completion test failed: {e}")
+        return False
+
 def test_speak_endpoint():
     """Test the speak endpoint"""
     print("🔍 Testing speak endpoint...")
@@ -140,7 +215,9 @@ def main():
         ("Labels Endpoint", test_labels_endpoint),
         ("Model Info", test_model_info),
         ("Detection Endpoint", test_detection_endpoint),
+        ("Streaming Session", test_streaming_session),
         ("Text Completion", test_text_completion),
+        ("Streaming Text Completion", test_text_completion_stream),
         ("Speak Endpoint", test_speak_endpoint)
     ]
     
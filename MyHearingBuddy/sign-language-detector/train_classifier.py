@@ -1,28 +1,235 @@
+import argparse
+import itertools
+import json
+import os
 import pickle
+import tempfile
+import time
 
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.metrics import accuracy_score
+from joblib import Parallel, delayed
 import numpy as np
+from dataset_store import load_training_data, Dataset, DEFAULT_DATASET_DIR
+from augment_dataset import source_path
+from forest_artifact import export_forest, ForestPredictor, DEFAULT_ARTIFACT_DIR
 
+# Hyperparameter grid explored by --search
+SEARCH_GRID = {
+    'n_estimators': [10, 25, 50, 100, 200],
+    'max_depth': [None, 8, 12, 16],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', 0.3],
+}
+DEFAULT_FOLDS = 5
+DEFAULT_LATENCY_BUDGET_MS = 5.0   # Per-frame budget for predict_proba on one sample
+LATENCY_SAMPLES = 200             # Single-sample predictions timed per candidate
+SEARCH_RESULTS_PATH = 'search_results.json'
+TEST_SIZE = 0.2
+SPLIT_SEED = 42   # Fixed so compact_forest.py can rebuild the same held-out split
 
-data_dict = pickle.load(open('./data.pickle', 'rb'))
 
-data = np.asarray(data_dict['data'])
-labels = np.asarray(data_dict['labels'])
+def load_augmented(augmented_dir, dataset_paths):
+    """
+    Load augmented copies and map each one to its source sample
+    Returns:
+        (features, labels, source index into dataset_paths; -1 if the source is unknown)
+    """
+    augmented = Dataset(augmented_dir)
+    index = {str(p): i for i, p in enumerate(dataset_paths)}
+    sources = np.fromiter((index.get(source_path(str(p)), -1) for p in augmented.paths),
+                          dtype=np.int64, count=len(augmented))
+    return augmented.features, augmented.labels, sources
 
-x_train, x_test, y_train, y_test = train_test_split(data, labels, test_size=0.2, shuffle=True, stratify=labels)
 
-model = RandomForestClassifier()
+def with_augmented(x, y, train_idx, augmented):
+    """
+    Append the augmented copies of the samples in train_idx only
+    Copies of held-out samples are left out so the measured accuracy stays honest
+    """
+    if augmented is None:
+        return x, y
+    aug_x, aug_y, sources = augmented
+    keep = np.isin(sources, train_idx)
+    return np.concatenate([x, aug_x[keep]]), np.concatenate([y, aug_y[keep]])
 
-model.fit(x_train, y_train)
 
-y_predict = model.predict(x_test)
+def measure_latency(model, samples):
+    """Median milliseconds for predict_proba on a single sample"""
+    timings = []
+    for sample in samples:
+        row = sample.reshape(1, -1)
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
 
-score = accuracy_score(y_predict, y_test)
 
-print('{}% of samples were classified correctly !'.format(score * 100))
+def _fit_and_score(params, data, labels, train_idx, val_idx, augmented):
+    x_train, y_train = with_augmented(data[train_idx], labels[train_idx], train_idx, augmented)
+    model = RandomForestClassifier(n_jobs=1, **params)
+    model.fit(x_train, y_train)
+    return accuracy_score(labels[val_idx], model.predict(data[val_idx]))
 
-f = open('model.p', 'wb')
-pickle.dump({'model': model}, f)
-f.close()
+
+def _fit(params, x_train, y_train):
+    model = RandomForestClassifier(n_jobs=1, **params)
+    model.fit(x_train, y_train)
+    return model
+
+
+def measure_served_latency(model, samples):
+    """
+    Median single-sample predict_proba milliseconds of the model as the detector serves it:
+    exported with export_forest and memory-mapped by ForestPredictor (see load_model)
+    """
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        export_forest(model, artifact_dir)
+        return measure_latency(ForestPredictor(artifact_dir), samples)
+
+
+def _fit_and_time(params, x_train, y_train, latency_rows):
+    # Only the latency leaves the worker; keeping all refit forests would hold every candidate in memory
+    return measure_served_latency(_fit(params, x_train, y_train), latency_rows)
+
+
+def pareto_front(results):
+    """Candidates no other candidate beats on both accuracy and latency"""
+    front = []
+    for r in sorted(results, key=lambda r: (r['latency_ms'], -r['accuracy'])):
+        if not front or r['accuracy'] > front[-1]['accuracy']:
+            front.append(r)
+    return front
+
+
+def search(data, labels, train_idx, augmented, folds=DEFAULT_FOLDS, jobs=-1):
+    """
+    Cross-validate every grid candidate on the training split, in parallel
+    Returns:
+        List of result dictionaries with params, accuracy, accuracy_std and
+        latency_ms of the candidate refit on the whole training split and exported
+    """
+    candidates = [dict(zip(SEARCH_GRID, values)) for values in itertools.product(*SEARCH_GRID.values())]
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    splits = [(train_idx[t], train_idx[v]) for t, v in splitter.split(train_idx, labels[train_idx])]
+    print(f"Searching {len(candidates)} candidates x {folds} folds on {os.cpu_count()} cores...")
+
+    start_time = time.time()
+    scores = Parallel(n_jobs=jobs)(
+        delayed(_fit_and_score)(params, data, labels, t, v, augmented)
+        for params in candidates for t, v in splits)
+    scores = np.array(scores).reshape(len(candidates), folds)
+
+    print(f"Cross-validation finished in {time.time() - start_time:.1f}s, measuring latency...")
+
+    # Refit every candidate on the full training split and time it in the worker (one job per
+    # core, so timings don't share a core); the forest is dropped there
+    x_train, y_train = with_augmented(data[train_idx], labels[train_idx], train_idx, augmented)
+    rng = np.random.default_rng(0)
+    latency_rows = np.asarray(data[rng.choice(train_idx, min(LATENCY_SAMPLES, len(train_idx)), replace=False)])
+    latencies = Parallel(n_jobs=jobs)(
+        delayed(_fit_and_time)(params, x_train, y_train, latency_rows) for params in candidates)
+
+    return [{
+        'params': params,
+        'accuracy': float(fold_scores.mean()),
+        'accuracy_std': float(fold_scores.std()),
+        'latency_ms': latency,
+    } for params, fold_scores, latency in zip(candidates, scores, latencies)]
+
+
+def select_model(results, latency_budget_ms):
+    """Most accurate candidate within the latency budget (the fastest one if none fits)"""
+    within = [r for r in results if r['latency_ms'] <= latency_budget_ms]
+    if not within:
+        print(f"⚠️ No candidate meets the {latency_budget_ms}ms budget, using the fastest")
+        return min(results, key=lambda r: r['latency_ms'])
+    return max(within, key=lambda r: (r['accuracy'], -r['latency_ms']))
+
+
+def report_search(results, chosen, path=SEARCH_RESULTS_PATH):
+    """Print the accuracy/latency Pareto front and save all results as JSON"""
+    front = pareto_front(results)
+    print("\nAccuracy / latency Pareto front:")
+    print(f"  {'accuracy':>9} {'latency':>9}  params")
+    for r in front:
+        marker = ' <- selected' if r is chosen else ''
+        print(f"  {r['accuracy'] * 100:8.2f}% {r['latency_ms']:7.3f}ms  {r['params']}{marker}")
+
+    with open(path, 'w') as f:
+        json.dump({
+            'selected': chosen['params'],
+            'results': [r | {'pareto': r in front} for r in results],
+        }, f, indent=2)
+    print(f"All {len(results)} results saved to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the sign language classifier')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_DIR, help='Landmark dataset directory')
+    parser.add_argument('--augmented', default=None, help='Augmented dataset from augment_dataset.py')
+    parser.add_argument('--search', action='store_true',
+                        help='Cross-validated hyperparameter search with latency-aware model selection')
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS, help='Cross-validation folds for --search')
+    parser.add_argument('--latency-budget', type=float, default=DEFAULT_LATENCY_BUDGET_MS,
+                        help='Per-frame inference budget in milliseconds for --search')
+    parser.add_argument('--jobs', type=int, default=-1, help='Parallel jobs for --search (-1 = all cores)')
+    parser.add_argument('--seed', type=int, default=SPLIT_SEED, help='Random seed of the train/test split')
+    parser.add_argument('--artifact', default=DEFAULT_ARTIFACT_DIR,
+                        help='Directory for the memory-mapped model artifact')
+    args = parser.parse_args()
+
+    # Memory-mapped columnar dataset (falls back to a legacy data.pickle)
+    data, labels = load_training_data(args.dataset)
+    indices = np.arange(len(labels))
+
+    train_idx, test_idx = train_test_split(indices, test_size=TEST_SIZE, shuffle=True, stratify=labels,
+                                           random_state=args.seed)
+    x_test, y_test = data[test_idx], labels[test_idx]
+
+    augmented = None
+    if args.augmented:
+        if not os.path.exists(os.path.join(args.dataset, 'meta.json')):
+            raise SystemExit("--augmented needs a columnar dataset (run create_dataset.py)")
+        augmented = load_augmented(args.augmented, Dataset(args.dataset).paths)
+        print(f"Adding {int(np.isin(augmented[2], train_idx).sum())} augmented samples from {args.augmented}")
+
+    x_train, y_train = with_augmented(data[train_idx], labels[train_idx], train_idx, augmented)
+    if args.search:
+        results = search(data, labels, train_idx, augmented, args.folds, args.jobs)
+        chosen = select_model(results, args.latency_budget)
+        report_search(results, chosen)
+        # Only the selected candidate is refit for keeps
+        model = _fit(chosen['params'], x_train, y_train)
+    else:
+        model = RandomForestClassifier()
+        model.fit(x_train, y_train)
+
+    y_predict = model.predict(x_test)
+
+    score = accuracy_score(y_predict, y_test)
+
+    print('{}% of samples were classified correctly !'.format(score * 100))
+
+    f = open('model.p', 'wb')
+    pickle.dump({'model': model}, f)
+    f.close()
+
+    params = model.get_params()
+    label_names = Dataset(args.dataset).label_names if os.path.exists(os.path.join(args.dataset, 'meta.json')) else []
+    manifest = export_forest(model, args.artifact, label_names, {
+        'dataset': args.dataset,
+        'augmented': args.augmented,
+        'train_samples': int(len(train_idx)),
+        'test_samples': int(len(test_idx)),
+        'test_size': TEST_SIZE,
+        'split_seed': args.seed,
+        'test_accuracy': float(score),
+        'params': {k: params[k] for k in ('n_estimators', 'max_depth', 'min_samples_leaf', 'max_features')},
+    })
+    print(f"Model artifact saved to {args.artifact}/ (hash {manifest['model_hash'][:12]})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Motion Head Training
+Trains the classifier head that recognises the motion signs (J and Z by default)
+from sliding-window features (motion_features.py). Every other sign is one
+"static" class: the head only decides whether the hand is tracing a motion
+sign, and the static classifier keeps deciding between the static ones.
+
+Windows from the same capture run overlap almost entirely, so the held-out
+split is made by capture run, not by window.
+
+Usage:
+    python motion_dataset.py && python train_motion_head.py
+    python train_motion_head.py --motion-labels J Z
+"""
+
+import argparse
+import pickle
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GroupShuffleSplit
+
+from motion_dataset import load_motion_dataset, DEFAULT_MOTION_DATASET_DIR
+from motion_features import MOTION_LABELS, STATIC_CLASS, DEFAULT_MOTION_HEAD_PATH
+
+TEST_SIZE = 0.2
+SPLIT_SEED = 42
+
+
+def head_labels(labels, motion_classes):
+    """Class index for motion signs, STATIC_CLASS for everything else"""
+    return np.where(np.isin(labels, motion_classes), labels, STATIC_CLASS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the motion head for dynamic signs')
+    parser.add_argument('--dataset', default=DEFAULT_MOTION_DATASET_DIR, help='Windowed motion dataset')
+    parser.add_argument('--output', default=DEFAULT_MOTION_HEAD_PATH, help='Output pickle')
+    parser.add_argument('--motion-labels', nargs='+', default=list(MOTION_LABELS), help='Signs that involve motion')
+    args = parser.parse_args()
+
+    features, labels, sequences, meta = load_motion_dataset(args.dataset)
+    label_names = meta['label_names']
+    missing = [name for name in args.motion_labels if name not in label_names]
+    if missing:
+        raise SystemExit(f"Unknown sign(s) {missing}; the dataset has {label_names}")
+    motion_classes = [label_names.index(name) for name in args.motion_labels]
+    targets = head_labels(labels, motion_classes)
+    for name, class_id in zip(args.motion_labels, motion_classes):
+        print(f"{name}: {int((targets == class_id).sum())} windows")
+    print(f"static: {int((targets == STATIC_CLASS).sum())} windows")
+
+    splitter = GroupShuffleSplit(n_splits=1, test_size=TEST_SIZE, random_state=SPLIT_SEED)
+    train_idx, test_idx = next(splitter.split(features, targets, groups=sequences))
+
+    model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=SPLIT_SEED, n_jobs=-1)
+    model.fit(features[train_idx], targets[train_idx])
+
+    if len(test_idx):
+        predicted = model.predict(features[test_idx])
+        print(f"{(predicted == targets[test_idx]).mean() * 100:.2f}% of held-out windows classified correctly")
+        for name, class_id in zip(args.motion_labels + ['static'], motion_classes + [STATIC_CLASS]):
+            rows = targets[test_idx] == class_id
+            if rows.any():
+                print(f"  {name}: {(predicted[rows] == class_id).mean() * 100:.1f}% recall")
+
+    with open(args.output, 'wb') as f:
+        pickle.dump({
+            'model': model,
+            'window': meta['window'],
+            'motion_classes': motion_classes,
+            'motion_labels': list(args.motion_labels),
+        }, f)
+    print(f"Motion head saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
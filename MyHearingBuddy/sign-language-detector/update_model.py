@@ -0,0 +1,71 @@
+"""
+Incremental Model Update
+Merges new landmark samples into the k-NN model (knn_model.py) in seconds,
+without re-running create_dataset.py over every image or retraining a forest.
+Samples come from a columnar dataset - typically dataset/ after
+`collect_imgs.py --landmarks` appended the new sign to it. Only rows whose image
+is new, or whose features changed, are merged. A running API server with
+MODEL_DIR pointing at the model reloads it automatically.
+
+Usage:
+    python update_model.py                       # dataset/ -> model_knn/
+    python update_model.py --dataset new_signs --output model_knn
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from dataset_store import Dataset, DEFAULT_DATASET_DIR
+from knn_model import merge_samples, DEFAULT_KNN_DIR, DEFAULT_K
+
+
+def changed_rows(dataset, model_dir):
+    """
+    Rows of the dataset that the model doesn't hold yet (new image or new features)
+    Returns:
+        Array of row indices
+    """
+    paths_file = os.path.join(model_dir, 'paths.npy')
+    if not os.path.exists(os.path.join(model_dir, 'manifest.json')):
+        return np.arange(len(dataset))
+
+    model_rows = {str(p): i for i, p in enumerate(np.load(paths_file))}
+    model_features = np.load(os.path.join(model_dir, 'features.npy'), mmap_mode='r')
+    model_labels = np.load(os.path.join(model_dir, 'labels.npy'), mmap_mode='r')
+
+    rows = []
+    for i, path in enumerate(dataset.paths):
+        j = model_rows.get(str(path))
+        if (j is None or model_labels[j] != dataset.labels[i]
+                or not np.array_equal(model_features[j], dataset.features[i])):
+            rows.append(i)
+    return np.array(rows, dtype=np.int64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge new samples into the k-NN model')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_DIR, help='Dataset holding the new samples')
+    parser.add_argument('--output', default=DEFAULT_KNN_DIR, help='k-NN model directory')
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help='Neighbours per prediction (new models only)')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    dataset = Dataset(args.dataset)
+    rows = changed_rows(dataset, args.output)
+    if not len(rows):
+        print(f"{args.output}/ is up to date with {args.dataset}/")
+        return
+
+    manifest, added, replaced = merge_samples(
+        args.output, dataset.features[rows], dataset.labels[rows], [str(p) for p in dataset.paths[rows]],
+        dataset.label_names, args.k)
+    print(f"Merged {added} new and {replaced} changed samples into {args.output}/ in "
+          f"{time.time() - start_time:.2f}s ({manifest['n_samples']} samples, {len(manifest['classes'])} classes, "
+          f"hash {manifest['model_hash'][:12]})")
+
+
+if __name__ == '__main__':
+    main()